@@ -0,0 +1,115 @@
+"""
+Solve the game chopsticks by retrograde analysis.
+"""
+from typing import Any
+from current_state import ChopstickState
+
+WIN = 1
+LOSE = -1
+DRAW = 0
+
+# The solution of every chopsticks state, built the first time it is needed.
+SOLUTION = {}
+
+
+def state_key(state: ChopstickState) -> tuple:
+    """Return a hashable key for the chopsticks state.
+    >>> state_key(ChopstickState(True, 1, 2, 3, 4))
+    (True, 1, 2, 3, 4)
+
+    """
+    return (state.is_p1_turn, state.p1_left, state.p1_right,
+            state.p2_left, state.p2_right)
+
+
+def solve_chopsticks() -> dict:
+    """Return a dictionary mapping the key of every chopsticks state to
+    (outcome, distance, move), where outcome is WIN, LOSE or DRAW for the
+    player to move, distance is the number of moves to the end of the game
+    with perfect play (None for a draw), and move is the best move (None
+    when there is no move).
+
+    States are labelled backwards from the end of the game: a state is a
+    WIN once one move reaches a LOSE, and a LOSE once every move reaches a
+    WIN. States that are never labelled can loop forever, so they are
+    DRAWs.
+    >>> solution = solve_chopsticks()
+    >>> len(solution)
+    1250
+    >>> solution[(True, 0, 0, 1, 1)]
+    (-1, 0, None)
+    >>> solution[(True, 1, 0, 4, 0)]
+    (1, 1, 'll')
+
+    """
+    states = {}
+    for is_p1_turn in [True, False]:
+        for hands in range(5 ** 4):
+            state = ChopstickState(is_p1_turn, hands // 125, hands // 25 % 5,
+                                   hands // 5 % 5, hands % 5)
+            states[state_key(state)] = state
+    # The moves into each state, and the number of moves out of each state
+    # not yet known to reach a WIN.
+    parents = {key: [] for key in states}
+    remaining = {}
+    solution = {}
+    queue = []
+    for key, state in states.items():
+        moves = state.get_possible_moves()
+        remaining[key] = len(moves)
+        for move in moves:
+            parents[state_key(state.make_move(move))].append((key, move))
+        if not moves:
+            solution[key] = (LOSE, 0, None)
+            queue.append(key)
+    # Labelling in order of distance keeps every distance the shortest win
+    # or the longest loss.
+    for key in queue:
+        outcome, distance, _ = solution[key]
+        for parent, move in parents[key]:
+            if parent in solution:
+                continue
+            if outcome == LOSE:
+                solution[parent] = (WIN, distance + 1, move)
+                queue.append(parent)
+            else:
+                remaining[parent] -= 1
+                if remaining[parent] == 0:
+                    solution[parent] = (LOSE, distance + 1, move)
+                    queue.append(parent)
+    draws = [key for key in states if key not in solution]
+    for key in draws:
+        solution[key] = (DRAW, None, helper_draw_move(states[key], solution))
+    return solution
+
+
+def helper_draw_move(state: ChopstickState, solution: dict) -> Any:
+    """Return a move from the drawn state that does not hand the opponent a
+    win, where solution holds the WIN and LOSE states and possibly some
+    DRAW states.
+    >>> helper_draw_move(ChopstickState(True, 1, 1, 1, 1), {})
+    'll'
+
+    """
+    for move in state.get_possible_moves():
+        child = solution.get(state_key(state.make_move(move)))
+        if child is None or child[0] == DRAW:
+            return move
+    return None
+
+
+def solve(state: ChopstickState) -> tuple:
+    """Return (outcome, distance, move) for the chopsticks state, solving
+    the game the first time it is needed.
+    >>> solve(ChopstickState(True, 1, 1, 1, 1))
+    (0, None, 'll')
+
+    """
+    if not SOLUTION:
+        SOLUTION.update(solve_chopsticks())
+    return SOLUTION[state_key(state)]
+
+
+if __name__ == "__main__":
+    import python_ta
+    python_ta.check_all(config="a1_pyta.txt")
@@ -0,0 +1,99 @@
+import unittest
+import random
+
+from chopsticks_solver import solve, solve_chopsticks, state_key, \
+    WIN, LOSE, DRAW
+from current_state import ChopstickState
+from game_interface import playable_games, usable_strategies
+SubtractSquareGame = playable_games['s']
+ChopsticksGame = playable_games['c']
+
+
+def bounded_outcome(state, depth, seen):
+    """
+    Return WIN or LOSE if the player to move in state can force that
+    outcome within depth moves, and None otherwise. seen caches the
+    results of earlier calls.
+    """
+    key = (state_key(state), depth)
+    if key not in seen:
+        moves = state.get_possible_moves()
+        if not moves:
+            seen[key] = LOSE
+        elif depth == 0:
+            seen[key] = None
+        else:
+            children = [bounded_outcome(state.make_move(move), depth - 1,
+                                        seen) for move in moves]
+            if LOSE in children:
+                seen[key] = WIN
+            elif all(child == WIN for child in children):
+                seen[key] = LOSE
+            else:
+                seen[key] = None
+    return seen[key]
+
+
+def sample_states(count, seed):
+    """
+    Return count chopsticks states picked at random.
+    """
+    rand = random.Random(seed)
+    return [ChopstickState(rand.random() < 0.5, *[rand.randrange(5)
+                                                  for _ in range(4)])
+            for _ in range(count)]
+
+
+class ChopsticksSolverUnitTests(unittest.TestCase):
+    def test_solution_matches_bounded_search(self):
+        """
+        Test that a sample of solved states have the outcome and distance
+        a depth-limited search finds, and that draws are never decided by
+        a search deeper than the longest solved distance.
+        """
+        solution = solve_chopsticks()
+        longest = max(distance for _, distance, _ in solution.values()
+                      if distance is not None)
+        seen = {}
+        for state in sample_states(300, 148):
+            outcome, distance, _ = solution[state_key(state)]
+            if outcome == DRAW:
+                self.assertIsNone(bounded_outcome(state, longest + 1, seen),
+                                  str(state))
+            else:
+                self.assertEqual(bounded_outcome(state, distance, seen),
+                                 outcome, str(state))
+                if distance > 0:
+                    self.assertIsNone(bounded_outcome(state, distance - 1,
+                                                      seen), str(state))
+
+    def test_move_keeps_outcome(self):
+        """
+        Test that the strategy's move keeps the outcome of the state: the
+        opponent loses one move sooner after a win, wins one move sooner
+        after a loss, and is still drawn after a draw.
+        """
+        game = ChopsticksGame(True)
+        for state in sample_states(300, 8):
+            outcome, distance, _ = solve(state)
+            if distance == 0:
+                continue
+            game.current_state = state
+            move = usable_strategies['p'](game)
+            self.assertTrue(state.is_valid_move(move))
+            child = solve(state.make_move(move))
+            self.assertEqual(child[0], -outcome, str(state))
+            if outcome != DRAW:
+                self.assertEqual(child[1], distance - 1, str(state))
+
+    def test_other_games_refused(self):
+        """
+        Test that the strategy refuses a game of Subtract Square.
+        """
+        game = SubtractSquareGame(True, 10)
+        with self.assertRaises(ValueError):
+            usable_strategies['p'](game)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,6 +3,7 @@ Design a class representing the state of the game.
 """
 
 from typing import Any
+from square_moves import SquareMoves
 
 
 class CurrentState:
@@ -118,22 +119,20 @@ class SubtractState(CurrentState):
                     and self.current_num == other.current_num)
         return False
 
-    def get_possible_moves(self) -> list:
-        """Return a list of all the possible moves.
+    def get_possible_moves(self) -> SquareMoves:
+        """Return a lazy sequence of all the possible moves.
         >>> s = SubtractState(True, 8)
         >>> s.get_possible_moves()
         [1, 4]
         >>> t = SubtractState(True, 20)
         >>> t.get_possible_moves()
         [1, 4, 9, 16]
+        >>> len(SubtractState(True, 10 ** 12).get_possible_moves())
+        1000000
 
 
         """
-        moves = []
-        for num in range(1, self.current_num + 1):
-            if self.is_valid_move(num):
-                moves.append(num)
-        return moves
+        return SquareMoves(self.current_num)
 
     def make_move(self, move_to_make: int) -> Any:
         """Run the game for one time.
@@ -158,15 +157,11 @@ class SubtractState(CurrentState):
         >>> move_to_make = 4
         >>> s.is_valid_move(move_to_make)
         True
+        >>> SubtractState(True, 10 ** 12).is_valid_move(10 ** 12 - 1)
+        False
 
         """
-        if move_to_make is None:
-            return False
-        root = move_to_make ** 0.5
-        if isinstance(move_to_make, int):
-            return (0 < move_to_make <= self.current_num
-                    and int(root) ** 2 == move_to_make)
-        return False
+        return move_to_make in SquareMoves(self.current_num)
 
 
 class ChopstickState(CurrentState):
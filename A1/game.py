@@ -60,12 +60,14 @@ class SubtractSqureGame(Game):
 
     """
 
-    def __init__(self, is_p1_turn: bool) -> None:
-        """Initialize a new subtract square game.
+    def __init__(self, is_p1_turn: bool, current_num: int = None) -> None:
+        """Initialize a new subtract square game starting from current_num,
+        asking for it if current_num is None.
 
         """
         Game.__init__(self, is_p1_turn)
-        current_num = int(input("Choose a non-negative number:"))
+        if current_num is None:
+            current_num = int(input("Choose a non-negative number:"))
         self.current_state = SubtractState(is_p1_turn, current_num)
 
     def __str__(self) -> str:
@@ -13,7 +13,8 @@ playable_games = {'s': SubtractSqureGame,
 # The strategies you are to implement.  See strategy.py, and then decide
 # how to modify this.
 usable_strategies = {'r': random_strategy,
-                     'i': interactive_strategy}
+                     'i': interactive_strategy,
+                     'p': perfect_chopsticks_strategy}
 
 
 class GameInterface:
@@ -0,0 +1,159 @@
+"""
+The moves of SubtractSquare, computed with integer square roots.
+
+SquareMoves is a read-only sequence of the positive squares up to a total.
+Nothing is stored but the total, so a total of 10 ** 12, with a million
+moves, costs as little as a total of 10: its length, any one of its moves
+and whether it holds a move are all found in O(1).
+
+A1 and A2 are run from their own directories, so each has a copy of this
+module; keep the two the same apart from the python_ta configuration.
+"""
+from typing import Any, Iterator
+from collections.abc import Sequence
+import math
+
+# The most moves written out in full by repr; longer sequences are written
+# by their total alone.
+REPR_LIMIT = 10
+
+
+def is_square(n: Any) -> bool:
+    """
+    Return whether n is a positive perfect square int.
+
+    >>> is_square(9), is_square(8), is_square(0), is_square(10 ** 24)
+    (True, False, False, True)
+    >>> is_square('9'), is_square(True)
+    (False, False)
+    """
+    return (isinstance(n, int) and not isinstance(n, bool) and n > 0
+            and math.isqrt(n) ** 2 == n)
+
+
+class SquareMoves(Sequence):
+    """
+    The squares 1, 4, 9, ... up to total, in increasing order.
+
+    total - the largest square allowed
+
+    >>> moves = SquareMoves(20)
+    >>> moves
+    [1, 4, 9, 16]
+    >>> len(moves), moves[-1], 9 in moves, 10 in moves, 25 in moves
+    (4, 16, True, False, False)
+    >>> moves == [1, 4, 9, 16]
+    True
+    >>> len(SquareMoves(10 ** 12)), 10 ** 12 in SquareMoves(10 ** 12)
+    (1000000, True)
+    """
+    __slots__ = ('total', '_count')
+    total: int
+
+    def __init__(self, total: int) -> None:
+        """
+        Create the moves from total.
+        """
+        self.total = total
+        self._count = math.isqrt(total) if total > 0 else 0
+
+    def __len__(self) -> int:
+        """
+        Return the number of squares up to total.
+        """
+        return self._count
+
+    def __getitem__(self, index: Any) -> Any:
+        """
+        Return the square at index, or a list of the squares in the slice
+        index.
+
+        >>> SquareMoves(50)[2], SquareMoves(50)[1:3]
+        (9, [4, 9])
+        """
+        if isinstance(index, slice):
+            return [(i + 1) ** 2 for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("SquareMoves index out of range")
+        return (index + 1) ** 2
+
+    def __iter__(self) -> Iterator[int]:
+        """
+        Yield the squares in increasing order.
+        """
+        for root in range(1, self._count + 1):
+            yield root * root
+
+    def __reversed__(self) -> Iterator[int]:
+        """
+        Yield the squares in decreasing order.
+
+        >>> list(reversed(SquareMoves(10)))
+        [9, 4, 1]
+        """
+        for root in range(self._count, 0, -1):
+            yield root * root
+
+    def __contains__(self, move: Any) -> bool:
+        """
+        Return whether move is one of the squares up to total.
+        """
+        return is_square(move) and move <= self.total
+
+    def index(self, move: Any) -> int:
+        """
+        Return the index of move.
+
+        >>> SquareMoves(20).index(9)
+        2
+        """
+        if move not in self:
+            raise ValueError("{!r} is not in SquareMoves".format(move))
+        return math.isqrt(move) - 1
+
+    def count(self, move: Any) -> int:
+        """
+        Return the number of times move appears, 1 or 0.
+        """
+        return 1 if move in self else 0
+
+    def __eq__(self, other: Any) -> bool:
+        """
+        Return whether other holds the same squares in the same order, as
+        a SquareMoves or a list.
+        """
+        if isinstance(other, SquareMoves):
+            return self._count == other._count
+        if isinstance(other, list):
+            return len(other) == self._count and \
+                all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __ne__(self, other: Any) -> bool:
+        """
+        Return whether other does not hold the same squares.
+        """
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        """
+        Return the squares written as a list, or only the total if there
+        are more than REPR_LIMIT of them.
+
+        >>> SquareMoves(10 ** 12)
+        SquareMoves(total=1000000000000)
+        """
+        if self._count > REPR_LIMIT:
+            return 'SquareMoves(total={})'.format(self.total)
+        return repr(list(self))
+
+
+if __name__ == "__main__":
+    from python_ta import check_all
+
+    check_all(config="a1_pyta.txt")
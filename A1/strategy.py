@@ -3,6 +3,8 @@ Create two strategies for game interface.
 """
 import random
 from typing import Any
+from chopsticks_solver import solve
+from current_state import ChopstickState
 
 # TODO: Adjust the type annotation as needed.
 
@@ -24,6 +26,18 @@ def random_strategy(game: Any) -> Any:
     return random.choice(game.current_state.get_possible_moves())
 
 
+def perfect_chopsticks_strategy(game: Any) -> Any:
+    """Choose the move of perfect play for a game of chopsticks: the fastest
+    win, the slowest loss, or a move that keeps a drawn game drawn.
+
+    Raise a ValueError if game is not a game of chopsticks.
+
+    """
+    if not isinstance(game.current_state, ChopstickState):
+        raise ValueError("perfect_chopsticks_strategy only plays chopsticks")
+    return solve(game.current_state)[2]
+
+
 if __name__ == "__main__":
     import python_ta
     python_ta.check_all(config="a1_pyta.txt")
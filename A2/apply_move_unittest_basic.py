@@ -0,0 +1,70 @@
+"""
+Unittests for the in-place apply_move and undo_move of the game states.
+"""
+import unittest
+import random
+
+from stonehenge import StonehengeGame, helper_tally, helper_zobrist_hash
+from subtract_square_state import SubtractSquareState
+from strategy import (recursive_minimax, iterative_minimax,
+                      alphabeta_minimax)
+from game_interface import playable_games
+SubtractSquareGame = playable_games['s']
+
+
+class ApplyMoveUnitTests(unittest.TestCase):
+    def test_stonehenge_matches_make_move(self):
+        """
+        Test that applying moves in place gives the states make_move gives,
+        and that undoing them restores every earlier state, without changing
+        states that share rows with it.
+        """
+        rand = random.Random(0)
+        for size in range(1, 6):
+            state = StonehengeGame(True, size).current_state
+            history = []
+            while not state.is_finished:
+                move = rand.choice(state.get_possible_moves())
+                child = state.make_move(move)
+                history.append((move, repr(state), str(state), child,
+                                repr(child)))
+                undo = state.apply_move(move)
+                history[-1] += (undo,)
+                self.assertEqual(state, child)
+                self.assertEqual(str(state), str(child))
+                self.assertEqual(state.zobrist, helper_zobrist_hash(state))
+                self.assertEqual([state._tallies, state._claimed,
+                                  state._empty], helper_tally(state))
+            while history:
+                move, before, drawing, child, after, undo = history.pop()
+                state.undo_move(move, undo)
+                self.assertEqual(repr(state), before)
+                self.assertEqual(str(state), drawing)
+                self.assertEqual(state.zobrist, helper_zobrist_hash(state))
+                self.assertEqual(repr(child), after)
+
+    def test_subtract_square(self):
+        """
+        Test that SubtractSquare moves are applied and taken back.
+        """
+        state = SubtractSquareState(True, 20)
+        undo = state.apply_move('16')
+        self.assertEqual(repr(state), repr(SubtractSquareState(False, 4)))
+        state.undo_move('16', undo)
+        self.assertEqual(repr(state), repr(SubtractSquareState(True, 20)))
+
+    def test_searches_leave_state_unchanged(self):
+        """
+        Test that the in-place searches leave the game's state as it was.
+        """
+        games = [SubtractSquareGame(True, 19), StonehengeGame(False, 2)]
+        for game in games:
+            before = repr(game.current_state)
+            for strategy in [recursive_minimax, iterative_minimax,
+                             alphabeta_minimax]:
+                strategy(game)
+                self.assertEqual(repr(game.current_state), before)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,280 @@
+"""
+A benchmark of the strategies in usable_strategies.
+
+Every strategy (except the interactive one) is asked for one move on each
+position of a fixed corpus. Each run happens in a fresh process, so caches
+do not carry over and a run that takes too long can be stopped. For each
+run the benchmark reports the wall time, the number of nodes expanded
+(calls to make_move or apply_move in the searching process), nodes per
+second and the peak memory traced by tracemalloc, which is measured in a
+second run so it does not slow down the timed one.
+
+    python benchmark.py --out bench.json
+    python benchmark.py --baseline bench.json
+
+With --baseline, runs that became slower or expanded more nodes than in
+the saved results (beyond --tolerance), or that no longer finish, are
+reported as regressions and the exit status is 1.
+"""
+from typing import Any, Callable, Optional
+import argparse
+import json
+import multiprocessing
+import sys
+import time
+import tracemalloc
+from game_interface import playable_games, usable_strategies
+
+# The methods that count as expanding a node.
+MOVE_METHODS = ['make_move', 'apply_move']
+
+# The corpus: (name, game key, parameter, moves played before the search).
+CORPUS = [
+    ('subtract-square-4', 's', 4, []),
+    ('subtract-square-18', 's', 18, []),
+    ('subtract-square-40', 's', 40, []),
+    ('stonehenge-1', 'h', 1, []),
+    ('stonehenge-2', 'h', 2, []),
+    ('stonehenge-3', 'h', 3, []),
+    # Generated boards, with cells named past 'Z'.
+    ('stonehenge-6', 'h', 6, []),
+    ('stonehenge-8', 'h', 8, ['AZ', 'A']),
+    ('stonehenge-2-not-immediate', 'h', 2, ['A', 'F', 'D']),
+    # STONEHENGE_MINIMAX_BOARD from minimax_unittest_basic.py.
+    ('stonehenge-3-minimax-board', 'h', 3,
+     ['K', 'A', 'C', 'B', 'F', 'E', 'G', 'D', 'I']),
+]
+
+
+def build_position(game_key: str, param: Any, moves: list) -> Any:
+    """
+    Return a new game of game_key started with param, with moves played.
+    """
+    game = playable_games[game_key](False, param)
+    for move in moves:
+        game.current_state = game.current_state.make_move(move)
+    return game
+
+
+class MoveCounter:
+    """
+    Count the calls to make_move and apply_move on the given state classes
+    while active.
+
+    count - the number of calls counted so far
+    """
+    count: int
+
+    def __init__(self, classes: list) -> None:
+        """
+        Create a counter for the make_move and apply_move methods of
+        classes.
+        """
+        self.count = 0
+        self._classes = classes
+        self._originals = []
+
+    def __enter__(self) -> 'MoveCounter':
+        """
+        Start counting.
+        """
+        for cls in self._classes:
+            for name in MOVE_METHODS:
+                if name in cls.__dict__:
+                    original = cls.__dict__[name]
+                    self._originals.append((cls, name, original))
+                    setattr(cls, name, self.helper_wrap(original))
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        """
+        Stop counting and restore the original methods.
+        """
+        for cls, name, original in self._originals:
+            setattr(cls, name, original)
+        self._originals = []
+
+    def helper_wrap(self, method: Callable) -> Callable:
+        """
+        Return method wrapped so that each call is counted.
+        """
+        def counted(state: Any, move: Any) -> Any:
+            """
+            Count this call and make the move.
+            """
+            self.count += 1
+            return method(state, move)
+        return counted
+
+
+def helper_state_classes(state: Any) -> list:
+    """
+    Return the classes in the hierarchy of state that define make_move or
+    apply_move.
+    """
+    return [cls for cls in type(state).__mro__
+            if any(name in cls.__dict__ for name in MOVE_METHODS)]
+
+
+def run_case(strategy_key: str, case: tuple, measure_memory: bool) -> dict:
+    """
+    Ask the strategy strategy_key for a move on the corpus position case,
+    and return the measurements of the run.
+    """
+    _, game_key, param, moves = case
+    game = build_position(game_key, param, moves)
+    strategy = usable_strategies[strategy_key]
+    if measure_memory:
+        tracemalloc.start()
+        strategy(game)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return {'peak_kib': peak / 1024}
+    with MoveCounter(helper_state_classes(game.current_state)) as counter:
+        start = time.perf_counter()
+        move = strategy(game)
+        seconds = time.perf_counter() - start
+    return {'move': move, 'seconds': seconds, 'nodes': counter.count,
+            'nodes_per_sec': counter.count / seconds if seconds else None}
+
+
+def helper_child(queue: Any, strategy_key: str, case: tuple,
+                 measure_memory: bool) -> None:
+    """
+    Run run_case in a child process and put its result or error on queue.
+    """
+    try:
+        queue.put(run_case(strategy_key, case, measure_memory))
+    except Exception as error:
+        queue.put({'status': 'error', 'error': repr(error)})
+
+
+def run_isolated(strategy_key: str, case: tuple, measure_memory: bool,
+                 timeout: float) -> dict:
+    """
+    Return the result of run_case in a fresh process, or a timeout status
+    if it does not finish within timeout seconds.
+    """
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(
+        target=helper_child, args=(queue, strategy_key, case, measure_memory))
+    process.start()
+    process.join(timeout)
+    if process.is_alive():
+        process.terminate()
+        process.join()
+        return {'status': 'timeout'}
+    if queue.empty():
+        return {'status': 'error', 'error': 'exit code {}'.format(
+            process.exitcode)}
+    return queue.get()
+
+
+def run_benchmark(strategy_keys: list, corpus: list, timeout: float,
+                  measure_memory: bool = True) -> list:
+    """
+    Return the results of every strategy in strategy_keys on every position
+    of corpus.
+    """
+    results = []
+    for key in strategy_keys:
+        for case in corpus:
+            result = {'strategy': key, 'case': case[0], 'status': 'ok'}
+            result.update(run_isolated(key, case, False, timeout))
+            if measure_memory and result['status'] == 'ok':
+                result.update(run_isolated(key, case, True, timeout))
+            results.append(result)
+            print(helper_format_result(result), file=sys.stderr)
+    return results
+
+
+def helper_format_result(result: dict) -> str:
+    """
+    Return one line describing result.
+
+    >>> helper_format_result({'strategy': 'mr', 'case': 'x',
+    ...                       'status': 'timeout'})
+    'mr   x                              timeout'
+    """
+    line = '{:<4} {:<30} '.format(result['strategy'], result['case'])
+    if result['status'] != 'ok':
+        return line + result['status']
+    line += '{:>9.4f}s {:>10} nodes'.format(result['seconds'],
+                                             result['nodes'])
+    if result['nodes_per_sec']:
+        line += ' {:>10.0f} nodes/s'.format(result['nodes_per_sec'])
+    if 'peak_kib' in result:
+        line += ' {:>10.1f} KiB'.format(result['peak_kib'])
+    return line
+
+
+def compare(results: list, baseline: list, tolerance: float) -> list:
+    """
+    Return a description of each regression of results against baseline:
+    a run that stopped finishing, or that got slower or expanded more nodes
+    by more than the fraction tolerance.
+
+    >>> old = [{'strategy': 'mr', 'case': 'x', 'status': 'ok',
+    ...         'seconds': 1.0, 'nodes': 100}]
+    >>> new = [{'strategy': 'mr', 'case': 'x', 'status': 'ok',
+    ...         'seconds': 1.5, 'nodes': 100}]
+    >>> compare(new, old, 0.2)
+    ['mr x: 1.0000s -> 1.5000s']
+    """
+    previous = {(result['strategy'], result['case']): result
+                for result in baseline}
+    regressions = []
+    for result in results:
+        old = previous.get((result['strategy'], result['case']))
+        if old is None or old['status'] != 'ok':
+            continue
+        name = '{} {}'.format(result['strategy'], result['case'])
+        if result['status'] != 'ok':
+            regressions.append('{}: {}'.format(name, result['status']))
+            continue
+        if result['seconds'] > old['seconds'] * (1 + tolerance):
+            regressions.append('{}: {:.4f}s -> {:.4f}s'.format(
+                name, old['seconds'], result['seconds']))
+        if result['nodes'] > old['nodes'] * (1 + tolerance):
+            regressions.append('{}: {} -> {} nodes'.format(
+                name, old['nodes'], result['nodes']))
+    return regressions
+
+
+def main(argv: Optional[list] = None) -> int:
+    """
+    Run the benchmark from the command-line arguments argv, and return the
+    exit status.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the strategies.")
+    parser.add_argument('--strategies', nargs='*',
+                        default=[key for key in usable_strategies
+                                 if key != 'i'])
+    parser.add_argument('--cases', nargs='*',
+                        default=[case[0] for case in CORPUS])
+    parser.add_argument('--timeout', type=float, default=60,
+                        help="seconds allowed for each run")
+    parser.add_argument('--no-memory', action='store_true',
+                        help="skip the peak memory runs")
+    parser.add_argument('--out', help="file to write the JSON results to")
+    parser.add_argument('--baseline', help="JSON results to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    args = parser.parse_args(argv)
+    corpus = [case for case in CORPUS if case[0] in args.cases]
+    results = run_benchmark(args.strategies, corpus, args.timeout,
+                            not args.no_memory)
+    if args.out:
+        with open(args.out, 'w') as out:
+            json.dump({'results': results}, out, indent=2)
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)['results']
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print('REGRESSION ' + regression)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
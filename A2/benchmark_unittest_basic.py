@@ -0,0 +1,51 @@
+"""
+Unittests for the strategy benchmark.
+"""
+import unittest
+
+from benchmark import (MoveCounter, build_position, compare,
+                       helper_state_classes, run_isolated)
+from strategy import recursive_minimax
+
+
+class BenchmarkUnitTests(unittest.TestCase):
+    def test_move_counter(self):
+        """
+        Test that the counter counts every make_move and restores it after.
+        """
+        game = build_position('s', 4, [])
+        classes = helper_state_classes(game.current_state)
+        original = classes[0].__dict__['make_move']
+        with MoveCounter(classes) as counter:
+            recursive_minimax(game)
+        self.assertEqual(counter.count, 5)
+        self.assertIs(classes[0].__dict__['make_move'], original)
+
+    def test_run_isolated(self):
+        """
+        Test that a run reports its move and nodes, and that a run that is
+        too slow is stopped.
+        """
+        case = ('stonehenge-2-not-immediate', 'h', 2, ['A', 'F', 'D'])
+        result = run_isolated('mr', case, False, 60)
+        self.assertEqual((result['move'], result['nodes']), ('E', 37))
+        case = ('stonehenge-3', 'h', 3, [])
+        self.assertEqual(run_isolated('mr', case, False, 0.5),
+                         {'status': 'timeout'})
+
+    def test_compare(self):
+        """
+        Test that only runs worse than the baseline are regressions.
+        """
+        old = [{'strategy': 'ab', 'case': 'x', 'status': 'ok',
+                'seconds': 1.0, 'nodes': 10}]
+        same = [dict(old[0], seconds=1.1)]
+        worse = [dict(old[0], nodes=20)]
+        stopped = [{'strategy': 'ab', 'case': 'x', 'status': 'timeout'}]
+        self.assertEqual(compare(same, old, 0.2), [])
+        self.assertEqual(compare(worse, old, 0.2), ['ab x: 10 -> 20 nodes'])
+        self.assertEqual(compare(stopped, old, 0.2), ['ab x: timeout'])
+
+
+if __name__ == '__main__':
+    unittest.main(exit=False)
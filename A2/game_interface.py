@@ -11,7 +11,11 @@ your own curiousity!)
 # TODO: import the modules needed to make game_interface run.
 from strategy import *
 from typing import Any, Callable
-from strategy import interactive_strategy, recursive_minimax, iterative_minimax, rough_outcome_strategy
+from strategy import (interactive_strategy, recursive_minimax,
+                      iterative_minimax, rough_outcome_strategy,
+                      cached_minimax, alphabeta_minimax,
+                      iterative_deepening_minimax, parallel_minimax,
+                      mcts_strategy)
 from subtract_square_game import SubtractSquareGame
 from stonehenge import StonehengeGame
 
@@ -26,7 +30,40 @@ playable_games = {'s': SubtractSquareGame,
 usable_strategies = {'i': interactive_strategy,
                      'ro': rough_outcome_strategy,
                      'mr': recursive_minimax,
-                     'mi': iterative_minimax}
+                     'mi': iterative_minimax,
+                     'mc': cached_minimax,
+                     'ab': alphabeta_minimax,
+                     'id': iterative_deepening_minimax,
+                     'mp': parallel_minimax,
+                     'mt': mcts_strategy}
+
+# The perfect SubtractSquare strategy needs NumPy, so it is only offered when
+# NumPy is installed. It refuses any other game with a ValueError.
+try:
+    from subtract_square_solver import perfect_strategy
+    usable_strategies['ps'] = perfect_strategy
+except ImportError:
+    pass
+
+
+def game_key(game: Any) -> str:
+    """
+    Return the key of game's class in playable_games.
+    """
+    for key, game_class in playable_games.items():
+        if isinstance(game, game_class):
+            return key
+    raise ValueError("{} is not a playable game".format(type(game).__name__))
+
+
+def game_param(state: Any) -> Any:
+    """
+    Return the parameter that a game starting at state was built with: the
+    side length of a Stonehenge board or the total of SubtractSquare.
+    """
+    if hasattr(state, 'size'):
+        return state.size
+    return state.current_total
 
 
 class GameInterface:
@@ -36,7 +73,7 @@ class GameInterface:
     """
 
     def __init__(self, game: Any, p1_strategy: Callable,
-                 p2_strategy: Callable[[Any], Any]) -> None:
+                 p2_strategy: Callable[[Any], Any], writer: Any = None) -> None:
         """
         Initialize this GameInterface, setting its active game to game, and
         using the strategies p1_strategy for Player 1 and p2_strategy for
@@ -48,6 +85,8 @@ class GameInterface:
         :type p1_strategy:
         :param p2_strategy: The strategy for Play 2.
         :type p2_strategy:
+        :param writer: A RecordWriter to record the game with, or None.
+        :type writer:
         """
         first_player = input("Type y if player 1 is to make the first move: ")
         is_p1_turn = False
@@ -57,6 +96,7 @@ class GameInterface:
         self.game = game(is_p1_turn)
         self.p1_strategy = p1_strategy
         self.p2_strategy = p2_strategy
+        self.writer = writer
 
     def play(self) -> None:
         """
@@ -66,6 +106,9 @@ class GameInterface:
 
         print(self.game.get_instructions())
         print(current_state)
+        if self.writer is not None:
+            self.writer.start(game_key(self.game), game_param(current_state),
+                              current_state.get_current_player_name() == 'p1')
 
         # Pick moves until the game is over
         while not self.game.is_over(current_state):
@@ -89,11 +132,16 @@ class GameInterface:
             new_game_state = current_state.make_move(move_to_make)
             self.game.current_state = new_game_state
             current_state = self.game.current_state
+            if self.writer is not None:
+                self.writer.add_move(move_to_make)
 
             print("{} made the move {}. The game's state is now:".format(
                 current_player_name, move_to_make))
             print(current_state)
 
+        if self.writer is not None:
+            self.writer.finish()
+
         # Print out the winner of the game
         if self.game.is_winner("p1"):
             print("Player 1 is the winner!")
@@ -0,0 +1,203 @@
+"""
+A compact record format for played games, and a replay engine for it.
+
+Each game is one line of text: the key of the game in playable_games, the
+parameter it was started with (the starting total of SubtractSquare or the
+side length of Stonehenge), the player who moved first (1 or 2) and the
+moves, separated by spaces. For example, a game of Stonehenge of side
+length 2 that p2 started:
+
+    h 2 2 A F D C E
+
+A GameReplay rebuilds any position of a recorded game with make_move,
+keeping a checkpoint every few moves so that reaching move k only replays
+the moves since the last checkpoint before it.
+"""
+from typing import Any, Iterator, Optional
+
+
+class GameRecord:
+    """
+    A record of one game.
+
+    game - the key of the game in playable_games
+    param - the parameter the game was started with
+    p1_starts - whether p1 made the first move
+    moves - the moves made, in order
+    """
+    game: str
+    param: Any
+    p1_starts: bool
+    moves: list
+
+    def __init__(self, game: str, param: Any, p1_starts: bool,
+                 moves: Optional[list] = None) -> None:
+        """
+        Create a record of a game of game started with param.
+
+        >>> GameRecord('s', 10, True, [9]).moves
+        [9]
+        """
+        self.game = game
+        self.param = param
+        self.p1_starts = p1_starts
+        self.moves = [] if moves is None else moves
+
+    def to_line(self) -> str:
+        """
+        Return this record as one line of the record format.
+
+        >>> GameRecord('h', 2, False, ['A', 'F']).to_line()
+        'h 2 2 A F\\n'
+        """
+        fields = [self.game, str(self.param), '1' if self.p1_starts else '2']
+        return ' '.join(fields + [str(move) for move in self.moves]) + '\n'
+
+    @staticmethod
+    def from_line(line: str) -> 'GameRecord':
+        """
+        Return the record written as line, with the moves still as strings.
+
+        >>> record = GameRecord.from_line('s 10 1 9 1\\n')
+        >>> (record.game, record.param, record.p1_starts, record.moves)
+        ('s', 10, True, ['9', '1'])
+        """
+        fields = line.split()
+        if len(fields) < 3 or fields[2] not in ('1', '2'):
+            raise ValueError("not a game record: {!r}".format(line))
+        param = int(fields[1]) if fields[1].isdigit() else fields[1]
+        return GameRecord(fields[0], param, fields[2] == '1', fields[3:])
+
+
+class RecordWriter:
+    """
+    Write game records to a file as the games are played.
+
+    The record of the current game is kept until finish() writes it, so a
+    game cut short leaves nothing half-written in the file.
+    """
+
+    def __init__(self, out: Any) -> None:
+        """
+        Create a writer of records to the text file out.
+        """
+        self._out = out
+        self._record = None
+
+    def start(self, game: str, param: Any, p1_starts: bool) -> None:
+        """
+        Start the record of a new game of game started with param.
+        """
+        self._record = GameRecord(game, param, p1_starts)
+
+    def add_move(self, move: Any) -> None:
+        """
+        Add move to the record of the current game.
+        """
+        self._record.moves.append(move)
+
+    def finish(self) -> None:
+        """
+        Write the record of the current game to the file.
+
+        >>> import io
+        >>> out = io.StringIO()
+        >>> writer = RecordWriter(out)
+        >>> writer.start('s', 4, True)
+        >>> writer.add_move(4)
+        >>> writer.finish()
+        >>> out.getvalue()
+        's 4 1 4\\n'
+        """
+        self._out.write(self._record.to_line())
+        self._out.flush()
+        self._record = None
+
+
+def read_records(file: Any) -> Iterator[GameRecord]:
+    """
+    Yield every record in the text file file, skipping blank lines.
+
+    >>> import io
+    >>> [r.moves for r in read_records(io.StringIO('s 4 1 4\\n\\nh 1 2 A\\n'))]
+    [['4'], ['A']]
+    """
+    for line in file:
+        if line.strip():
+            yield GameRecord.from_line(line)
+
+
+class GameReplay:
+    """
+    The positions of a recorded game.
+
+    record - the record replayed
+    interval - the number of moves between checkpoints
+    """
+    record: GameRecord
+    interval: int
+
+    def __init__(self, record: GameRecord, games: dict,
+                 interval: int = 16) -> None:
+        """
+        Prepare to replay record, building its game from games, a
+        dictionary like playable_games, and keeping a checkpoint every
+        interval moves.
+        """
+        if interval < 1:
+            raise ValueError("interval must be a positive integer")
+        self.record = record
+        self.interval = interval
+        self._game = games[record.game](record.p1_starts, record.param)
+        self._moves = [self._game.str_to_move(str(move))
+                       for move in record.moves]
+        self._checkpoints = [self._game.current_state]
+
+    def __len__(self) -> int:
+        """
+        Return the number of moves in the game.
+        """
+        return len(self._moves)
+
+    def position(self, k: int) -> Any:
+        """
+        Return the state of the game after its first k moves.
+
+        Raise an IndexError if the game has fewer than k moves.
+        """
+        if not 0 <= k <= len(self._moves):
+            raise IndexError("the game has {} moves".format(len(self._moves)))
+        # Extend the checkpoints as far as they are needed.
+        while len(self._checkpoints) <= k // self.interval:
+            state = self._checkpoints[-1]
+            start = (len(self._checkpoints) - 1) * self.interval
+            for move in self._moves[start:start + self.interval]:
+                state = state.make_move(move)
+            self._checkpoints.append(state)
+        state = self._checkpoints[k // self.interval]
+        for move in self._moves[k - k % self.interval:k]:
+            state = state.make_move(move)
+        return state
+
+    def final_position(self) -> Any:
+        """
+        Return the state of the game after its last move.
+        """
+        return self.position(len(self._moves))
+
+    def positions(self) -> Iterator[Any]:
+        """
+        Yield the state of the game after each of its first 0, 1, 2, ...
+        moves, replaying every move once.
+        """
+        state = self._checkpoints[0]
+        yield state
+        for move in self._moves:
+            state = state.make_move(move)
+            yield state
+
+
+if __name__ == "__main__":
+    from python_ta import check_all
+
+    check_all(config="a2_pyta.txt")
@@ -0,0 +1,71 @@
+"""
+Unittests for game records and their replay.
+"""
+import unittest
+import io
+import random
+from unittest.mock import patch
+
+from game_record import GameRecord, GameReplay, RecordWriter, read_records
+from game_interface import GameInterface, playable_games
+from strategy import rough_outcome_strategy
+from tournament import build_game, play_game
+
+
+class GameRecordUnitTests(unittest.TestCase):
+    def test_play_writes_record(self):
+        """
+        Test that the play loop writes one line per game with its moves.
+        """
+        out = io.StringIO()
+        writer = RecordWriter(out)
+        with patch('builtins.input', side_effect=['n', '3']), \
+                patch('builtins.print'):
+            interface = GameInterface(playable_games['h'],
+                                      rough_outcome_strategy,
+                                      rough_outcome_strategy, writer)
+            interface.play()
+        records = list(read_records(io.StringIO(out.getvalue())))
+        self.assertEqual(len(records), 1)
+        record = records[0]
+        self.assertEqual((record.game, record.param, record.p1_starts),
+                         ('h', 3, False))
+        replay = GameReplay(record, playable_games)
+        self.assertEqual(repr(replay.final_position()),
+                         repr(interface.game.current_state))
+
+    def test_line_round_trip(self):
+        """
+        Test that a record read back from its line is the same record.
+        """
+        record = GameRecord('s', 30, True, [25, 4, 1])
+        line = record.to_line()
+        self.assertEqual(GameRecord.from_line(line).to_line(), line)
+        with self.assertRaises(ValueError):
+            GameRecord.from_line('s 30\n')
+
+    def test_random_access_matches_replay(self):
+        """
+        Test that every position reached through the checkpoints is the one
+        reached by replaying the game from the start.
+        """
+        random.seed(0)
+        for key, param in [('h', 3), ('s', 200)]:
+            game = build_game(playable_games[key], True, param)
+            moves = play_game(game, rough_outcome_strategy,
+                              rough_outcome_strategy)['moves']
+            record = GameRecord.from_line(
+                GameRecord(key, param, True, moves).to_line())
+            expected = [repr(state) for state in
+                        GameReplay(record, playable_games).positions()]
+            replay = GameReplay(record, playable_games, 3)
+            order = list(range(len(moves) + 1))
+            random.shuffle(order)
+            for k in order:
+                self.assertEqual(repr(replay.position(k)), expected[k])
+            with self.assertRaises(IndexError):
+                replay.position(len(moves) + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
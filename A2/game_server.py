@@ -0,0 +1,401 @@
+"""
+An asyncio server that hosts many games at once over a line protocol.
+
+Clients connect over TCP or a Unix socket and send one command per line;
+the server answers each with one line. Any player whose strategy is 'i'
+is moved by the client; every other player is a strategy from
+game_interface, run in a process pool so that a long search never holds up
+the other games.
+
+    NEW <game> <param> <p1 strategy> <p2 strategy> <first: 1 or 2>
+    MOVE <id> <move>
+    STATE <id>
+    QUIT <id>
+
+NEW and MOVE play the strategies' moves until it is a client's turn or the
+game is over, and answer
+
+    OK <id> <status> <the moves the strategies made>
+
+where the status is the player the client moves next ('p1' or 'p2') or,
+once the game is over, 'p1-won', 'p2-won' or 'tie'. STATE answers with
+every move of the game so far, and QUIT with 'OK <id>'. A bad command,
+one whose strategy fails, a line that is not UTF-8 and a line longer than
+the stream limit (64 KiB) are each answered with 'ERR <reason>' and change
+nothing; the connection is kept open. Games nobody has touched for
+idle_timeout seconds are dropped, unless a strategy is still searching in
+them.
+
+To serve on port 8148 with 4 processes for the strategies:
+
+    python game_server.py --port 8148 --workers 4
+"""
+from typing import Any, Optional
+import argparse
+import asyncio
+import importlib
+import itertools
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from tournament import build_game
+
+# The largest parameter each game may be started from: totals and boards
+# up to the sizes the engines are benchmarked on. A search in a worker
+# cannot be cancelled, so games missing from here are not offered at all.
+MAX_PARAMS = {'h': 10, 's': 40}
+
+
+class ServerGame:
+    """
+    A game hosted by a GameServer.
+
+    game_id - the id clients refer to this game by
+    game - the game played
+    key - the key of the game in playable_games
+    strategies - the strategy key of 'p1' and of 'p2'
+    moves - the moves made so far
+    last_used - the time.monotonic() of the last command on this game
+    """
+    game_id: str
+    game: Any
+    key: str
+    strategies: dict
+    moves: list
+    last_used: float
+
+    def __init__(self, game_id: str, game: Any, key: str,
+                 strategies: dict) -> None:
+        """
+        Host game, the game of playable_games[key], played by strategies.
+        """
+        self.game_id = game_id
+        self.game = game
+        self.key = key
+        self.strategies = strategies
+        self.moves = []
+        self.last_used = time.monotonic()
+        # Held while a command changes the game, so that the moves of two
+        # clients are not interleaved.
+        self.lock = asyncio.Lock()
+
+    @property
+    def status(self) -> str:
+        """
+        Return the player to move, or how the game ended.
+        """
+        if self.game.is_over(self.game.current_state):
+            for player in ['p1', 'p2']:
+                if self.game.is_winner(player):
+                    return player + '-won'
+            return 'tie'
+        return self.game.current_state.get_current_player_name()
+
+
+def choose_move(job: tuple) -> Any:
+    """
+    Return the move the strategy picks in job, a tuple of (strategy key,
+    game), looking the key up in game_interface.
+
+    This is run in the worker processes.
+    """
+    strategy_key, game = job
+    interface = importlib.import_module('game_interface')
+    return interface.usable_strategies[strategy_key](game)
+
+
+class GameServer:
+    """
+    A server of games played by clients and strategies.
+
+    idle_timeout - the seconds a game is kept without a command
+    """
+    idle_timeout: float
+
+    def __init__(self, executor: Executor,
+                 idle_timeout: float = 600.0) -> None:
+        """
+        Create a server that runs the strategies on executor.
+        """
+        self.idle_timeout = idle_timeout
+        self._executor = executor
+        self._games = {}
+        self._ids = itertools.count(1)
+        self._interface = importlib.import_module('game_interface')
+
+    def __len__(self) -> int:
+        """
+        Return the number of games hosted.
+        """
+        return len(self._games)
+
+    async def handle(self, reader: asyncio.StreamReader,
+                     writer: asyncio.StreamWriter) -> None:
+        """
+        Answer the commands of one client until it disconnects.
+        """
+        try:
+            while True:
+                try:
+                    line = await reader.readuntil(b'\n')
+                except asyncio.IncompleteReadError as error:
+                    # The last line, without a newline, or nothing at all.
+                    line = error.partial
+                    if not line:
+                        break
+                except asyncio.LimitOverrunError as error:
+                    await helper_skip_line(reader, error.consumed)
+                    line = None
+                if line is None:
+                    reply = 'ERR line too long'
+                else:
+                    reply = await self.reply(line)
+                writer.write((reply + '\n').encode())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def reply(self, line: bytes) -> str:
+        """
+        Return the reply to the command line, as read from a client. Bytes
+        that are not UTF-8, and anything the command raises, are answered
+        with an error.
+
+        >>> from concurrent.futures import ThreadPoolExecutor
+        >>> server = GameServer(ThreadPoolExecutor(1))
+        >>> asyncio.run(server.reply(b'\\xff\\xfe\\n'))
+        "ERR bad command '\\ufffd\\ufffd'"
+        """
+        try:
+            return await self.command(line.decode(errors='replace').strip())
+        except Exception as error:
+            return helper_error(error)
+
+    async def command(self, line: str) -> str:
+        """
+        Carry out the command line and return the reply to it.
+
+        >>> from concurrent.futures import ThreadPoolExecutor
+        >>> server = GameServer(ThreadPoolExecutor(1))
+        >>> asyncio.run(server.command('NEW s 4 i mr 1'))
+        'OK 1 p1'
+        >>> asyncio.run(server.command('MOVE 1 1'))
+        'OK 1 p1 1'
+        >>> asyncio.run(server.command('MOVE 1 1'))
+        'OK 1 p2-won 1'
+        """
+        fields = line.split()
+        if not fields:
+            return 'ERR empty command'
+        name, args = fields[0].upper(), fields[1:]
+        arity = {'NEW': 5, 'MOVE': 2, 'STATE': 1, 'QUIT': 1}
+        if arity.get(name) != len(args):
+            return 'ERR bad command {!r}'.format(line)
+        if name == 'NEW':
+            return await self.start_game(*args)
+        server_game = self._games.get(args[0])
+        if server_game is None:
+            return 'ERR no game {}'.format(args[0])
+        server_game.last_used = time.monotonic()
+        if name == 'QUIT':
+            del self._games[server_game.game_id]
+            return 'OK {}'.format(server_game.game_id)
+        if name == 'STATE':
+            return helper_reply(server_game, server_game.moves)
+        async with server_game.lock:
+            # Take the client's move back if it cannot be played out, so
+            # that the game is left as it was.
+            state = server_game.game.current_state
+            count = len(server_game.moves)
+            try:
+                self.make_move(server_game, args[1])
+                await self.play_strategies(server_game)
+            except Exception as error:
+                server_game.game.current_state = state
+                del server_game.moves[count:]
+                return helper_error(error)
+            return helper_reply(server_game, server_game.moves[count + 1:])
+
+    async def start_game(self, key: str, param: str, p1_key: str,
+                         p2_key: str, first: str) -> str:
+        """
+        Start a game as new_game does, play the strategies' first moves and
+        return the reply to NEW. The game is only hosted once those moves
+        have been made.
+        """
+        try:
+            server_game = self.new_game(key, param, p1_key, p2_key, first)
+            await self.play_strategies(server_game)
+        except Exception as error:
+            return helper_error(error)
+        self._games[server_game.game_id] = server_game
+        return helper_reply(server_game, server_game.moves)
+
+    def new_game(self, key: str, param: str, p1_key: str, p2_key: str,
+                 first: str) -> ServerGame:
+        """
+        Return a new game of key from param, played by the strategies
+        p1_key and p2_key, in which the player first ('1' or '2') moves
+        first.
+
+        Raise a ValueError if any of them is not one the server offers.
+        """
+        if key not in self._interface.playable_games or key not in MAX_PARAMS:
+            raise ValueError("no game {}".format(key))
+        for strategy_key in [p1_key, p2_key]:
+            if strategy_key not in self._interface.usable_strategies:
+                raise ValueError("no strategy {}".format(strategy_key))
+        if first not in ('1', '2'):
+            raise ValueError("the first player must be 1 or 2")
+        if not param.isdigit() or not 1 <= int(param) <= MAX_PARAMS[key]:
+            raise ValueError("game {} cannot start from {}".format(key,
+                                                                   param))
+        game = build_game(self._interface.playable_games[key], first == '1',
+                          int(param))
+        return ServerGame(str(next(self._ids)), game, key,
+                          {'p1': p1_key, 'p2': p2_key})
+
+    @staticmethod
+    def make_move(server_game: ServerGame, text: str) -> None:
+        """
+        Make the move written as text for the client whose turn it is in
+        server_game.
+        """
+        game = server_game.game
+        state = game.current_state
+        if game.is_over(state) or \
+                server_game.strategies[state.get_current_player_name()] != 'i':
+            raise ValueError("it is not the client's turn")
+        move = game.str_to_move(text)
+        if not state.is_valid_move(move):
+            raise ValueError("{} is not a valid move".format(text))
+        game.current_state = state.make_move(move)
+        server_game.moves.append(move)
+
+    async def play_strategies(self, server_game: ServerGame) -> None:
+        """
+        Make the strategies' moves in server_game until it is a client's
+        turn or the game is over.
+        """
+        loop = asyncio.get_running_loop()
+        game = server_game.game
+        while not game.is_over(game.current_state):
+            state = game.current_state
+            strategy_key = server_game.strategies[
+                state.get_current_player_name()]
+            if strategy_key == 'i':
+                break
+            move = await loop.run_in_executor(self._executor, choose_move,
+                                              (strategy_key, game))
+            if not state.is_valid_move(move):
+                raise ValueError("strategy {} chose the invalid move "
+                                 "{}".format(strategy_key, move))
+            game.current_state = state.make_move(move)
+            server_game.moves.append(move)
+            server_game.last_used = time.monotonic()
+
+    def evict(self, now: Optional[float] = None) -> list:
+        """
+        Drop the games idle for longer than idle_timeout at now, a
+        time.monotonic(), and return their ids. Games whose strategies are
+        still searching are kept, however long the search takes.
+        """
+        if now is None:
+            now = time.monotonic()
+        idle = [game_id for game_id, server_game in self._games.items()
+                if now - server_game.last_used > self.idle_timeout
+                and not server_game.lock.locked()]
+        for game_id in idle:
+            del self._games[game_id]
+        return idle
+
+    async def evict_forever(self) -> None:
+        """
+        Drop idle games every half of idle_timeout.
+        """
+        while True:
+            await asyncio.sleep(self.idle_timeout / 2)
+            self.evict()
+
+
+async def helper_skip_line(reader: asyncio.StreamReader,
+                           consumed: int) -> None:
+    """
+    Drop the rest of a line longer than the limit of reader, of which
+    consumed bytes are buffered, up to and including its newline.
+    """
+    while True:
+        await reader.readexactly(consumed)
+        try:
+            await reader.readuntil(b'\n')
+            return
+        except asyncio.IncompleteReadError:
+            return
+        except asyncio.LimitOverrunError as error:
+            consumed = error.consumed
+
+
+def helper_error(error: Exception) -> str:
+    """
+    Return the reply reporting error.
+
+    >>> helper_error(KeyError('x'))
+    "ERR KeyError: 'x'"
+    """
+    if isinstance(error, ValueError):
+        return 'ERR {}'.format(error)
+    return 'ERR {}: {}'.format(type(error).__name__, error)
+
+
+def helper_reply(server_game: ServerGame, moves: list) -> str:
+    """
+    Return the reply giving the status of server_game and moves.
+    """
+    return ' '.join(['OK', server_game.game_id, server_game.status] +
+                    [str(move) for move in moves])
+
+
+async def serve(server: GameServer, host: str = '127.0.0.1',
+                port: Optional[int] = None,
+                path: Optional[str] = None) -> None:
+    """
+    Serve the clients of server on the Unix socket path if it is given,
+    otherwise on host and port, until cancelled.
+    """
+    if path is not None:
+        listener = await asyncio.start_unix_server(server.handle, path)
+    else:
+        listener = await asyncio.start_server(server.handle, host, port)
+    evictor = asyncio.ensure_future(server.evict_forever())
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        evictor.cancel()
+
+
+def main(argv: Optional[list] = None) -> None:
+    """
+    Run a game server from the command-line arguments argv.
+    """
+    parser = argparse.ArgumentParser(description="Host games over a line "
+                                                 "protocol.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8148)
+    parser.add_argument('--unix', default=None,
+                        help="serve on this Unix socket instead of TCP")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--idle-timeout', type=float, default=600.0,
+                        help="seconds before an idle game is dropped")
+    args = parser.parse_args(argv)
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        server = GameServer(executor, args.idle_timeout)
+        try:
+            asyncio.run(serve(server, args.host, args.port, args.unix))
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    main()
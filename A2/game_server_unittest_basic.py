@@ -0,0 +1,193 @@
+"""
+Unittests for the asyncio game server.
+"""
+import unittest
+import asyncio
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from game_server import GameServer
+
+
+async def send(reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+               line: str) -> str:
+    """
+    Send the command line and return the server's reply.
+    """
+    writer.write((line + '\n').encode())
+    await writer.drain()
+    return (await reader.readline()).decode().strip()
+
+
+class GameServerUnitTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        """
+        Start a pool of two processes for the strategies.
+        """
+        self.executor = ProcessPoolExecutor(2)
+        self.server = GameServer(self.executor, idle_timeout=60)
+
+    def tearDown(self):
+        """
+        Stop the pool.
+        """
+        self.executor.shutdown()
+
+    async def start_tcp(self) -> tuple:
+        """
+        Serve on a free local port and return a connection to it.
+        """
+        listener = await asyncio.start_server(self.server.handle,
+                                              '127.0.0.1', 0)
+        self.addAsyncCleanup(listener.wait_closed)
+        self.addCleanup(listener.close)
+        port = listener.sockets[0].getsockname()[1]
+        return await self.connect(asyncio.open_connection('127.0.0.1', port))
+
+    async def connect(self, opening) -> tuple:
+        """
+        Open a connection and close it at the end of the test.
+        """
+        reader, writer = await opening
+        self.addCleanup(writer.close)
+        return reader, writer
+
+    async def test_bot_game_plays_to_the_end(self):
+        """
+        Test that a game between two strategies is played out on NEW.
+        """
+        reader, writer = await self.start_tcp()
+        reply = await send(reader, writer, 'NEW s 18 mr ro 1')
+        fields = reply.split()
+        self.assertEqual(fields[:3], ['OK', '1', 'p1-won'])
+        self.assertEqual(sum(int(move) for move in fields[3:]), 18)
+        self.assertEqual(await send(reader, writer, 'STATE 1'), reply)
+
+    async def test_client_moves(self):
+        """
+        Test that a client plays against a strategy, move by move.
+        """
+        reader, writer = await self.start_tcp()
+        self.assertEqual(await send(reader, writer, 'NEW s 6 ab i 1'),
+                         'OK 1 p2 1')
+        self.assertEqual(await send(reader, writer, 'MOVE 1 4'),
+                         'OK 1 p1-won 1')
+        self.assertEqual(await send(reader, writer, 'STATE 1'),
+                         'OK 1 p1-won 1 4 1')
+
+    async def test_errors(self):
+        """
+        Test that bad commands are answered with errors, and leave the game
+        as it was.
+        """
+        reader, writer = await self.start_tcp()
+        await send(reader, writer, 'NEW h 2 i i 2')
+        for line in ['MOVE 1 Z', 'MOVE 2 A', 'NEW x 2 i i 1',
+                     'NEW h 2 i zz 1', 'HELLO', 'MOVE 1']:
+            self.assertTrue((await send(reader, writer, line)).startswith(
+                'ERR'), line)
+        self.assertEqual(await send(reader, writer, 'MOVE 1 A'), 'OK 1 p1')
+        self.assertEqual(await send(reader, writer, 'QUIT 1'), 'OK 1')
+        self.assertTrue((await send(reader, writer, 'STATE 1')).startswith(
+            'ERR'))
+
+    async def test_failures_are_replies(self):
+        """
+        Test that bad parameters and failing strategies are answered with
+        errors on the same connection, and that a game whose strategy
+        failed is left as it was or not hosted at all.
+        """
+        reader, writer = await self.start_tcp()
+        for line in ['NEW h abc ro ro 1', 'NEW s -5 i i 1', 'NEW h 0 i i 1',
+                     'NEW h 11 i i 1', 'NEW h 2 ps ro 1',
+                     'NEW s 1000000000000 mr mr 1', 'NEW s 41 i i 1']:
+            self.assertTrue((await send(reader, writer, line)).startswith(
+                'ERR'), line)
+        self.assertEqual(len(self.server), 0)
+        reply = await send(reader, writer, 'NEW h 2 i ps 1')
+        game_id = reply.split()[1]
+        self.assertEqual(reply, 'OK {} p1'.format(game_id))
+        self.assertTrue((await send(reader, writer, 'MOVE {} A'.format(
+            game_id))).startswith('ERR'))
+        self.assertEqual(await send(reader, writer, 'STATE ' + game_id),
+                         'OK {} p1'.format(game_id))
+        self.assertEqual(len(self.server), 1)
+
+    async def test_unreadable_lines_are_replies(self):
+        """
+        Test that a line that is not UTF-8, and lines longer than the stream
+        limit, are answered with errors and leave the connection usable.
+        """
+        reader, writer = await self.start_tcp()
+        writer.write(b'\xff\xfe\n')
+        self.assertTrue((await reader.readline()).startswith(b'ERR'))
+        self.assertEqual(await send(reader, writer, 'NEW s 4 i i 1'),
+                         'OK 1 p1')
+        writer.write(b'MOVE 1 ' + b'1' * 100000 + b'\n')
+        self.assertEqual(await reader.readline(), b'ERR line too long\n')
+        self.assertEqual(await send(reader, writer, 'MOVE 1 1'), 'OK 1 p2')
+        # A long line sent in pieces, with no newline in the first ones.
+        for _ in range(3):
+            writer.write(b'2' * 50000)
+            await writer.drain()
+            await asyncio.sleep(0.05)
+        writer.write(b'\n')
+        self.assertEqual(await reader.readline(), b'ERR line too long\n')
+        self.assertEqual(await send(reader, writer, 'STATE 1'), 'OK 1 p2 1')
+
+    async def test_search_does_not_block_other_games(self):
+        """
+        Test that a game is answered while a strategy searches in another.
+        """
+        reader, writer = await self.start_tcp()
+        other = await self.connect(asyncio.open_connection(
+            *writer.get_extra_info('peername')))
+        await send(reader, writer, 'NEW h 3 i id 1')
+        slow = asyncio.ensure_future(send(reader, writer, 'MOVE 1 A'))
+        await asyncio.sleep(0.1)
+        self.assertEqual(await send(*other, 'NEW s 4 i i 1'), 'OK 2 p1')
+        self.assertFalse(slow.done())
+        self.assertTrue((await slow).startswith('OK 1 p1 '))
+
+    async def test_unix_socket(self):
+        """
+        Test that the server is reached over a Unix socket.
+        """
+        path = os.path.join(tempfile.mkdtemp(), 'games.sock')
+        listener = await asyncio.start_unix_server(self.server.handle, path)
+        self.addAsyncCleanup(listener.wait_closed)
+        self.addCleanup(listener.close)
+        reader, writer = await self.connect(asyncio.open_unix_connection(path))
+        self.assertEqual(await send(reader, writer, 'NEW s 4 mr i 1'),
+                         'OK 1 p1-won 4')
+
+    async def test_idle_games_evicted(self):
+        """
+        Test that only the games idle for longer than idle_timeout are
+        dropped.
+        """
+        server = GameServer(self.executor, idle_timeout=10)
+        for _ in range(3):
+            await server.command('NEW s 10 i i 1')
+        server._games['2'].last_used -= 5
+        server._games['3'].last_used -= 20
+        self.assertEqual(server.evict(), ['3'])
+        self.assertEqual(len(server), 2)
+
+    async def test_searching_games_not_evicted(self):
+        """
+        Test that a game is kept while its strategies are searching, even
+        past idle_timeout.
+        """
+        server = GameServer(self.executor, idle_timeout=10)
+        await server.command('NEW s 10 i i 1')
+        server_game = server._games['1']
+        server_game.last_used -= 20
+        async with server_game.lock:
+            self.assertEqual(server.evict(), [])
+        self.assertEqual(server.evict(), ['1'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -13,11 +13,14 @@ class GameState:
     WIN - score if player is in a winning position
     LOSE - score if player is in a losing position
     DRAW - score if player is in a tied position
+    IN_PLACE - whether apply_move and undo_move are implemented
     p1_turn - whether it is p1's turn or not
     """
+    __slots__ = ('p1_turn',)
     WIN: int = 1
     LOSE: int = -1
     DRAW: int = 0
+    IN_PLACE: bool = False
     p1_turn: bool
 
     def __init__(self, is_p1_turn: bool) -> None:
@@ -55,6 +58,22 @@ class GameState:
         """
         raise NotImplementedError
 
+    def apply_move(self, move: Any) -> Any:
+        """
+        Apply move to this GameState in place, and return what undo_move
+        needs to take it back.
+
+        Only states whose class sets IN_PLACE implement this.
+        """
+        raise NotImplementedError
+
+    def undo_move(self, move: Any, undo: Any) -> None:
+        """
+        Take back move, the last move applied to this GameState by
+        apply_move, which returned undo.
+        """
+        raise NotImplementedError
+
     def is_valid_move(self, move: Any) -> bool:
         """
         Return whether move is a valid move for this GameState.
@@ -68,6 +87,35 @@ class GameState:
         """
         raise NotImplementedError
 
+    def get_key(self) -> Any:
+        """
+        Return a hashable key identifying this state, so that equal states
+        (reached by different move orders) share the same key.
+        """
+        return repr(self)
+
+    def get_canonical_key(self) -> Any:
+        """
+        Return a hashable key shared by this state and every state that is
+        the same as it up to a symmetry of the game, so that they have the
+        same score.
+        """
+        return self.get_key()
+
+    def to_bytes(self) -> bytes:
+        """
+        Return this GameState in a compact binary form that from_bytes
+        turns back into it.
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def from_bytes(data: bytes) -> 'GameState':
+        """
+        Return the GameState that to_bytes() turned into data.
+        """
+        raise NotImplementedError
+
     def rough_outcome(self) -> float:
         """
         Return an estimate in interval [LOSE, WIN] of best outcome the current
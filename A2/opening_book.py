@@ -0,0 +1,184 @@
+"""
+An opening book for Stonehenge.
+
+The book holds the best move of every position reachable in at most depth
+moves from the starting board of one side length, with either player
+starting. It is saved as a binary file: a header followed by one fixed-size
+record (Zobrist hash, cell number) per position, sorted by hash, so that a
+memory-mapped book answers in O(log n) without being read into memory.
+
+To build the book of side length 3 to depth 2 with alpha-beta:
+
+    python opening_book.py 3 2 book3.bin --strategy ab
+"""
+from typing import Any, Callable, Iterator, Optional
+import argparse
+import importlib
+import mmap
+import struct
+from game import Game
+from stonehenge import StonehengeGame, StonehengeState, helper_topology
+from strategy import alphabeta_minimax
+
+# The header holds a magic number, the format version, the side length and
+# the number of records; each record holds a Zobrist hash and a cell number.
+MAGIC = b'SHOB'
+VERSION = 1
+HEADER = struct.Struct('<4sHHI')
+RECORD = struct.Struct('<QH')
+
+
+def helper_positions(size: int, depth: int) -> Iterator[StonehengeState]:
+    """
+    Yield every position, once, that is reachable in at most depth moves
+    from the starting board of side length size with either player
+    starting and is not the end of the game.
+
+    >>> len(list(helper_positions(1, 0)))
+    2
+    >>> len(list(helper_positions(1, 1)))
+    2
+    """
+    layer = [StonehengeGame(p1_starts, size).current_state
+             for p1_starts in [True, False]]
+    seen = set()
+    for ply in range(depth + 1):
+        next_layer = []
+        for state in layer:
+            if state.zobrist in seen or state.is_finished:
+                continue
+            seen.add(state.zobrist)
+            yield state
+            if ply < depth:
+                next_layer.extend(state.make_move(move)
+                                  for move in state.get_possible_moves())
+        layer = next_layer
+
+
+def build_book(size: int, depth: int, path: str,
+               strategy: Callable = alphabeta_minimax) -> int:
+    """
+    Write to path the book of side length size to depth depth, with the
+    moves chosen by strategy, and return the number of positions in it.
+    """
+    game = StonehengeGame(True, size)
+    topology = helper_topology(size)
+    records = []
+    for state in helper_positions(size, depth):
+        game.current_state = state
+        records.append((state.zobrist, topology.index[strategy(game)]))
+    records.sort()
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, size, len(records)))
+        for record in records:
+            file.write(RECORD.pack(*record))
+    return len(records)
+
+
+class OpeningBook:
+    """
+    A Stonehenge opening book read from a memory-mapped file.
+
+    size - the side length of the board the book is for
+    """
+    size: int
+
+    def __init__(self, path: str) -> None:
+        """
+        Open the book saved at path.
+
+        Raise a ValueError if the file is not a whole book of this version.
+        """
+        error = ValueError("{} is not a version {} opening book".format(
+            path, VERSION))
+        with open(path, 'rb') as file:
+            try:
+                self._map = mmap.mmap(file.fileno(), 0,
+                                      access=mmap.ACCESS_READ)
+            except ValueError:
+                # An empty file cannot be mapped.
+                raise error from None
+        try:
+            if len(self._map) < HEADER.size:
+                raise error
+            magic, version, self.size, self._count = HEADER.unpack_from(
+                self._map, 0)
+            if magic != MAGIC or version != VERSION or self.size < 1 or \
+                    len(self._map) != HEADER.size + self._count * RECORD.size:
+                raise error
+            self._names = helper_topology(self.size).names
+        except Exception:
+            self._map.close()
+            raise
+
+    def __len__(self) -> int:
+        """
+        Return the number of positions in this book.
+        """
+        return self._count
+
+    def lookup(self, state: StonehengeState) -> Optional[str]:
+        """
+        Return the move this book gives for state, or None if state is not
+        in it.
+        """
+        if state.size != self.size:
+            return None
+        key = state.zobrist
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if RECORD.unpack_from(
+                    self._map, HEADER.size + middle * RECORD.size)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low == self._count:
+            return None
+        found, cell = RECORD.unpack_from(self._map,
+                                         HEADER.size + low * RECORD.size)
+        return self._names[cell] if found == key else None
+
+    def close(self) -> None:
+        """
+        Close the file of this book.
+        """
+        self._map.close()
+
+
+def book_strategy(book: OpeningBook, fallback: Callable) -> Callable:
+    """
+    Return a strategy that plays the move of book while the game is in it,
+    and the move of fallback once it is not.
+    """
+    def strategy(game: Game) -> Any:
+        """
+        Return the book move for game, or the move of fallback.
+        """
+        move = book.lookup(game.current_state)
+        if move is not None and game.current_state.is_valid_move(move):
+            return move
+        return fallback(game)
+    return strategy
+
+
+def main(argv: Optional[list] = None) -> None:
+    """
+    Build a book from the command-line arguments argv.
+    """
+    parser = argparse.ArgumentParser(description="Build a Stonehenge "
+                                                 "opening book.")
+    parser.add_argument('size', type=int, help="side length of the board")
+    parser.add_argument('depth', type=int, help="moves from the start")
+    parser.add_argument('out', help="file to write the book to")
+    parser.add_argument('--strategy', default='ab',
+                        help="key of the strategy in usable_strategies")
+    args = parser.parse_args(argv)
+    interface = importlib.import_module('game_interface')
+    count = build_book(args.size, args.depth, args.out,
+                       interface.usable_strategies[args.strategy])
+    print("{} positions written to {}".format(count, args.out))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Unittests for the Stonehenge opening book.
+"""
+import unittest
+from unittest.mock import patch
+import mmap
+import os
+import struct
+import tempfile
+
+from opening_book import (HEADER, RECORD, OpeningBook, book_strategy,
+                          build_book, helper_positions)
+from strategy import recursive_minimax, rough_outcome_strategy
+from stonehenge import StonehengeGame
+
+
+class OpeningBookUnitTests(unittest.TestCase):
+    def setUp(self):
+        """
+        Build the book of side length 2 to depth 2 with recursive minimax.
+        """
+        handle, self.path = tempfile.mkstemp()
+        os.close(handle)
+        self.count = build_book(2, 2, self.path, recursive_minimax)
+        self.book = OpeningBook(self.path)
+
+    def tearDown(self):
+        """
+        Close and remove the book.
+        """
+        self.book.close()
+        os.remove(self.path)
+
+    def test_file_is_sorted_records(self):
+        """
+        Test that the file is a header then one sorted record per position.
+        """
+        with open(self.path, 'rb') as file:
+            data = file.read()
+        self.assertEqual(len(data), HEADER.size + self.count * RECORD.size)
+        keys = [key for key, _ in struct.iter_unpack(
+            RECORD.format, data[HEADER.size:])]
+        self.assertEqual(keys, sorted(keys))
+        self.assertEqual(len(self.book), self.count)
+
+    def test_lookup_matches_search(self):
+        """
+        Test that the book gives the searched move of every position in it.
+        """
+        game = StonehengeGame(True, 2)
+        for state in helper_positions(2, 2):
+            game.current_state = state
+            self.assertEqual(self.book.lookup(state),
+                             recursive_minimax(game))
+
+    def test_out_of_book_falls_back(self):
+        """
+        Test that positions out of the book are played by the fallback.
+        """
+        calls = []
+
+        def fallback(game):
+            calls.append(game.current_state)
+            return rough_outcome_strategy(game)
+        strategy = book_strategy(self.book, fallback)
+        game = StonehengeGame(False, 2)
+        strategy(game)
+        self.assertEqual(calls, [])
+        for move in ['A', 'B', 'C']:
+            game.current_state = game.current_state.make_move(move)
+        self.assertIsNone(self.book.lookup(game.current_state))
+        strategy(game)
+        self.assertEqual(calls, [game.current_state])
+        self.assertIsNone(self.book.lookup(StonehengeGame(True, 1)
+                                           .current_state))
+
+    def test_rejects_other_files(self):
+        """
+        Test that a file that is not a whole book, however short, is
+        refused with a ValueError, and that its map is closed.
+        """
+        with open(self.path, 'rb') as file:
+            book = file.read()
+        maps = []
+        open_map = mmap.mmap
+
+        def record_map(*args, **kwargs):
+            maps.append(open_map(*args, **kwargs))
+            return maps[-1]
+        for data in [b'not a book at all', b'', b'OB', book[:HEADER.size - 1],
+                     book[:-1], book + b'\x00']:
+            with open(self.path, 'wb') as file:
+                file.write(data)
+            with patch('opening_book.mmap.mmap', record_map):
+                with self.assertRaises(ValueError, msg=repr(data[:20])):
+                    OpeningBook(self.path)
+        self.assertEqual(len(maps), 5)
+        self.assertTrue(all(each.closed for each in maps))
+
+
+if __name__ == "__main__":
+    unittest.main()
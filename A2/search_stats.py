@@ -0,0 +1,173 @@
+"""
+Statistics recorded by the search strategies while they search.
+
+A strategy given a SearchStats fills it in as it goes. Strategies called
+without one only pay for an `is not None` check at each node.
+"""
+from typing import Any
+
+
+class SearchStats:
+    """
+    Counts of the work done by a search.
+
+    nodes - nodes[d] is the number of states visited d moves below the root
+    terminals - the number of visited states where the game is over
+    cache_hits - the number of transposition table lookups that found a
+                 score
+    cache_misses - the number of transposition table lookups that found
+                   nothing
+    cutoffs - the number of times the remaining children of a state were
+              skipped by alpha-beta pruning
+    root_times - the seconds spent searching below each root move
+    """
+    nodes: list
+    terminals: int
+    cache_hits: int
+    cache_misses: int
+    cutoffs: int
+    root_times: dict
+
+    def __init__(self) -> None:
+        """
+        Create a new SearchStats with nothing recorded.
+
+        >>> s = SearchStats()
+        >>> (s.total_nodes, s.terminals, s.cutoffs)
+        (0, 0, 0)
+        """
+        self.nodes = [1]
+        self.terminals = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cutoffs = 0
+        self.root_times = {}
+
+    def visit(self, depth: int) -> None:
+        """
+        Record a visit to a state depth moves below the root.
+
+        >>> s = SearchStats()
+        >>> s.visit(1)
+        >>> s.visit(2)
+        >>> s.visit(2)
+        >>> s.nodes
+        [1, 1, 2]
+        """
+        while len(self.nodes) <= depth:
+            self.nodes.append(0)
+        self.nodes[depth] += 1
+
+    def time_root_move(self, move: Any, seconds: float) -> None:
+        """
+        Add seconds to the time spent below the root move move.
+
+        >>> s = SearchStats()
+        >>> s.time_root_move(1, 0.5)
+        >>> s.time_root_move(1, 0.25)
+        >>> s.root_times
+        {1: 0.75}
+        """
+        self.root_times[move] = self.root_times.get(move, 0) + seconds
+
+    def merge(self, other: 'SearchStats', depth: int = 0) -> None:
+        """
+        Add the counts of other, a search rooted depth moves below the root
+        of self, to self.
+
+        >>> s, t = SearchStats(), SearchStats()
+        >>> t.visit(1)
+        >>> t.terminals += 1
+        >>> s.merge(t, 1)
+        >>> (s.nodes, s.terminals)
+        ([1, 0, 1], 1)
+        """
+        for i, count in enumerate(other.nodes[1:], depth + 1):
+            while len(self.nodes) <= i:
+                self.nodes.append(0)
+            self.nodes[i] += count
+        self.terminals += other.terminals
+        self.cache_hits += other.cache_hits
+        self.cache_misses += other.cache_misses
+        self.cutoffs += other.cutoffs
+
+    @property
+    def total_nodes(self) -> int:
+        """
+        Return the number of states visited below the root.
+
+        >>> s = SearchStats()
+        >>> s.visit(1)
+        >>> s.visit(2)
+        >>> s.total_nodes
+        2
+        """
+        return sum(self.nodes[1:])
+
+    @property
+    def effective_branching_factor(self) -> float:
+        """
+        Return the branching factor b of a uniform tree as deep as the
+        search with as many nodes, so that b + b**2 + ... + b**depth is the
+        number of states visited below the root; 0.0 if none were.
+
+        >>> s = SearchStats()
+        >>> for depth in [1, 1, 2, 2, 2, 2]:
+        ...     s.visit(depth)
+        >>> s.effective_branching_factor
+        2.0
+        """
+        total = self.total_nodes
+        depth = len(self.nodes) - 1
+        if total == 0:
+            return 0.0
+        low, high = 0.0, float(total)
+        # Bisect on b; the tree size grows with b.
+        for _ in range(100):
+            middle = (low + high) / 2
+            if helper_tree_size(middle, depth, total) < total:
+                low = middle
+            else:
+                high = middle
+        return round(high, 6)
+
+    def as_dict(self) -> dict:
+        """
+        Return the statistics as a dictionary, suitable for JSON.
+
+        >>> s = SearchStats()
+        >>> s.visit(1)
+        >>> s.as_dict()['nodes']
+        [1, 1]
+        """
+        return {'nodes': list(self.nodes), 'total_nodes': self.total_nodes,
+                'terminals': self.terminals,
+                'effective_branching_factor': self.effective_branching_factor,
+                'cache_hits': self.cache_hits,
+                'cache_misses': self.cache_misses, 'cutoffs': self.cutoffs,
+                'root_times': {str(move): seconds for move, seconds
+                               in self.root_times.items()}}
+
+
+def helper_tree_size(b: float, depth: int, limit: int) -> float:
+    """
+    Return b + b**2 + ... + b**depth, or the first partial sum that reaches
+    limit, so that deep searches do not overflow.
+
+    >>> helper_tree_size(2.0, 3, 100), helper_tree_size(2.0, 5000, 100)
+    (14.0, 126.0)
+    """
+    size = 0.0
+    term = 1.0
+    for _ in range(depth):
+        term *= b
+        size += term
+        if size >= limit:
+            break
+    return size
+
+
+if __name__ == "__main__":
+    from python_ta import check_all
+
+    check_all(config="a2_pyta.txt")
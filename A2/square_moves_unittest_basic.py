@@ -0,0 +1,62 @@
+"""
+Unittests for the lazy SubtractSquare move sequences.
+"""
+import unittest
+import random
+
+from square_moves import SquareMoves
+from subtract_square_state import SubtractSquareState
+from tournament import build_game, play_game
+from game_interface import playable_games
+
+
+class SquareMovesUnitTests(unittest.TestCase):
+    def test_matches_list_of_squares(self):
+        """
+        Test that the sequence holds exactly the squares up to the total.
+        """
+        for total in range(200):
+            expected = [i * i for i in range(1, total + 1) if i * i <= total]
+            moves = SquareMoves(total)
+            self.assertEqual(list(moves), expected)
+            self.assertEqual(len(moves), len(expected))
+            self.assertEqual(moves, expected)
+            for move in range(-2, total + 3):
+                self.assertEqual(move in moves, move in expected)
+            for i, move in enumerate(expected):
+                self.assertEqual(moves[i], move)
+                self.assertEqual(moves.index(move), i)
+
+    def test_rejects_non_int_moves(self):
+        """
+        Test that strings, floats and booleans are not moves.
+        """
+        moves = SquareMoves(20)
+        for move in ['4', 4.0, True, None]:
+            self.assertFalse(move in moves)
+        self.assertFalse(SubtractSquareState(True, 20).is_valid_move('4'))
+
+    def test_repr_is_short(self):
+        """
+        Test that a few moves are written as a list, and that many are
+        written by their total without listing them.
+        """
+        self.assertEqual(repr(SquareMoves(100)), repr(list(SquareMoves(100))))
+        self.assertEqual(repr(SquareMoves(121)), 'SquareMoves(total=121)')
+        self.assertEqual(repr(SquareMoves(10 ** 18)),
+                         'SquareMoves(total={})'.format(10 ** 18))
+
+    def test_huge_total_is_playable(self):
+        """
+        Test that a game starting at 10 ** 12 can be played to the end.
+        """
+        rand = random.Random(0)
+        game = build_game(playable_games['s'], True, 10 ** 12)
+        record = play_game(game, lambda g: rand.choice(
+            g.current_state.get_possible_moves()), lambda g: 1)
+        self.assertIsNotNone(record['winner'])
+        self.assertEqual(game.current_state.current_total, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+"""
+Unittests for the binary form of game states.
+"""
+import unittest
+import pickle
+
+from stonehenge import StonehengeGame, StonehengeState
+from subtract_square_state import SubtractSquareState
+from stonehenge_fixtures import random_states
+
+
+class StonehengeCodecUnitTests(unittest.TestCase):
+    def test_round_trip(self):
+        """
+        Test that every state comes back from its bytes unchanged, in a
+        number of bytes fixed by the side length.
+        """
+        for size in range(1, 11):
+            states = random_states(size, 3, size)
+            lengths = {len(state.to_bytes()) for state in states}
+            self.assertEqual(len(lengths), 1)
+            for state in states:
+                new_state = StonehengeState.from_bytes(state.to_bytes())
+                self.assertEqual(repr(new_state), repr(state))
+                self.assertEqual(new_state.get_key(), state.get_key())
+                self.assertEqual(new_state.get_possible_moves(),
+                                 state.get_possible_moves())
+
+    def test_pickle_uses_bytes(self):
+        """
+        Test that a pickled state is small and still makes moves like the
+        original.
+        """
+        state = random_states(5, 1, 0)[6]
+        state.draw_graph()
+        data = pickle.dumps(state)
+        self.assertLess(len(data), 100)
+        new_state = pickle.loads(data)
+        move = state.get_possible_moves()[0]
+        self.assertEqual(new_state.make_move(move), state.make_move(move))
+
+    def test_bad_data(self):
+        """
+        Test that data in another format is refused.
+        """
+        data = StonehengeGame(True, 2).current_state.to_bytes()
+        for bad in [b'', data[:-1], data + b'\x00', b's' + data[1:],
+                    data[:1] + b'\x02' + data[2:],
+                    SubtractSquareState(True, 5).to_bytes()]:
+            self.assertRaises(ValueError, StonehengeState.from_bytes, bad)
+
+
+class SubtractSquareCodecUnitTests(unittest.TestCase):
+    def test_round_trip(self):
+        """
+        Test that states come back from their bytes unchanged.
+        """
+        for total in [0, 1, 18, 10 ** 12, 2 ** 64 - 1]:
+            for p1_turn in [True, False]:
+                state = SubtractSquareState(p1_turn, total)
+                data = state.to_bytes()
+                self.assertEqual(len(data), 11)
+                self.assertEqual(repr(SubtractSquareState.from_bytes(data)),
+                                 repr(state))
+                self.assertEqual(repr(pickle.loads(pickle.dumps(state))),
+                                 repr(state))
+
+    def test_too_large(self):
+        """
+        Test that a total too large for the format is refused, but can
+        still be pickled.
+        """
+        state = SubtractSquareState(True, 2 ** 64)
+        self.assertRaises(ValueError, state.to_bytes)
+        self.assertEqual(pickle.loads(pickle.dumps(state)).current_total,
+                         2 ** 64)
+        self.assertRaises(ValueError, SubtractSquareState.from_bytes,
+                          b's\x02' + bytes(9))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,207 @@
+"""
+A solver that finds the outcome of every state reachable from a game's
+current state, and an on-disk database of the outcomes.
+
+It works for any game whose states never repeat along a line of play and
+have a hashable get_key(). The states are found breadth-first, each one
+once, and then scored from the end of the game back: a state is scored as
+soon as all of the states its moves lead to are.
+
+To solve Stonehenge of side length 2 into outcomes.db:
+
+    python state_space_solver.py h 2 outcomes.db
+
+One database can hold the outcomes of several games and parameters; each
+is read back with the game and parameter it was solved for.
+"""
+from typing import Any, Callable, Optional
+import argparse
+import importlib
+import sqlite3
+from game import Game
+from strategy import helper_terminal_score
+
+
+def solve_game(game: Game) -> dict:
+    """
+    Return a dictionary mapping the key of every state reachable from
+    game.current_state to (score, move): the score of the state for its
+    current player with perfect play, and a move that achieves it (None
+    where the game is over).
+
+    >>> from subtract_square_game import SubtractSquareGame
+    >>> outcomes = solve_game(SubtractSquareGame(True, 18))
+    >>> outcomes[SubtractSquareGame(True, 18).current_state.get_key()]
+    (1, 1)
+    """
+    root = game.current_state
+    # The keys of the states each state's moves lead to, by move.
+    children = {}
+    parents = {}
+    outcomes = {}
+    solved = []
+    layer = [root]
+    children[root.get_key()] = None
+    while layer:
+        next_layer = []
+        for state in layer:
+            key = state.get_key()
+            if game.is_over(state):
+                outcomes[key] = (helper_terminal_score(game, state), None)
+                solved.append(key)
+                continue
+            moves = []
+            for move in state.get_possible_moves():
+                new_state = state.make_move(move)
+                new_key = new_state.get_key()
+                moves.append((move, new_key))
+                parents.setdefault(new_key, []).append(key)
+                if new_key not in children:
+                    children[new_key] = None
+                    next_layer.append(new_state)
+            children[key] = moves
+        layer = next_layer
+    # The number of distinct children of each state not scored yet.
+    pending = {key: len({new_key for _, new_key in moves})
+               for key, moves in children.items() if moves is not None}
+    for key in solved:
+        for parent in set(parents.get(key, [])):
+            pending[parent] -= 1
+            if pending[parent] == 0:
+                outcomes[parent] = helper_best(children[parent], outcomes)
+                solved.append(parent)
+    if len(outcomes) != len(children):
+        raise ValueError("the states of the game repeat")
+    return outcomes
+
+
+def helper_best(moves: list, outcomes: dict) -> tuple:
+    """
+    Return (score, move) for the first of moves, a list of (move, key of
+    the state it leads to), that leaves the opponent the lowest score.
+
+    >>> helper_best([(1, 'a'), (4, 'b')], {'a': (1, None), 'b': (-1, None)})
+    (1, 4)
+    """
+    best_move = None
+    best_score = None
+    for move, key in moves:
+        score = -outcomes[key][0]
+        if best_score is None or score > best_score:
+            best_score = score
+            best_move = move
+    return best_score, best_move
+
+
+def save_outcomes(outcomes: dict, path: str, game: str,
+                  param: int) -> None:
+    """
+    Write outcomes, as returned by solve_game for the game of key game in
+    playable_games started from param, to the database at path, adding to
+    or replacing the outcomes of that game and param already in it.
+
+    The rows are keyed on game and param as well as on the state's key, so
+    that states of different games or board sizes never replace each
+    other, even where their keys are the same.
+    """
+    connection = sqlite3.connect(path)
+    with connection:
+        connection.execute("CREATE TABLE IF NOT EXISTS outcomes "
+                           "(game TEXT, param INTEGER, key TEXT, "
+                           "score INTEGER, move TEXT, "
+                           "PRIMARY KEY (game, param, key))")
+        connection.executemany(
+            "INSERT OR REPLACE INTO outcomes VALUES (?, ?, ?, ?, ?)",
+            ((game, param, repr(key), score,
+              None if move is None else str(move))
+             for key, (score, move) in outcomes.items()))
+    connection.close()
+
+
+class OutcomeDatabase:
+    """
+    The outcomes of the solved states of one game and param, read from a
+    database on disk.
+
+    game - the key of the game in playable_games
+    param - the starting total or board size the game was solved from
+    """
+    game: str
+    param: int
+
+    def __init__(self, path: str, game: str, param: int) -> None:
+        """
+        Open the outcomes of game started from param in the database at
+        path.
+        """
+        self.game = game
+        self.param = param
+        self._connection = sqlite3.connect(path)
+
+    def __len__(self) -> int:
+        """
+        Return the number of states of this game and param in this
+        database.
+        """
+        return self._connection.execute(
+            "SELECT COUNT(*) FROM outcomes WHERE game = ? AND param = ?",
+            (self.game, self.param)).fetchone()[0]
+
+    def lookup(self, state: Any) -> Optional[tuple]:
+        """
+        Return (score, move) for state, with the move as a string, or None
+        if state is not in this database.
+        """
+        return self._connection.execute(
+            "SELECT score, move FROM outcomes "
+            "WHERE game = ? AND param = ? AND key = ?",
+            (self.game, self.param, repr(state.get_key()))).fetchone()
+
+    def close(self) -> None:
+        """
+        Close this database.
+        """
+        self._connection.close()
+
+
+def database_strategy(database: OutcomeDatabase,
+                      fallback: Optional[Callable] = None) -> Callable:
+    """
+    Return a strategy that plays the move database gives for the current
+    state, and the move of fallback for states not in database.
+    """
+    def strategy(game: Game) -> Any:
+        """
+        Return the solved move for game, or the move of fallback.
+        """
+        outcome = database.lookup(game.current_state)
+        if outcome is None or outcome[1] is None:
+            if fallback is None:
+                raise KeyError("the state is not in the database")
+            return fallback(game)
+        return game.str_to_move(outcome[1])
+    return strategy
+
+
+def main(argv: Optional[list] = None) -> None:
+    """
+    Solve a game from the command-line arguments argv.
+    """
+    parser = argparse.ArgumentParser(description="Solve every state of a "
+                                                 "game.")
+    parser.add_argument('game', help="key of the game in playable_games")
+    parser.add_argument('param', type=int,
+                        help="starting total or board size")
+    parser.add_argument('out', help="database to write the outcomes to")
+    args = parser.parse_args(argv)
+    interface = importlib.import_module('game_interface')
+    outcomes = {}
+    for p1_starts in [True, False]:
+        outcomes.update(solve_game(
+            interface.playable_games[args.game](p1_starts, args.param)))
+    save_outcomes(outcomes, args.out, args.game, args.param)
+    print("{} states written to {}".format(len(outcomes), args.out))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Unittests for the full state-space solver and its outcome database.
+"""
+import unittest
+import os
+import tempfile
+
+from state_space_solver import (OutcomeDatabase, database_strategy,
+                                save_outcomes, solve_game)
+from strategy import helper_get_score, rough_outcome_strategy
+from transposition_table import TranspositionTable
+from game_interface import playable_games
+StonehengeGame = playable_games['h']
+SubtractSquareGame = playable_games['s']
+
+
+class StateSpaceSolverUnitTests(unittest.TestCase):
+    def test_subtract_square_scores(self):
+        """
+        Test that every total is scored as minimax scores it.
+        """
+        outcomes = solve_game(SubtractSquareGame(True, 40))
+        game = SubtractSquareGame(True, 40)
+        table = TranspositionTable()
+        for total in range(41):
+            for p1_turn in [True, False]:
+                state = SubtractSquareGame(p1_turn, total).current_state
+                if state.get_key() not in outcomes:
+                    continue
+                self.assertEqual(outcomes[state.get_key()][0],
+                                 helper_get_score(game, state, table))
+
+    def test_stonehenge_moves_keep_score(self):
+        """
+        Test that the solved move of every Stonehenge state leads to a state
+        whose score is the opposite of the state's.
+        """
+        game = StonehengeGame(False, 2)
+        outcomes = solve_game(game)
+        self.assertEqual(len(outcomes), 2135)
+        root = game.current_state
+        state = root
+        while not game.is_over(state):
+            score, move = outcomes[state.get_key()]
+            state = state.make_move(move)
+            self.assertEqual(outcomes[state.get_key()][0], -score)
+        self.assertEqual(outcomes[root.get_key()][0],
+                         helper_get_score(game, root))
+
+    def test_database_strategy(self):
+        """
+        Test that the database answers the solved moves and falls back for
+        states it does not hold.
+        """
+        handle, path = tempfile.mkstemp()
+        os.close(handle)
+        try:
+            game = SubtractSquareGame(True, 30)
+            outcomes = solve_game(game)
+            save_outcomes(outcomes, path, 's', 30)
+            database = OutcomeDatabase(path, 's', 30)
+            self.assertEqual(len(database), len(outcomes))
+            strategy = database_strategy(database, rough_outcome_strategy)
+            self.assertEqual(strategy(game),
+                             outcomes[game.current_state.get_key()][1])
+            strategy(SubtractSquareGame(True, 31))
+            with self.assertRaises(KeyError):
+                database_strategy(database)(SubtractSquareGame(True, 31))
+            database.close()
+        finally:
+            os.remove(path)
+
+    def test_sizes_kept_apart(self):
+        """
+        Test that the outcomes of two board sizes saved to one database do
+        not replace each other, and are each read back for their own size.
+        """
+        handle, path = tempfile.mkstemp()
+        os.close(handle)
+        try:
+            games = {size: StonehengeGame(True, size) for size in [1, 2]}
+            outcomes = {size: solve_game(game)
+                        for size, game in games.items()}
+            for size in games:
+                save_outcomes(outcomes[size], path, 'h', size)
+            for size, game in games.items():
+                database = OutcomeDatabase(path, 'h', size)
+                self.assertEqual(len(database), len(outcomes[size]))
+                score, move = outcomes[size][game.current_state.get_key()]
+                self.assertEqual(database.lookup(game.current_state),
+                                 (score, move))
+                database.close()
+            database = OutcomeDatabase(path, 'h', 3)
+            self.assertEqual(len(database), 0)
+            self.assertIsNone(database.lookup(games[1].current_state))
+            database.close()
+        finally:
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,15 +2,30 @@
 An implementation of a state for Stonehenge.
 """
 from typing import Any
-from copy import deepcopy
+from copy import copy, deepcopy
+from itertools import permutations, product
+import random
+import struct
 from game_state import GameState
 from game import Game
 
+# The Zobrist keys of each board size, built the first time they are needed.
+ZOBRIST_KEYS = {}
+# The StonehengeTopology of each board size, built the first time it is
+# needed.
+TOPOLOGIES = {}
+# The binary form of a state: a header of b'h', the version of the format,
+# the side length and 1 if it is p1's turn (0 if not), then the owner of
+# every cell and then every ley-line, two bits each.
+STATE_VERSION = 1
+STATE_HEADER = struct.Struct('<cBBB')
+
 
 class StonehengeState(GameState):
     """
     The state of a game at a certain point in time.
     """
+    IN_PLACE = True
 
     def __init__(self, is_p1_turn: bool, size: int,
                  left_leyline, ley_line,
@@ -39,8 +54,10 @@ class StonehengeState(GameState):
         self.left_leyline = deepcopy(left_leyline)
         self.ley_line = deepcopy(ley_line)
         self.right_leyline = deepcopy(right_leyline)
-        self.graph = "Haven't drawn yet"
-        self.draw_graph()
+        self._zobrist = None
+        self._canonical = None
+        self._tallies, self._claimed, self._empty = helper_tally(self)
+        self._graph = None
 
     def draw_graph(self) -> None:
         """
@@ -51,197 +68,32 @@ class StonehengeState(GameState):
         >>> a.graph == a.__str__()
         True
         """
-        if self.size == 1:
-            self.graph = (
-                """
-      {}   {}
-     /   / 
-{} - {} - {}  
-     \\ / \\ 
-  {} - {}   {}
-       \\   
-        {}   """).format(self.left_leyline[0][0],
-                         self.left_leyline[1][0],
-                         self.ley_line[0][0],
-                         self.ley_line[0][1],
-                         self.ley_line[0][2],
-                         self.ley_line[1][0],
-                         self.ley_line[1][1],
-                         self.right_leyline[-1][-1],
-                         self.right_leyline[-2][-1])
-        if self.size == 2:
-            self.graph = (
-                """
-        {}   {}  
-       /   /   
-  {} - {} - {}   {}
-     / \\ / \\ / 
-{} - {} - {} - {}  
-     \\ / \\ / \\  
-  {} - {} - {}   {}
-       \\   \\   
-        {}   {}   """).format(self.left_leyline[0][0],
-                              self.left_leyline[1][0],
-                              self.ley_line[0][0],
-                              self.ley_line[0][1],
-                              self.ley_line[0][2],
-                              self.left_leyline[2][0],
-                              self.ley_line[1][0],
-                              self.ley_line[1][1],
-                              self.ley_line[1][2],
-                              self.ley_line[1][3],
-                              self.ley_line[2][0],
-                              self.ley_line[2][1],
-                              self.ley_line[2][2],
-                              self.right_leyline[-1][-1],
-                              self.right_leyline[-3][-1],
-                              self.right_leyline[-2][-1])
-        if self.size == 3:
-            self.graph = (
-                """
-          {}   {}    
-         /   /     
-    {} - {} - {}   {}  
-       / \\ / \\ /   
-  {} - {} - {} - {}   {}
-     / \\ / \\ / \\ / 
-{} - {} - {} - {} - {}  
-     \\ / \\ / \\ / \\ 
-  {} - {} - {} - {}   {}
-       \\   \\   \\   
-        {}   {}   {} 
-                   """).format(self.left_leyline[0][0],
-                               self.left_leyline[1][0],
-                               self.ley_line[0][0],
-                               self.ley_line[0][1],
-                               self.ley_line[0][2],
-                               self.left_leyline[2][0],
-                               self.ley_line[1][0],
-                               self.ley_line[1][1],
-                               self.ley_line[1][2],
-                               self.ley_line[1][3],
-                               self.left_leyline[3][0],
-                               self.ley_line[2][0],
-                               self.ley_line[2][1],
-                               self.ley_line[2][2],
-                               self.ley_line[2][3],
-                               self.ley_line[2][4],
-                               self.ley_line[3][0],
-                               self.ley_line[3][1],
-                               self.ley_line[3][2],
-                               self.ley_line[3][3],
-                               self.right_leyline[-1][-1],
-                               self.right_leyline[-4][-1],
-                               self.right_leyline[-3][-1],
-                               self.right_leyline[-2][-1])
-        if self.size == 4:
-            self.graph = (
-                """
-            {}   {}      
-           /   /       
-      {} - {} - {}   {}    
-         / \\ / \\ /     
-    {} - {} - {} - {}   {}  
-       / \\ / \\ / \\ /   
-  {} - {} - {} - {} - {}   {}
-     / \\ / \\ / \\ / \\ / 
-{} - {} - {} - {} - {} - {}  
-     \\ / \\ / \\ / \\ / \\ 
-  {} - {} - {} - {} - {}   {}
-       \\   \\   \\   \\   
-        {}   {}   {}   {}   """).format(self.left_leyline[0][0],
-                                        self.left_leyline[1][0],
-                                        self.ley_line[0][0],
-                                        self.ley_line[0][1],
-                                        self.ley_line[0][2],
-                                        self.left_leyline[2][0],
-                                        self.ley_line[1][0],
-                                        self.ley_line[1][1],
-                                        self.ley_line[1][2],
-                                        self.ley_line[1][3],
-                                        self.left_leyline[3][0],
-                                        self.ley_line[2][0],
-                                        self.ley_line[2][1],
-                                        self.ley_line[2][2],
-                                        self.ley_line[2][3],
-                                        self.ley_line[2][4],
-                                        self.left_leyline[4][0],
-                                        self.ley_line[3][0],
-                                        self.ley_line[3][1],
-                                        self.ley_line[3][2],
-                                        self.ley_line[3][3],
-                                        self.ley_line[3][4],
-                                        self.ley_line[3][5],
-                                        self.ley_line[4][0],
-                                        self.ley_line[4][1],
-                                        self.ley_line[4][2],
-                                        self.ley_line[4][3],
-                                        self.ley_line[4][4],
-                                        self.right_leyline[-1][-1],
-                                        self.right_leyline[-5][-1],
-                                        self.right_leyline[-4][-1],
-                                        self.right_leyline[-3][-1],
-                                        self.right_leyline[-2][-1])
-        if self.size == 5:
-            self.graph = (
-                """
-              {}   {}        
-             /   /         
-        {} - {} - {}   {}      
-           / \\ / \\ /       
-      {} - {} - {} - {}   {}    
-         / \\ / \\ / \\ /     
-    {} - {} - {} - {} - {}   {}  
-       / \\ / \\ / \\ / \\ /   
-  {} - {} - {} - {} - {} - {}   {}
-     / \\ / \\ / \\ / \\ / \\ / 
-{} - {} - {} - {} - {} - {} - {}  
-     \\ / \\ / \\ / \\ / \\ / \\ 
-  {} - {} - {} - {} - {} - {}   {}
-       \\   \\   \\   \\   \\   
-        {}   {}   {}   {}   {}   """).format(self.left_leyline[0][0],
-                                             self.left_leyline[1][0],
-                                             self.ley_line[0][0],
-                                             self.ley_line[0][1],
-                                             self.ley_line[0][2],
-                                             self.left_leyline[2][0],
-                                             self.ley_line[1][0],
-                                             self.ley_line[1][1],
-                                             self.ley_line[1][2],
-                                             self.ley_line[1][3],
-                                             self.left_leyline[3][0],
-                                             self.ley_line[2][0],
-                                             self.ley_line[2][1],
-                                             self.ley_line[2][2],
-                                             self.ley_line[2][3],
-                                             self.ley_line[2][4],
-                                             self.left_leyline[4][0],
-                                             self.ley_line[3][0],
-                                             self.ley_line[3][1],
-                                             self.ley_line[3][2],
-                                             self.ley_line[3][3],
-                                             self.ley_line[3][4],
-                                             self.ley_line[3][5],
-                                             self.left_leyline[5][0],
-                                             self.ley_line[4][0],
-                                             self.ley_line[4][1],
-                                             self.ley_line[4][2],
-                                             self.ley_line[4][3],
-                                             self.ley_line[4][4],
-                                             self.ley_line[4][5],
-                                             self.ley_line[4][6],
-                                             self.ley_line[5][0],
-                                             self.ley_line[5][1],
-                                             self.ley_line[5][2],
-                                             self.ley_line[5][3],
-                                             self.ley_line[5][4],
-                                             self.ley_line[5][5],
-                                             self.right_leyline[-1][-1],
-                                             self.right_leyline[-6][-1],
-                                             self.right_leyline[-5][-1],
-                                             self.right_leyline[-4][-1],
-                                             self.right_leyline[-3][-1],
-                                             self.right_leyline[-2][-1])
+        topology = helper_topology(self.size)
+        families = [self.ley_line, self.left_leyline, self.right_leyline]
+        self._graph = topology.template.format(
+            *[families[family][row][position]
+              for family, row, position in topology.fields])
+
+    @property
+    def graph(self) -> str:
+        """
+        Return the drawing of this state, drawing it the first time it is
+        asked for.
+        >>> a = StonehengeState(True, 1, [['@', 'A'], ['@', 'B', 'C']],\
+        [['@', 'A', 'B'], ['@', 'C']], [['A', 'C', '@'], ['B', '@']], False)
+        >>> print(a.graph)
+        <BLANKLINE>
+              @   @
+             /   /
+        @ - A - B
+             \\ / \\
+          @ - C   @
+               \\
+                @
+        """
+        if self._graph is None:
+            self.draw_graph()
+        return self._graph
 
     def __str__(self) -> str:
         """
@@ -263,16 +115,11 @@ class StonehengeState(GameState):
         >>> a.get_possible_moves()
         ['A', 'B', 'C']
         """
-        acc = []
-        for sublist in self.ley_line:
-            for item in sublist:
-                if item in ['A', 'B', 'C', 'D', 'E', 'F',
-                            'G', 'H', 'I', 'J', 'K', 'L',
-                            'M', 'N', 'O', 'P', 'Q', 'R',
-                            'S', 'T', 'U', 'V', 'W', 'X',
-                            'Y', 'Z'] and not self.is_finished:
-                    acc.append(item)
-        return acc
+        if self.is_finished:
+            return []
+        names = helper_topology(self.size).names
+        return [names[cell] for cell in range(len(names))
+                if self._empty >> cell & 1]
 
     def get_current_player_name(self) -> str:
         """
@@ -299,27 +146,112 @@ class StonehengeState(GameState):
         >>> a.make_move('A')
         False, 1, [[1, 1], ['@', 'B', 'C']], [[1, 1, 'B'], ['@', 'C']], [[1, 'C', 1], ['B', '@']], True
         """
-        new_state = StonehengeState(not self.p1_turn, self.size,
-                                    self.left_leyline,
-                                    self.ley_line, self.right_leyline,
-                                    self.is_finished)
-        helper_change_value(new_state.ley_line, move, self.p1_turn)
-        helper_change_value(new_state.left_leyline, move, self.p1_turn)
-        helper_change_value(new_state.right_leyline, move, self.p1_turn)
-        helper_change_marker(new_state.ley_line, 0, self.p1_turn)
-        helper_change_marker(new_state.left_leyline, 0, self.p1_turn)
-        helper_change_marker(new_state.right_leyline, -1, self.p1_turn)
-        acc = helper_count_marker(new_state.ley_line,
-                                  new_state.left_leyline,
-                                  new_state.right_leyline)
-        acc1 = acc[0]
-        acc2 = acc[1]
-        ley_lines = 3 * (self.size + 1)
-        if acc1 >= (1 / 2 * ley_lines) or (acc2 >= 1 / 2 * ley_lines):
+        topology = helper_topology(self.size)
+        cell = topology.index[move]
+        owner = 1 if self.p1_turn else 2
+        # Only the rows of the three ley-lines through cell are copied; the
+        # new state shares every other row with self.
+        new_state = copy(self)
+        new_state.p1_turn = not self.p1_turn
+        families = [self.ley_line[:], self.left_leyline[:],
+                    self.right_leyline[:]]
+        new_state.ley_line, new_state.left_leyline, \
+            new_state.right_leyline = families
+        new_state._tallies = self._tallies[:]
+        new_state._claimed = self._claimed[:]
+        new_state._empty = self._empty & ~(1 << cell)
+        claimed = [[], [], []]
+        for line, position in topology.cell_places[cell]:
+            family, row, marker = topology.places[line]
+            sublist = families[family][row][:]
+            families[family][row] = sublist
+            sublist[position] = owner
+            tally = 2 * line + owner - 1
+            new_state._tallies[tally] += 1
+            if sublist[marker] == '@' and \
+                    2 * new_state._tallies[tally] >= len(topology.lines[line]):
+                sublist[marker] = owner
+                new_state._claimed[owner - 1] += 1
+                claimed[family].append(row)
+        if 2 * new_state._claimed[owner - 1] >= 3 * (self.size + 1):
             new_state.is_finished = True
-        new_state.draw_graph()
+        new_state._zobrist = helper_zobrist_update(self, move, claimed)
+        new_state._canonical = None
+        new_state._graph = None
         return new_state
 
+    def apply_move(self, move: Any) -> tuple:
+        """
+        Apply move to this GameState in place, and return what undo_move
+        needs to take it back.
+
+        Rows may be shared with other states made by make_move, so the rows
+        of the three ley-lines through the cell are replaced by changed
+        copies rather than changed.
+        >>> a = StonehengeState(True, 1, [['@', 'A'], ['@', 'B', 'C']],\
+        [['@', 'A', 'B'], ['@', 'C']], [['A', 'C', '@'], ['B', '@']], False)
+        >>> b = a.make_move('A')
+        >>> undo = a.apply_move('A')
+        >>> a == b
+        True
+        """
+        topology = helper_topology(self.size)
+        cell = topology.index[move]
+        owner = 1 if self.p1_turn else 2
+        # The hash of the board before the move, which the update needs.
+        zobrist = self.zobrist
+        families = [self.ley_line, self.left_leyline, self.right_leyline]
+        rows = []
+        claimed = [[], [], []]
+        for line, position in topology.cell_places[cell]:
+            family, row, marker = topology.places[line]
+            rows.append((family, row, families[family][row]))
+            sublist = families[family][row][:]
+            families[family][row] = sublist
+            sublist[position] = owner
+            tally = 2 * line + owner - 1
+            self._tallies[tally] += 1
+            if sublist[marker] == '@' and \
+                    2 * self._tallies[tally] >= len(topology.lines[line]):
+                sublist[marker] = owner
+                self._claimed[owner - 1] += 1
+                claimed[family].append(row)
+        undo = (rows, sum(len(lines) for lines in claimed), zobrist,
+                self._canonical, self.is_finished)
+        self._empty &= ~(1 << cell)
+        if 2 * self._claimed[owner - 1] >= 3 * (self.size + 1):
+            self.is_finished = True
+        self._zobrist = helper_zobrist_update(self, move, claimed)
+        self._canonical = None
+        self._graph = None
+        self.p1_turn = not self.p1_turn
+        return undo
+
+    def undo_move(self, move: Any, undo: tuple) -> None:
+        """
+        Take back move, the last move applied by apply_move, which returned
+        undo.
+        >>> a = StonehengeState(True, 1, [['@', 'A'], ['@', 'B', 'C']],\
+        [['@', 'A', 'B'], ['@', 'C']], [['A', 'C', '@'], ['B', '@']], False)
+        >>> before = repr(a)
+        >>> a.undo_move('C', a.apply_move('C'))
+        >>> repr(a) == before
+        True
+        """
+        topology = helper_topology(self.size)
+        cell = topology.index[move]
+        rows, count, self._zobrist, self._canonical, self.is_finished = undo
+        self.p1_turn = not self.p1_turn
+        owner = 1 if self.p1_turn else 2
+        families = [self.ley_line, self.left_leyline, self.right_leyline]
+        for family, row, sublist in rows:
+            families[family][row] = sublist
+        for line in topology.cell_lines[cell]:
+            self._tallies[2 * line + owner - 1] -= 1
+        self._claimed[owner - 1] -= count
+        self._empty |= 1 << cell
+        self._graph = None
+
     def is_valid_move(self, move: Any) -> bool:
         """
         Return whether move is a valid move for this GameState.
@@ -332,7 +264,10 @@ class StonehengeState(GameState):
         >>> a.is_valid_move('D')
         False
         """
-        return move in self.get_possible_moves()
+        topology = helper_topology(self.size)
+        return (isinstance(move, str) and move in topology.index
+                and not self.is_finished
+                and self._empty >> topology.index[move] & 1 == 1)
 
     def __repr__(self) -> Any:
         """
@@ -348,6 +283,144 @@ class StonehengeState(GameState):
                         self.left_leyline,
                         self.ley_line, self.right_leyline, self.is_finished))
 
+    @property
+    def zobrist(self) -> int:
+        """
+        Return the 64-bit Zobrist hash of this state, which covers the owner
+        of every cell and ley-line and the player to move.
+        >>> a = StonehengeState(True, 1, [['@', 'A'], ['@', 'B', 'C']],\
+        [['@', 'A', 'B'], ['@', 'C']], [['A', 'C', '@'], ['B', '@']], False)
+        >>> b = StonehengeState(True, 1, [[1, 1], ['@', 'B', 'C']],\
+        [[1, 1, 'B'], ['@', 'C']], [[1, 'C', 1], ['B', '@']], True)
+        >>> a.zobrist == b.zobrist
+        False
+        >>> b.zobrist ^ ZOBRIST_KEYS[1][4] == a.make_move('A').zobrist
+        True
+        """
+        if self._zobrist is None:
+            self._zobrist = helper_zobrist_hash(self)
+        return self._zobrist
+
+    def __hash__(self) -> int:
+        """
+        Return the hash of this state.
+        >>> a = StonehengeState(True, 1, [['@', 'A'], ['@', 'B', 'C']],\
+        [['@', 'A', 'B'], ['@', 'C']], [['A', 'C', '@'], ['B', '@']], False)
+        >>> hash(a) == a.zobrist
+        True
+        """
+        return self.zobrist
+
+    def __eq__(self, other: Any) -> bool:
+        """
+        Return whether this state and other are the same position.
+        >>> a = StonehengeState(True, 1, [['@', 'A'], ['@', 'B', 'C']],\
+        [['@', 'A', 'B'], ['@', 'C']], [['A', 'C', '@'], ['B', '@']], False)
+        >>> a == a.make_move('A')
+        False
+        >>> a.make_move('A') == a.make_move('A')
+        True
+        """
+        return (isinstance(other, StonehengeState)
+                and self.zobrist == other.zobrist
+                and repr(self) == repr(other))
+
+    def get_key(self) -> int:
+        """
+        Return the Zobrist hash of this state as its key.
+        >>> a = StonehengeState(True, 1, [['@', 'A'], ['@', 'B', 'C']],\
+        [['@', 'A', 'B'], ['@', 'C']], [['A', 'C', '@'], ['B', '@']], False)
+        >>> a.get_key() == a.zobrist
+        True
+        """
+        return self.zobrist
+
+    def get_canonical_key(self) -> int:
+        """
+        Return the smallest Zobrist hash of this state under the symmetries
+        of the board, which every symmetric state shares.
+        >>> a = StonehengeState(True, 1, [['@', 'A'], ['@', 'B', 'C']],\
+        [['@', 'A', 'B'], ['@', 'C']], [['A', 'C', '@'], ['B', '@']], False)
+        >>> a.make_move('A').get_canonical_key() == \
+        a.make_move('B').get_canonical_key()
+        True
+        """
+        if self._canonical is None:
+            symmetries = helper_topology(self.size).symmetries
+            self._canonical = min(helper_symmetric_hash(self, symmetry)
+                                  for symmetry in symmetries)
+        return self._canonical
+
+    def to_bytes(self) -> bytes:
+        """
+        Return this state in binary, in a number of bytes fixed by the side
+        length.
+        >>> a = StonehengeState(True, 1, [['@', 'A'], ['@', 'B', 'C']],\
+        [['@', 'A', 'B'], ['@', 'C']], [['A', 'C', '@'], ['B', '@']], False)
+        >>> a.make_move('A').to_bytes()
+        b'h\\x01\\x01\\x00AD\\x00'
+        """
+        cells, lines = helper_owners(self)
+        packed = 0
+        for i, owner in enumerate(cells + lines):
+            if owner is not None:
+                packed |= owner << 2 * i
+        return STATE_HEADER.pack(b'h', STATE_VERSION, self.size,
+                                 int(self.p1_turn)) + \
+            packed.to_bytes(helper_packed_length(self.size), 'little')
+
+    @staticmethod
+    def from_bytes(data: bytes) -> 'StonehengeState':
+        """
+        Return the state that to_bytes() turned into data.
+
+        Raise a ValueError if data is not a state in this format.
+        >>> a = StonehengeState(True, 1, [['@', 'A'], ['@', 'B', 'C']],\
+        [['@', 'A', 'B'], ['@', 'C']], [['A', 'C', '@'], ['B', '@']], False)
+        >>> b = a.make_move('C').make_move('A')
+        >>> StonehengeState.from_bytes(b.to_bytes()) == b
+        True
+        """
+        if len(data) < STATE_HEADER.size:
+            raise ValueError("not a Stonehenge state")
+        tag, version, size, p1_turn = STATE_HEADER.unpack_from(data)
+        if tag != b'h' or version != STATE_VERSION or size < 1 or \
+                len(data) != STATE_HEADER.size + helper_packed_length(size):
+            raise ValueError("not a version {} Stonehenge state".format(
+                STATE_VERSION))
+        topology = helper_topology(size)
+        packed = int.from_bytes(data[STATE_HEADER.size:], 'little')
+        owners = [packed >> 2 * i & 3 or None
+                  for i in range(len(topology.names) + len(topology.lines))]
+        cells = owners[:len(topology.names)]
+        lines = owners[len(topology.names):]
+        is_finished = 2 * max(lines.count(1), lines.count(2)) >= \
+            len(topology.lines)
+        return helper_from_owners(bool(p1_turn), size, cells, lines,
+                                  is_finished)
+
+    def __reduce__(self) -> tuple:
+        """
+        Return how to pickle this state: as its to_bytes(), so that states
+        sent to other processes are small.
+        >>> import pickle
+        >>> a = StonehengeState(True, 1, [['@', 'A'], ['@', 'B', 'C']],\
+        [['@', 'A', 'B'], ['@', 'C']], [['A', 'C', '@'], ['B', '@']], False)
+        >>> pickle.loads(pickle.dumps(a.make_move('B'))) == a.make_move('B')
+        True
+        """
+        return StonehengeState.from_bytes, (self.to_bytes(),)
+
+    def __copy__(self) -> 'StonehengeState':
+        """
+        Return a shallow copy of this state, which shares its ley-line
+        lists.
+        """
+        new_state = StonehengeState.__new__(StonehengeState)
+        new_state.p1_turn = self.p1_turn
+        new_state.__dict__.update(self.__dict__)
+        return new_state
+
     def rough_outcome(self) -> float:
         """
         Return an estimate in interval [LOSE, WIN] of best outcome the current
@@ -357,10 +430,8 @@ class StonehengeState(GameState):
         >>> a.rough_outcome()
         0
         """
-        acc = helper_count_marker(self.ley_line,
-                                  self.left_leyline, self.right_leyline)
-        acc1 = acc[0]
-        acc2 = acc[1]
+        acc1 = self._claimed[0]
+        acc2 = self._claimed[1]
         ley_lines = 3 * (self.size + 1)
         if self.p1_turn:
             if (acc2 + 1) >= (1 / 2 * ley_lines):
@@ -376,154 +447,584 @@ class StonehengeState(GameState):
             return self.WIN
 
 
-def helper_change_value(lst: Any, move: Any, p1: bool) -> None:
-    """
-    A helper function that changes the value for nake_move.
-    >>> lst = [['@', 'A'], ['@', 'B', 'C']]
-    >>> move = 'A'
-    >>> p1 = True
-    >>> helper_change_value(lst, move, p1)
-    >>> lst
-    [['@', 1], ['@', 'B', 'C']]
-    """
-    for sublist in lst:
-        for i in range(len(sublist)):
-            if move == sublist[i] and p1:
-                sublist[i] = 1
-            if move == sublist[i] and not p1:
-                sublist[i] = 2
-
-
-def helper_change_marker(lst: Any, index: int, p1: bool) -> None:
-    """
-    A helper function that changes the marker for make_move.
-    >>> lst = [['@', 1], ['@', 'B', 'C']]
-    >>> index = 0
-    >>> p1 = True
-    >>> helper_change_marker(lst, index, p1)
-    >>> lst
-    [[1, 1], ['@', 'B', 'C']]
-    """
-    for sublist in lst:
-        acc1 = 0
-        acc2 = 0
-        for i in range(len(sublist)):
-            if p1 and sublist[i] == 1:
-                acc1 += 1
-            if (not p1) and sublist[i] == 2:
-                acc2 += 1
-        if sublist[index] == '@':
-            if acc1 >= ((len(sublist) - 1) * 1 / 2):
-                sublist[index] = 1
-            if acc2 >= ((len(sublist) - 1) * 1 / 2):
-                sublist[index] = 2
-
-
-def helper_count_marker(lst1: list, lst2: list, lst3: list) -> list:
-    """
-    A helper function that count the marker after changing '@'.
-    >>> lst1 = [[1, 1], ['@', 'B', 'C']]
-    >>> lst2 = [[1, 1, 'B'], ['@', 'C']]
-    >>> lst3 = [[1, 'C', 1], ['B', '@']]
-    >>> helper_count_marker(lst1, lst2, lst3)
-    [3, 0]
-    """
-    acc1 = 0
-    acc2 = 0
-    for sublist in lst1:
-        if sublist[0] == 1:
-            acc1 += 1
-        if sublist[0] == 2:
-            acc2 += 1
-    for sublist in lst2:
-        if sublist[0] == 1:
-            acc1 += 1
-        if sublist[0] == 2:
-            acc2 += 1
-    for sublist in lst3:
-        if sublist[-1] == 1:
-            acc1 += 1
-        if sublist[-1] == 2:
-            acc2 += 1
-    return [acc1, acc2]
+class StonehengeTopology:
+    """
+    The cells and ley-lines of a Stonehenge board of one side length.
+
+    Cells are numbered in the order they appear in ley_line, and ley-lines
+    are numbered with the ley_line rows first, then left_leyline, then
+    right_leyline.
+
+    size - the side length of the board
+    names - the name of each cell
+    index - the number of each cell name
+    lines - the cells on each ley-line
+    places - the (family, row, marker position) of each ley-line in the
+             ley-line lists, where family is 0 for ley_line, 1 for
+             left_leyline and 2 for right_leyline
+    cell_places - the (ley-line, position) of each cell in the ley-line
+                  lists
+    cell_lines - the ley-lines each cell lies on
+    masks - the set of cells on each ley-line, as a bit mask
+    full - the set of every cell, as a bit mask
+    template - the drawing of the board with {} in place of each cell and
+               ley-line marker
+    fields - the (family, row, position) in the ley-line lists of the value
+             drawn in each {} of template
+    symmetries - the (cell map, ley-line map) of each symmetry of the
+                 board, the identity first, where each map lists the cell or
+                 ley-line that each cell or ley-line is moved to
+    """
+    size: int
+    names: list
+    index: dict
+    lines: list
+    places: list
+    cell_places: list
+    cell_lines: list
+    masks: list
+    full: int
+    template: str
+    fields: list
+    symmetries: list
+
+    def __init__(self, size: int) -> None:
+        """
+        Build the topology of a board with side length size.
+        >>> topology = StonehengeTopology(1)
+        >>> topology.names
+        ['A', 'B', 'C']
+        >>> topology.lines
+        [[0, 1], [2], [0], [1, 2], [0, 2], [1]]
+        >>> topology.cell_lines
+        [[0, 2, 4], [0, 3, 5], [1, 3, 4]]
+        >>> topology.cell_places[2]
+        [(1, 1), (3, 2), (4, 1)]
+        """
+        left_leyline, ley_line, right_leyline = helper_initial_leylines(size)
+        self.size = size
+        self.names = [item for sublist in ley_line for item in sublist[1:]]
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.lines = []
+        self.places = []
+        self.cell_places = [[] for _ in self.names]
+        self.cell_lines = [[] for _ in self.names]
+        self.masks = []
+        for family, lst, marker in [(0, ley_line, 0), (1, left_leyline, 0),
+                                    (2, right_leyline, -1)]:
+            for row, sublist in enumerate(lst):
+                line = len(self.lines)
+                cells = []
+                mask = 0
+                for position, item in enumerate(sublist):
+                    if item != '@':
+                        cell = self.index[item]
+                        cells.append(cell)
+                        mask |= 1 << cell
+                        self.cell_places[cell].append((line, position))
+                        self.cell_lines[cell].append(line)
+                self.lines.append(cells)
+                self.places.append((family, row, marker))
+                self.masks.append(mask)
+        self.full = (1 << len(self.names)) - 1
+        self.template, self.fields = helper_build_template(
+            size, max(len(name) for name in self.names))
+        self.symmetries = helper_symmetries(self)
+
+
+def helper_build_template(size: int, width: int = 1) -> tuple:
+    """
+    Return the drawing template of a board with side length size whose
+    cell names are at most width characters long, and the (family, row,
+    position) of the value drawn in each of its {}, where family is 0 for
+    ley_line, 1 for left_leyline and 2 for right_leyline.
+    >>> template, fields = helper_build_template(1)
+    >>> print(template.format(*range(9)))
+    <BLANKLINE>
+          0   1
+         /   /
+    2 - 3 - 4
+         \\ / \\
+      5 - 6   7
+           \\
+            8
+    >>> fields
+    [(1, 0, 0), (1, 1, 0), (0, 0, 0), (0, 0, 1), (0, 0, 2), (0, 1, 0), \
+(0, 1, 1), (2, -1, -1), (2, 0, -1)]
+    >>> print(helper_build_template(1, 2)[0].format(*range(10, 19)))
+    <BLANKLINE>
+             10    11
+            /     /
+    12 -- 13 -- 14
+            \\  /  \\
+       15 -- 16    17
+               \\
+                18
+    """
+    # Rows of the drawing are half a step apart, and each step holds a
+    # value and the separator after it.
+    half = width + 1
+    step = 2 * half
+    # The items of each line of the drawing: (column, text, field), where
+    # field is the (family, row, position) of a value drawn as text, or
+    # None for text drawn as it is.
+    lines = [[] for _ in range(2 * size + 6)]
+    field = '{}' if width == 1 else '{:^' + str(width) + '}'
+
+    def edge(line: int, start: int, end: int) -> None:
+        """
+        Draw on line the edge between the values at column start of the
+        line above and column end of the line below.
+        """
+        lines[line].append(((start + end + width - 1) // 2,
+                            '/' if end < start else '\\', None))
+
+    indents = [half * (size - 1 - row) for row in range(size)] + [half]
+    # The markers of the first two left_leylines, above the first row.
+    for k in range(2):
+        column = indents[0] + (k + 1) * step + half
+        lines[1].append((column, field, (1, k, 0)))
+        edge(2, column, column - half)
+    for row in range(size + 1):
+        line = 2 * row + 3
+        cells = row + 2 if row < size else size
+        for k in range(cells + 1):
+            column = indents[row] + k * step
+            lines[line].append((column, field, (0, row, k)))
+            if k > 0:
+                lines[line].append((column - step + width + 1,
+                                    '-' * (step - width - 2), None))
+        # Every full row but the last ends in the marker of a left_leyline,
+        # and the last row in the marker of the last right_leyline.
+        if row < size - 1:
+            lines[line].append((indents[row] + (cells + 1) * step, field,
+                                (1, row + 2, 0)))
+        elif row == size:
+            lines[line].append((indents[row] + (cells + 1) * step, field,
+                                (2, -1, -1)))
+        if row < size:
+            # Edges go from each value down to the values half a step to
+            # its left and right in the row below.
+            lefts = range(1, cells + 2) if row < size - 1 else \
+                range(2, cells + 1)
+            for k in lefts:
+                column = indents[row] + k * step
+                edge(line + 1, column, column - half)
+            for k in range(1, cells + 1):
+                column = indents[row] + k * step
+                edge(line + 1, column, column + half)
+    # The markers of the other right_leylines, below the last row.
+    for k in range(1, size + 1):
+        column = indents[size] + k * step
+        edge(2 * size + 4, column, column + half)
+        lines[2 * size + 5].append((column + half, field, (2, k - 1, -1)))
+    return helper_join_template(lines, width), [
+        place for items in lines
+        for _, _, place in sorted(items, key=lambda item: item[0])
+        if place is not None]
+
+
+def helper_join_template(lines: list, width: int) -> str:
+    """
+    Return the template drawing lines, where each line is a list of
+    (column, text, field) and text is a {} to be filled with a value width
+    characters wide if field is not None.
+    >>> helper_join_template([[(2, '{}', (0, 0, 0)), (0, '-', None)], []], 1)
+    '- {}\\n'
+    """
+    text = []
+    for items in lines:
+        drawn = ''
+        end = 0
+        for column, item, place in sorted(items, key=lambda x: x[0]):
+            drawn += ' ' * (column - end) + item
+            end = column + (len(item) if place is None else width)
+        text.append(drawn)
+    return '\n'.join(text)
+
+
+def helper_symmetries(topology: StonehengeTopology) -> list:
+    """
+    Return the (cell map, ley-line map) of each symmetry of the board of
+    topology, the identity first.
+
+    Each cell lies on one ley-line of each family, so it has a coordinate
+    (its row in that family) per family. A symmetry permutes the families,
+    possibly reversing the rows of some of them, and maps the cells onto
+    themselves.
+    >>> symmetries = helper_symmetries(helper_topology(1))
+    >>> len(symmetries)
+    6
+    >>> symmetries[1]
+    ([1, 0, 2], [0, 1, 5, 4, 3, 2])
+    """
+    count = topology.size + 1
+    coordinates = [tuple(line % count for line in sorted(lines))
+                   for lines in topology.cell_lines]
+    cells = {coordinate: cell for cell, coordinate in enumerate(coordinates)}
+    symmetries = []
+    for order in permutations(range(3)):
+        for reverse in product([False, True], repeat=3):
+            cell_map = []
+            for coordinate in coordinates:
+                image = tuple(count - 1 - coordinate[order[family]]
+                              if reverse[family] else
+                              coordinate[order[family]]
+                              for family in range(3))
+                if image not in cells:
+                    break
+                cell_map.append(cells[image])
+            else:
+                # Family order[f] is moved to family f.
+                line_map = [0] * len(topology.lines)
+                for family in range(3):
+                    for row in range(count):
+                        line_map[order[family] * count + row] = \
+                            family * count + (count - 1 - row
+                                              if reverse[family] else row)
+                symmetries.append((cell_map, line_map))
+    return symmetries
+
+
+def helper_owners(state: StonehengeState) -> tuple:
+    """
+    Return the owner (1, 2 or None) of each cell and each ley-line of state.
+    >>> a = StonehengeState(True, 1, [['@', 'A'], ['@', 'B', 'C']],\
+    [['@', 'A', 'B'], ['@', 'C']], [['A', 'C', '@'], ['B', '@']], False)
+    >>> helper_owners(a.make_move('A'))
+    ([1, None, None], [1, None, 1, None, 1, None])
+    """
+    topology = helper_topology(state.size)
+    families = [state.ley_line, state.left_leyline, state.right_leyline]
+    cells = []
+    for places in topology.cell_places:
+        line, position = places[0]
+        family, row, _ = topology.places[line]
+        item = families[family][row][position]
+        cells.append(item if item in (1, 2) else None)
+    lines = []
+    for family, row, marker in topology.places:
+        item = families[family][row][marker]
+        lines.append(item if item in (1, 2) else None)
+    return cells, lines
+
+
+def helper_symmetric_hash(state: StonehengeState, symmetry: tuple) -> int:
+    """
+    Return the Zobrist hash of the state that symmetry moves state to.
+    >>> a = StonehengeState(True, 1, [['@', 'A'], ['@', 'B', 'C']],\
+    [['@', 'A', 'B'], ['@', 'C']], [['A', 'C', '@'], ['B', '@']], False)
+    >>> identity = helper_topology(1).symmetries[0]
+    >>> helper_symmetric_hash(a.make_move('B'), identity) == \
+    a.make_move('B').zobrist
+    True
+    """
+    keys = helper_zobrist_keys(state.size)
+    count = state.size + 1
+    cell_map, line_map = symmetry
+    cells, lines = helper_owners(state)
+    result = keys[5] if state.p1_turn else keys[5] ^ keys[4]
+    for cell, owner in enumerate(cells):
+        if owner is not None:
+            result ^= keys[0][cell_map[cell]][owner - 1]
+    for line, owner in enumerate(lines):
+        if owner is not None:
+            image = line_map[line]
+            result ^= keys[1 + image // count][image % count][owner - 1]
+    return result
+
+
+def helper_transform(state: StonehengeState, index: int) -> StonehengeState:
+    """
+    Return the state that the symmetry number index of the board moves
+    state to.
+    >>> a = StonehengeState(True, 1, [['@', 'A'], ['@', 'B', 'C']],\
+    [['@', 'A', 'B'], ['@', 'C']], [['A', 'C', '@'], ['B', '@']], False)
+    >>> helper_transform(a.make_move('B'), 1) == a.make_move('A')
+    True
+    """
+    cell_map, line_map = helper_topology(state.size).symmetries[index]
+    cells, lines = helper_owners(state)
+    new_cells = [None] * len(cells)
+    new_lines = [None] * len(lines)
+    for cell, owner in enumerate(cells):
+        new_cells[cell_map[cell]] = owner
+    for line, owner in enumerate(lines):
+        new_lines[line_map[line]] = owner
+    return helper_from_owners(state.p1_turn, state.size, new_cells,
+                              new_lines, state.is_finished)
+
+
+def helper_from_owners(is_p1_turn: bool, size: int, cells: list,
+                       lines: list, is_finished: bool) -> StonehengeState:
+    """
+    Return the state of a board of side length size whose cells and
+    ley-lines have the owners (1, 2 or None) cells and lines.
+    >>> a = StonehengeState(True, 1, [['@', 'A'], ['@', 'B', 'C']],\
+    [['@', 'A', 'B'], ['@', 'C']], [['A', 'C', '@'], ['B', '@']], False)
+    >>> b = a.make_move('A')
+    >>> helper_from_owners(False, 1, *helper_owners(b), True) == b
+    True
+    """
+    topology = helper_topology(size)
+    families = helper_initial_leylines(size)
+    # helper_initial_leylines lists left_leyline first.
+    families = [families[1], families[0], families[2]]
+    for cell, owner in enumerate(cells):
+        if owner is not None:
+            for line, position in topology.cell_places[cell]:
+                family, row, _ = topology.places[line]
+                families[family][row][position] = owner
+    for line, owner in enumerate(lines):
+        if owner is not None:
+            family, row, marker = topology.places[line]
+            families[family][row][marker] = owner
+    return StonehengeState(is_p1_turn, size, families[1], families[0],
+                           families[2], is_finished)
+
+
+def helper_canonical(state: StonehengeState) -> tuple:
+    """
+    Return the state with the smallest Zobrist hash that a symmetry of the
+    board moves state to, and the number of that symmetry.
+    >>> a = StonehengeState(True, 1, [['@', 'A'], ['@', 'B', 'C']],\
+    [['@', 'A', 'B'], ['@', 'C']], [['A', 'C', '@'], ['B', '@']], False)
+    >>> b, index = helper_canonical(a.make_move('C'))
+    >>> b.zobrist == a.make_move('C').get_canonical_key()
+    True
+    >>> helper_map_move('C', 1, index) in ['A', 'B', 'C']
+    True
+    """
+    symmetries = helper_topology(state.size).symmetries
+    hashes = [helper_symmetric_hash(state, symmetry)
+              for symmetry in symmetries]
+    index = hashes.index(min(hashes))
+    return helper_transform(state, index), index
+
+
+def helper_map_move(move: str, size: int, index: int,
+                    inverse: bool = False) -> str:
+    """
+    Return the cell that the symmetry number index of the board of side
+    length size moves the cell move to, or, if inverse, the cell it moves
+    to move.
+
+    A move chosen on the state returned by helper_canonical is mapped back
+    to the original state with inverse=True.
+    >>> helper_map_move('B', 1, 1), helper_map_move('C', 1, 1, True)
+    ('A', 'C')
+    """
+    topology = helper_topology(size)
+    cell_map = topology.symmetries[index][0]
+    cell = topology.index[move]
+    if inverse:
+        return topology.names[cell_map.index(cell)]
+    return topology.names[cell_map[cell]]
+
+
+def helper_topology(size: int) -> StonehengeTopology:
+    """
+    Return the topology of boards with side length size, building it the
+    first time.
+    >>> helper_topology(2) is helper_topology(2)
+    True
+    """
+    if size not in TOPOLOGIES:
+        TOPOLOGIES[size] = StonehengeTopology(size)
+    return TOPOLOGIES[size]
+
+
+def helper_tally(state: StonehengeState) -> list:
+    """
+    Return [tallies, claimed, empty] for state, counted from its ley-line
+    lists, where tallies[2 * line + owner - 1] is the number of cells owner
+    holds on line, claimed[owner - 1] is the number of ley-lines owner has
+    claimed, and empty is the set of unclaimed cells as a bit mask.
+    >>> a = StonehengeState(True, 1, [[1, 1], ['@', 'B', 'C']],\
+    [[1, 1, 'B'], ['@', 'C']], [[1, 'C', 1], ['B', '@']], True)
+    >>> helper_tally(a)
+    [[1, 0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0], [3, 0], 6]
+    """
+    topology = helper_topology(state.size)
+    families = [state.ley_line, state.left_leyline, state.right_leyline]
+    tallies = [0] * (2 * len(topology.lines))
+    claimed = [0, 0]
+    for line, (family, row, marker) in enumerate(topology.places):
+        sublist = families[family][row]
+        cells = sublist[1:] if marker == 0 else sublist[:-1]
+        for item in cells:
+            if item in (1, 2):
+                tallies[2 * line + item - 1] += 1
+        if sublist[marker] in (1, 2):
+            claimed[sublist[marker] - 1] += 1
+    empty = 0
+    for cell in range(len(topology.names)):
+        family, row, _ = topology.places[topology.cell_places[cell][0][0]]
+        position = topology.cell_places[cell][0][1]
+        if families[family][row][position] not in (1, 2):
+            empty |= 1 << cell
+    return [tallies, claimed, empty]
+
+
+def helper_zobrist_keys(size: int) -> list:
+    """
+    Return the Zobrist keys for boards of side length size, building them
+    the first time.
+
+    The keys are [cell keys, ley_line keys, left_leyline keys,
+    right_leyline keys, side key, size key], where each cell or ley-line
+    has one key per owner. They are seeded by size, so they are the same in
+    every process. The size key is in every hash, so that the empty boards
+    of different sizes hash differently.
+    >>> keys = helper_zobrist_keys(1)
+    >>> [len(keys[0]), len(keys[1]), len(keys[2]), len(keys[3])]
+    [3, 2, 2, 2]
+    >>> keys is helper_zobrist_keys(1)
+    True
+    """
+    if size not in ZOBRIST_KEYS:
+        rand = random.Random(size)
+        cells = len(helper_topology(size).names)
+        keys = []
+        for count in [cells, size + 1, size + 1, size + 1]:
+            keys.append([(rand.getrandbits(64), rand.getrandbits(64))
+                         for _ in range(count)])
+        keys.append(rand.getrandbits(64))
+        keys.append(rand.getrandbits(64))
+        ZOBRIST_KEYS[size] = keys
+    return ZOBRIST_KEYS[size]
+
+
+def helper_zobrist_hash(state: StonehengeState) -> int:
+    """
+    Return the Zobrist hash of state, computed from the whole board.
+    >>> a = StonehengeState(True, 1, [['@', 'A'], ['@', 'B', 'C']],\
+    [['@', 'A', 'B'], ['@', 'C']], [['A', 'C', '@'], ['B', '@']], False)
+    >>> helper_zobrist_hash(a) == helper_zobrist_keys(1)[5]
+    True
+    >>> len({StonehengeGame(True, size).current_state.zobrist
+    ...      for size in range(1, 6)})
+    5
+    """
+    keys = helper_zobrist_keys(state.size)
+    result = keys[5]
+    cell = 0
+    for sublist in state.ley_line:
+        for item in sublist[1:]:
+            if item in (1, 2):
+                result ^= keys[0][cell][item - 1]
+            cell += 1
+    markers = [[sublist[0] for sublist in state.ley_line],
+               [sublist[0] for sublist in state.left_leyline],
+               [sublist[-1] for sublist in state.right_leyline]]
+    for family in range(3):
+        for i, item in enumerate(markers[family]):
+            if item in (1, 2):
+                result ^= keys[family + 1][i][item - 1]
+    if not state.p1_turn:
+        result ^= keys[4]
+    return result
+
+
+def helper_zobrist_update(state: StonehengeState, move: str,
+                          claimed: list) -> int:
+    """
+    Return the Zobrist hash of the state reached when the current player of
+    state claims the cell move, along with the ley-lines at positions
+    claimed[0] of ley_line, claimed[1] of left_leyline and claimed[2] of
+    right_leyline.
+    >>> a = StonehengeState(True, 1, [['@', 'A'], ['@', 'B', 'C']],\
+    [['@', 'A', 'B'], ['@', 'C']], [['A', 'C', '@'], ['B', '@']], False)
+    >>> b = a.make_move('C')
+    >>> helper_zobrist_update(a, 'C', [[1], [1], [0]]) == helper_zobrist_hash(b)
+    True
+    """
+    keys = helper_zobrist_keys(state.size)
+    owner = 0 if state.p1_turn else 1
+    cell = helper_topology(state.size).index[move]
+    result = state.zobrist ^ keys[4] ^ keys[0][cell][owner]
+    for family in range(3):
+        for i in claimed[family]:
+            result ^= keys[family + 1][i][owner]
+    return result
+
+
+def helper_cell_name(cell: int) -> str:
+    """
+    Return the name of the cell numbered cell: 'A' to 'Z', then 'AA', 'AB',
+    and so on, like the columns of a spreadsheet.
+    >>> [helper_cell_name(cell) for cell in [0, 25, 26, 27, 51, 52, 701]]
+    ['A', 'Z', 'AA', 'AB', 'AZ', 'BA', 'ZZ']
+    """
+    name = ''
+    cell += 1
+    while cell > 0:
+        cell, letter = divmod(cell - 1, 26)
+        name = chr(ord('A') + letter) + name
+    return name
+
+
+def helper_packed_length(size: int) -> int:
+    """
+    Return the number of bytes that the owners of the cells and ley-lines
+    of a board of side length size take in to_bytes().
+    >>> helper_packed_length(1), helper_packed_length(5)
+    (3, 11)
+    """
+    topology = helper_topology(size)
+    return (2 * (len(topology.names) + len(topology.lines)) + 7) // 8
+
+
+def helper_initial_leylines(size: int) -> list:
+    """
+    Return [left_leyline, ley_line, right_leyline] for a new board of side
+    length size.
+
+    Row r of ley_line has r + 2 cells, except the last, which has size
+    cells. A cell's column is its position in its row, counted from one
+    further left in the last row; left_leyline k holds the cells of column
+    k, and right_leyline k the cells whose column is k - size + 1 more
+    than their row.
+    >>> helper_initial_leylines(1)
+    [[['@', 'A'], ['@', 'B', 'C']], [['@', 'A', 'B'], ['@', 'C']], \
+[['A', 'C', '@'], ['B', '@']]]
+    >>> helper_initial_leylines(2)[2]
+    [['C', 'F', '@'], ['A', 'D', 'G', '@'], ['B', 'E', '@']]
+    """
+    ley_line = []
+    left_leyline = [['@'] for _ in range(size + 1)]
+    right_leyline = [[] for _ in range(size + 1)]
+    cell = 0
+    for row in range(size + 1):
+        ley_line.append(['@'])
+        columns = range(row + 2) if row < size else range(1, size + 1)
+        for column in columns:
+            name = helper_cell_name(cell)
+            cell += 1
+            ley_line[row].append(name)
+            left_leyline[column].append(name)
+            right_leyline[column - row + size - 1].append(name)
+    for sublist in right_leyline:
+        sublist.append('@')
+    return [left_leyline, ley_line, right_leyline]
 
 
 class StonehengeGame(Game):
     """
     Abstract class for a game to be played with two players.
     """
-    def __init__(self, p1_starts: bool) -> None:
-        """
-        Initialize this Game, using p1_starts to find who the first player is.
-        """
-        size = int(input("Enter a side length of the borad: "))
-        left_leyline = []
-        ley_line = []
-        right_leyline = []
-        finished = False
-        if size == 1:
-            ley_line = [['@', 'A', 'B'], ['@', 'C']]
-            left_leyline = [['@', 'A'], ['@', 'B', 'C']]
-            right_leyline = [['A', 'C', '@'], ['B', '@']]
-        if size == 2:
-            ley_line = [['@', 'A', 'B'],
-                        ['@', 'C', 'D', 'E'],
-                        ['@', 'F', 'G']]
-            left_leyline = [['@', 'A', 'C'],
-                            ['@', 'B', 'D', 'F'],
-                            ['@', 'E', 'G']]
-            right_leyline = [['C', 'F', '@'],
-                             ['A', 'D', 'G', '@'],
-                             ['B', 'E', '@']]
-        if size == 3:
-            ley_line = [['@', 'A', 'B'],
-                        ['@', 'C', 'D', 'E'],
-                        ['@', 'F', 'G', 'H', 'I'],
-                        ['@', 'J', 'K', 'L']]
-            left_leyline = [['@', 'A', 'C', 'F'],
-                            ['@', 'B', 'D', 'G', 'J'],
-                            ['@', 'E', 'H', 'K'],
-                            ['@', 'I', 'L']]
-            right_leyline = [['F', 'J', '@'],
-                             ['C', 'G', 'K', '@'],
-                             ['A', 'D', 'H', 'L', '@'],
-                             ['B', 'E', 'I', '@']]
-        if size == 4:
-            ley_line = [['@', 'A', 'B'], ['@', 'C', 'D', 'E'],
-                        ['@', 'F', 'G', 'H', 'I'],
-                        ['@', 'J', 'K', 'L', 'M', 'N'],
-                        ['@', 'O', 'P', 'Q', 'R']]
-            left_leyline = [['@', 'A', 'C', 'F', 'J'],
-                            ['@', 'B', 'D', 'G', 'K', 'O'],
-                            ['@', 'E', 'H', 'L', 'P'],
-                            ['@', 'I', 'M', 'Q'],
-                            ['@', 'N', 'R']]
-            right_leyline = [['J', 'O', '@'],
-                             ['F', 'K', 'P', '@'],
-                             ['C', 'G', 'L', 'Q', '@'],
-                             ['A', 'D', 'H', 'M', 'R', '@'],
-                             ['B', 'E', 'I', 'N', '@']]
-        if size == 5:
-            ley_line = [['@', 'A', 'B'], ['@', 'C', 'D', 'E'],
-                        ['@', 'F', 'G', 'H', 'I'],
-                        ['@', 'J', 'K', 'L', 'M', 'N'],
-                        ['@', 'O', 'P', 'Q', 'R', 'S', 'T'],
-                        ['@', 'U', 'V', 'W', 'X', 'Y']]
-            left_leyline = [['@', 'A', 'C', 'F', 'J', 'O'],
-                            ['@', 'B', 'D', 'G', 'K', 'P', 'U'],
-                            ['@', 'E', 'H', 'L', 'Q', 'V'],
-                            ['@', 'I', 'M', 'R', 'W'],
-                            ['@', 'N', 'S', 'X'],
-                            ['@', 'T', 'Y']]
-            right_leyline = [['O', 'U', '@'],
-                             ['J', 'P', 'V', '@'],
-                             ['F', 'K', 'Q', 'W', '@'],
-                             ['C', 'G', 'L', 'R', 'X', '@'],
-                             ['A', 'D', 'H', 'M', 'S', 'Y', '@'],
-                             ['B', 'E', 'I', 'N', 'T', '@']]
+    def __init__(self, p1_starts: bool, size: int = None) -> None:
+        """
+        Initialize this Game, using p1_starts to find who the first player is,
+        on a board of side length size (asking the user if size is None).
+        """
+        if size is None:
+            size = int(input("Enter a side length of the borad: "))
+        left_leyline, ley_line, right_leyline = \
+            helper_initial_leylines(size)
         self.current_state = StonehengeState(p1_starts, size,
                                              left_leyline,
-                                             ley_line, right_leyline, finished)
+                                             ley_line, right_leyline, False)
 
     def get_instructions(self) -> str:
         """
@@ -0,0 +1,220 @@
+"""
+Batched expansion and evaluation of Stonehenge states with NumPy.
+
+A StonehengeBatch holds N states of one board size as arrays: the owner of
+every cell and every ley-line (0 for nobody, 1 for p1, 2 for p2) and whose
+turn it is. expand() makes every move of every state at once, finding the
+ley-lines captured through a cell/ley-line membership matrix, and
+rough_outcomes() scores a whole batch in one pass. Cells and ley-lines are
+numbered as in StonehengeTopology.
+"""
+from typing import Any, Tuple
+import numpy as np
+from stonehenge import StonehengeState, helper_topology
+from stonehenge_bitboard import StonehengeBitboard
+
+# The cell/ley-line membership matrix of each board size, built the first
+# time it is needed.
+LINE_MATRICES = {}
+
+
+def helper_line_matrix(size: int) -> Any:
+    """
+    Return the (cells, ley-lines) boolean matrix of boards of side length
+    size, whose item [c, l] is True when cell c lies on ley-line l.
+
+    >>> helper_line_matrix(1).astype(int)
+    array([[1, 0, 1, 0, 1, 0],
+           [1, 0, 0, 1, 0, 1],
+           [0, 1, 0, 1, 1, 0]])
+    """
+    if size not in LINE_MATRICES:
+        topology = helper_topology(size)
+        matrix = np.zeros((len(topology.names), len(topology.lines)),
+                          dtype=np.bool_)
+        for line, cells in enumerate(topology.lines):
+            matrix[cells, line] = True
+        LINE_MATRICES[size] = matrix
+    return LINE_MATRICES[size]
+
+
+class StonehengeBatch:
+    """
+    Stonehenge states of one side length, stored as arrays.
+
+    size - the side length of the boards
+    cells - an (N, cells) int8 array of the owner of each cell
+    lines - an (N, ley-lines) int8 array of the owner of each ley-line
+    p1_turn - an (N,) boolean array of whether it is p1's turn
+    """
+    size: int
+    cells: Any
+    lines: Any
+    p1_turn: Any
+
+    def __init__(self, size: int, cells: Any, lines: Any,
+                 p1_turn: Any) -> None:
+        """
+        Create a batch of boards of side length size from its arrays.
+        """
+        self.size = size
+        self.cells = cells
+        self.lines = lines
+        self.p1_turn = p1_turn
+
+    def __len__(self) -> int:
+        """
+        Return the number of states in this batch.
+        """
+        return len(self.p1_turn)
+
+    @staticmethod
+    def from_states(states: list) -> 'StonehengeBatch':
+        """
+        Return the batch of states, which all have the same side length.
+
+        >>> from stonehenge import StonehengeGame
+        >>> state = StonehengeGame(True, 1).current_state.make_move('A')
+        >>> batch = StonehengeBatch.from_states([state])
+        >>> batch.cells, batch.lines, batch.p1_turn
+        (array([[1, 0, 0]], dtype=int8), array([[1, 0, 1, 0, 1, 0]], \
+dtype=int8), array([False]))
+        """
+        size = states[0].size
+        topology = helper_topology(size)
+        cells = np.zeros((len(states), len(topology.names)), dtype=np.int8)
+        lines = np.zeros((len(states), len(topology.lines)), dtype=np.int8)
+        for i, state in enumerate(states):
+            board = StonehengeBitboard.from_state(state)
+            for owner, cell_set, line_set in [(1, board.cells1, board.lines1),
+                                              (2, board.cells2, board.lines2)]:
+                cells[i, helper_bits(cell_set, cells.shape[1])] = owner
+                lines[i, helper_bits(line_set, lines.shape[1])] = owner
+        p1_turn = np.array([state.p1_turn for state in states],
+                           dtype=np.bool_)
+        return StonehengeBatch(size, cells, lines, p1_turn)
+
+    def to_states(self) -> list:
+        """
+        Return the StonehengeStates of this batch.
+
+        >>> from stonehenge import StonehengeGame
+        >>> state = StonehengeGame(False, 2).current_state.make_move('C')
+        >>> batch = StonehengeBatch.from_states([state])
+        >>> batch.to_states()[0] == state
+        True
+        """
+        states = []
+        powers = [1 << i for i in range(max(self.cells.shape[1],
+                                            self.lines.shape[1]))]
+        for cells, lines, p1_turn in zip(self.cells, self.lines,
+                                         self.p1_turn):
+            sets = [sum(powers[i] for i in np.flatnonzero(array == owner))
+                    for array in [cells, lines] for owner in [1, 2]]
+            states.append(StonehengeBitboard(
+                bool(p1_turn), self.size, sets[0], sets[1], sets[2],
+                sets[3]).to_state())
+        return states
+
+    @property
+    def is_finished(self) -> Any:
+        """
+        Return an (N,) boolean array of whether each game is over.
+        """
+        total = self.lines.shape[1]
+        return ((2 * np.count_nonzero(self.lines == 1, axis=1) >= total)
+                | (2 * np.count_nonzero(self.lines == 2, axis=1) >= total))
+
+
+def helper_bits(n: int, width: int) -> list:
+    """
+    Return the positions below width of the set bits of n.
+
+    >>> helper_bits(0b1010, 4)
+    [1, 3]
+    """
+    return [i for i in range(width) if n >> i & 1]
+
+
+def expand(batch: StonehengeBatch) -> Tuple[StonehengeBatch, Any, Any]:
+    """
+    Return the batch of the states reached by every move of every state of
+    batch whose game is not over, with, for each of them, the index in
+    batch of the state it came from and the cell claimed.
+
+    Children come in the order of their parents, and the children of one
+    parent in the order of get_possible_moves().
+
+    >>> from stonehenge import StonehengeGame
+    >>> root = StonehengeGame(True, 2).current_state
+    >>> children, parents, moves = expand(StonehengeBatch.from_states([root]))
+    >>> expected = [root.make_move(m) for m in root.get_possible_moves()]
+    >>> [repr(s) for s in children.to_states()] == [repr(s) for s in expected]
+    True
+    """
+    matrix = helper_line_matrix(batch.size)
+    open_cells = (batch.cells == 0) & ~batch.is_finished[:, None]
+    parents, moves = np.nonzero(open_cells)
+    rows = np.arange(len(parents))
+    owners = np.where(batch.p1_turn[parents], 1, 2).astype(np.int8)
+    cells = batch.cells[parents]
+    cells[rows, moves] = owners
+    lines = batch.lines[parents]
+    # Count the owner's cells on every ley-line, and capture the unclaimed
+    # ley-lines through the cell claimed that reach half.
+    counts = (cells == owners[:, None]).astype(np.int16) @ \
+        matrix.astype(np.int16)
+    lengths = matrix.sum(axis=0)
+    captured = (lines == 0) & matrix[moves] & (2 * counts >= lengths)
+    lines[captured] = np.repeat(owners, captured.sum(axis=1))
+    children = StonehengeBatch(batch.size, cells, lines,
+                               ~batch.p1_turn[parents])
+    return children, parents, moves
+
+
+def rough_outcomes(batch: StonehengeBatch) -> Any:
+    """
+    Return an (N,) int8 array of the rough_outcome() of every state of
+    batch.
+
+    >>> from stonehenge import StonehengeGame
+    >>> root = StonehengeGame(True, 2).current_state
+    >>> children, _, _ = expand(StonehengeBatch.from_states([root]))
+    >>> expected = [s.rough_outcome() for s in children.to_states()]
+    >>> list(rough_outcomes(children)) == expected
+    True
+    """
+    total = batch.lines.shape[1]
+    claimed1 = np.count_nonzero(batch.lines == 1, axis=1)
+    claimed2 = np.count_nonzero(batch.lines == 2, axis=1)
+    mine = np.where(batch.p1_turn, claimed1, claimed2)
+    theirs = np.where(batch.p1_turn, claimed2, claimed1)
+    outcomes = np.where(mine == theirs, StonehengeState.DRAW,
+                        StonehengeState.WIN)
+    outcomes[2 * (theirs + 1) >= total] = StonehengeState.LOSE
+    return outcomes.astype(np.int8)
+
+
+def unique(batch: StonehengeBatch) -> StonehengeBatch:
+    """
+    Return the batch of the distinct states of batch.
+
+    >>> from stonehenge import StonehengeGame
+    >>> root = StonehengeGame(True, 2).current_state
+    >>> children, _, _ = expand(StonehengeBatch.from_states([root]))
+    >>> grandchildren, _, _ = expand(expand(children)[0])
+    >>> len(grandchildren), len(unique(grandchildren))
+    (210, 159)
+    """
+    rows = np.concatenate([batch.cells, batch.lines,
+                           batch.p1_turn[:, None].astype(np.int8)], axis=1)
+    rows = np.unique(rows, axis=0)
+    count = batch.cells.shape[1]
+    return StonehengeBatch(batch.size, rows[:, :count].copy(),
+                           rows[:, count:-1].copy(), rows[:, -1] == 1)
+
+
+if __name__ == "__main__":
+    from python_ta import check_all
+
+    check_all(config="a2_pyta.txt")
@@ -0,0 +1,77 @@
+"""
+Unittests for the batched NumPy expansion of Stonehenge states.
+"""
+import unittest
+
+from stonehenge import StonehengeGame, helper_topology
+from stonehenge_batch import StonehengeBatch, expand, rough_outcomes, unique
+from stonehenge_fixtures import random_states
+
+
+class StonehengeBatchUnitTests(unittest.TestCase):
+    def test_round_trip(self):
+        """
+        Test that states come back unchanged from a batch.
+        """
+        for size in range(1, 6):
+            states = random_states(size, 5, size)
+            batch = StonehengeBatch.from_states(states)
+            self.assertEqual([repr(s) for s in batch.to_states()],
+                             [repr(s) for s in states])
+            self.assertEqual(list(batch.is_finished),
+                             [s.is_finished for s in states])
+
+    def test_expand_matches_make_move(self):
+        """
+        Test that the children of a batch are the states make_move reaches,
+        in the order of get_possible_moves, with nothing from finished
+        states.
+        """
+        for size in range(1, 6):
+            states = random_states(size, 5, 10 + size)
+            children, parents, moves = expand(
+                StonehengeBatch.from_states(states))
+            names = helper_topology(size).names
+            expected = [(i, move, state.make_move(move))
+                        for i, state in enumerate(states)
+                        if not state.is_finished
+                        for move in state.get_possible_moves()]
+            self.assertEqual(len(children), len(expected))
+            self.assertEqual(list(parents), [i for i, _, _ in expected])
+            self.assertEqual([names[m] for m in moves],
+                             [move for _, move, _ in expected])
+            self.assertEqual([repr(s) for s in children.to_states()],
+                             [repr(s) for _, _, s in expected])
+            self.assertEqual([s.p1_turn for s in children.to_states()],
+                             [s.p1_turn for _, _, s in expected])
+
+    def test_rough_outcomes(self):
+        """
+        Test that a batch is scored like each of its states.
+        """
+        for size in range(1, 6):
+            states = random_states(size, 10, 20 + size)
+            self.assertEqual(
+                list(rough_outcomes(StonehengeBatch.from_states(states))),
+                [s.rough_outcome() for s in states])
+
+    def test_unique_frontier(self):
+        """
+        Test that a breadth-first frontier with duplicates removed holds the
+        distinct states the scalar engine reaches.
+        """
+        root = StonehengeGame(True, 2).current_state
+        frontier = StonehengeBatch.from_states([root])
+        layer = {repr(root): root}
+        for _ in range(4):
+            frontier = unique(expand(frontier)[0])
+            layer = {repr(new_state): new_state for state in layer.values()
+                     if not state.is_finished
+                     for new_state in [state.make_move(move) for move in
+                                       state.get_possible_moves()]}
+            self.assertEqual(sorted(repr(s) for s in frontier.to_states()),
+                             sorted(layer))
+
+
+if __name__ == "__main__":
+    unittest.main()
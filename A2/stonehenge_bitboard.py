@@ -0,0 +1,255 @@
+"""
+A compact bitboard representation of Stonehenge states.
+
+Cells and ley-lines are numbered as in StonehengeTopology. A set of cells or
+ley-lines is an integer whose bit i is set when cell or ley-line i is in the
+set.
+"""
+from typing import Any
+from game_state import GameState
+from stonehenge import StonehengeState, helper_topology
+
+
+def helper_popcount(n: int) -> int:
+    """
+    Return the number of set bits in n.
+
+    >>> helper_popcount(0b1011)
+    3
+    """
+    return bin(n).count('1')
+
+
+class StonehengeBitboard(GameState):
+    """
+    The state of a game of Stonehenge, stored as sets of cells and
+    ley-lines.
+
+    size - the side length of the board
+    cells1 - the cells claimed by p1
+    cells2 - the cells claimed by p2
+    lines1 - the ley-lines claimed by p1
+    lines2 - the ley-lines claimed by p2
+    """
+    __slots__ = ('size', 'cells1', 'cells2', 'lines1', 'lines2')
+    size: int
+    cells1: int
+    cells2: int
+    lines1: int
+    lines2: int
+
+    def __init__(self, is_p1_turn: bool, size: int, cells1: int = 0,
+                 cells2: int = 0, lines1: int = 0, lines2: int = 0) -> None:
+        """
+        Initialize this state of a board of side length size.
+
+        >>> b = StonehengeBitboard(True, 1)
+        >>> b.get_possible_moves()
+        ['A', 'B', 'C']
+        """
+        super().__init__(is_p1_turn)
+        self.size = size
+        self.cells1 = cells1
+        self.cells2 = cells2
+        self.lines1 = lines1
+        self.lines2 = lines2
+
+    @staticmethod
+    def from_state(state: StonehengeState) -> 'StonehengeBitboard':
+        """
+        Return the bitboard of state.
+
+        >>> a = StonehengeState(True, 1, [[1, 1], ['@', 'B', 'C']],\
+        [[1, 1, 'B'], ['@', 'C']], [[1, 'C', 1], ['B', '@']], True)
+        >>> b = StonehengeBitboard.from_state(a)
+        >>> (b.cells1, b.cells2, b.lines1, b.lines2)
+        (1, 0, 21, 0)
+        """
+        topology = helper_topology(state.size)
+        board = StonehengeBitboard(state.p1_turn, state.size)
+        values = [item for sublist in state.ley_line for item in sublist[1:]]
+        for cell, item in enumerate(values):
+            if item == 1:
+                board.cells1 |= 1 << cell
+            elif item == 2:
+                board.cells2 |= 1 << cell
+        markers = ([sublist[0] for sublist in state.ley_line]
+                   + [sublist[0] for sublist in state.left_leyline]
+                   + [sublist[-1] for sublist in state.right_leyline])
+        for line, item in enumerate(markers[:len(topology.lines)]):
+            if item == 1:
+                board.lines1 |= 1 << line
+            elif item == 2:
+                board.lines2 |= 1 << line
+        return board
+
+    def to_state(self) -> StonehengeState:
+        """
+        Return the StonehengeState of this bitboard.
+
+        >>> a = StonehengeState(True, 1, [['@', 'A'], ['@', 'B', 'C']],\
+        [['@', 'A', 'B'], ['@', 'C']], [['A', 'C', '@'], ['B', '@']], False)
+        >>> b = StonehengeBitboard.from_state(a).make_move('A')
+        >>> repr(b.to_state()) == repr(a.make_move('A'))
+        True
+        """
+        topology = helper_topology(self.size)
+        families = []
+        for i, line in enumerate(topology.lines):
+            sublist = [self.helper_owner(self.lines1, self.lines2, i, '@')]
+            for cell in line:
+                sublist.append(self.helper_owner(self.cells1, self.cells2,
+                                                 cell, topology.names[cell]))
+            families.append(sublist)
+        count = self.size + 1
+        ley_line = families[:count]
+        left_leyline = families[count:2 * count]
+        right_leyline = [sublist[1:] + sublist[:1]
+                         for sublist in families[2 * count:]]
+        return StonehengeState(self.p1_turn, self.size, left_leyline,
+                               ley_line, right_leyline, self.is_finished)
+
+    @staticmethod
+    def helper_owner(set1: int, set2: int, i: int, default: Any) -> Any:
+        """
+        Return 1 if i is in set1, 2 if i is in set2, and default otherwise.
+
+        >>> StonehengeBitboard.helper_owner(0b10, 0b01, 0, '@')
+        2
+        """
+        if set1 >> i & 1:
+            return 1
+        if set2 >> i & 1:
+            return 2
+        return default
+
+    @property
+    def is_finished(self) -> bool:
+        """
+        Return whether a player has claimed at least half of the ley-lines.
+
+        >>> StonehengeBitboard(True, 1, 1, 0, 21, 0).is_finished
+        True
+        """
+        half = 3 * (self.size + 1) / 2
+        return (helper_popcount(self.lines1) >= half
+                or helper_popcount(self.lines2) >= half)
+
+    def __str__(self) -> str:
+        """
+        Return a string representation of the current state of the game.
+
+        >>> b = StonehengeBitboard(True, 1)
+        >>> str(b) == str(b.to_state())
+        True
+        """
+        return str(self.to_state())
+
+    def __repr__(self) -> Any:
+        """
+        Return a representation of this state, the same as the repr of the
+        equal StonehengeState.
+
+        >>> b = StonehengeBitboard(True, 1)
+        >>> repr(b) == repr(b.to_state())
+        True
+        """
+        return repr(self.to_state())
+
+    def get_key(self) -> tuple:
+        """
+        Return a hashable key identifying this state.
+
+        >>> StonehengeBitboard(False, 1, 1, 2).get_key()
+        (1, False, 1, 2, 0, 0)
+        """
+        return (self.size, self.p1_turn, self.cells1, self.cells2,
+                self.lines1, self.lines2)
+
+    def get_possible_moves(self) -> list:
+        """
+        Return all possible moves that can be applied to this state.
+
+        >>> StonehengeBitboard(True, 1, 0b001, 0b100).get_possible_moves()
+        ['B']
+        """
+        if self.is_finished:
+            return []
+        topology = helper_topology(self.size)
+        empty = topology.full & ~(self.cells1 | self.cells2)
+        moves = []
+        while empty:
+            low = empty & -empty
+            moves.append(topology.names[low.bit_length() - 1])
+            empty ^= low
+        return moves
+
+    def is_valid_move(self, move: Any) -> bool:
+        """
+        Return whether move is a valid move for this GameState.
+
+        >>> b = StonehengeBitboard(True, 1, 0b001)
+        >>> b.is_valid_move('A'), b.is_valid_move('B'), b.is_valid_move('D')
+        (False, True, False)
+        """
+        topology = helper_topology(self.size)
+        if move not in topology.index or self.is_finished:
+            return False
+        return not (self.cells1 | self.cells2) >> topology.index[move] & 1
+
+    def make_move(self, move: Any) -> 'StonehengeBitboard':
+        """
+        Return the GameState that results from applying move to this GameState.
+
+        >>> b = StonehengeBitboard(True, 1).make_move('A')
+        >>> (b.p1_turn, b.cells1, b.lines1, b.is_finished)
+        (False, 1, 21, True)
+        """
+        topology = helper_topology(self.size)
+        cell = topology.index[move]
+        claimed = self.lines1 | self.lines2
+        new_state = StonehengeBitboard(not self.p1_turn, self.size,
+                                       self.cells1, self.cells2,
+                                       self.lines1, self.lines2)
+        if self.p1_turn:
+            new_state.cells1 |= 1 << cell
+            mine = new_state.cells1
+        else:
+            new_state.cells2 |= 1 << cell
+            mine = new_state.cells2
+        captured = 0
+        for line in topology.cell_lines[cell]:
+            if not claimed >> line & 1 and \
+                    2 * helper_popcount(mine & topology.masks[line]) >= \
+                    len(topology.lines[line]):
+                captured |= 1 << line
+        if self.p1_turn:
+            new_state.lines1 |= captured
+        else:
+            new_state.lines2 |= captured
+        return new_state
+
+    def rough_outcome(self) -> float:
+        """
+        Return an estimate in interval [LOSE, WIN] of best outcome the current
+        player can guarantee from state self, by the same rule as
+        StonehengeState.rough_outcome.
+
+        >>> StonehengeBitboard(True, 1).rough_outcome()
+        0
+        """
+        count1 = helper_popcount(self.lines1)
+        count2 = helper_popcount(self.lines2)
+        if not self.p1_turn:
+            count1, count2 = count2, count1
+        if (count2 + 1) >= 3 * (self.size + 1) / 2:
+            return self.LOSE
+        elif count1 == count2:
+            return self.DRAW
+        return self.WIN
+
+
+if __name__ == "__main__":
+    from python_ta import check_all
+
+    check_all(config="a2_pyta.txt")
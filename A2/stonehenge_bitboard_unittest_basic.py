@@ -0,0 +1,70 @@
+"""
+Unittests for the bitboard representation of Stonehenge states.
+"""
+import unittest
+import random
+
+from stonehenge import StonehengeState, helper_initial_leylines
+from stonehenge_bitboard import StonehengeBitboard
+from strategy import recursive_minimax
+from game_interface import playable_games
+StonehengeGame = playable_games['h']
+
+
+def new_state(size: int, p1_starts: bool) -> StonehengeState:
+    """
+    Return the starting state of a board of side length size.
+    """
+    left_leyline, ley_line, right_leyline = helper_initial_leylines(size)
+    return StonehengeState(p1_starts, size, left_leyline, ley_line,
+                           right_leyline, False)
+
+
+class StonehengeBitboardUnitTests(unittest.TestCase):
+    def test_random_games_match_state(self):
+        """
+        Test that the bitboard follows StonehengeState move for move through
+        random games of every size.
+        """
+        rand = random.Random(148)
+        for size in range(1, 6):
+            for _ in range(20):
+                state = new_state(size, rand.random() < 0.5)
+                board = StonehengeBitboard.from_state(state)
+                while True:
+                    self.assertEqual(repr(board), repr(state))
+                    self.assertEqual(board.get_possible_moves(),
+                                     state.get_possible_moves())
+                    self.assertEqual(board.rough_outcome(),
+                                     state.rough_outcome())
+                    if state.is_finished:
+                        break
+                    move = rand.choice(state.get_possible_moves())
+                    state = state.make_move(move)
+                    board = board.make_move(move)
+                self.assertTrue(board.is_finished)
+
+    def test_round_trip(self):
+        """
+        Test that converting to a bitboard and back keeps the state.
+        """
+        state = new_state(3, True)
+        for move in ['K', 'A', 'C', 'B', 'F']:
+            state = state.make_move(move)
+        board = StonehengeBitboard.from_state(state)
+        self.assertEqual(board.to_state(), state)
+
+    def test_minimax_on_bitboard(self):
+        """
+        Test that minimax finds the winning move when searching bitboards.
+        """
+        game = StonehengeGame.__new__(StonehengeGame)
+        state = new_state(2, True)
+        for move in ['A', 'F', 'D']:
+            state = state.make_move(move)
+        game.current_state = StonehengeBitboard.from_state(state)
+        self.assertEqual(recursive_minimax(game), 'E')
+
+
+if __name__ == "__main__":
+    unittest.main()
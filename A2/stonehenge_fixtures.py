@@ -0,0 +1,21 @@
+"""
+Fixtures shared by the Stonehenge unittests.
+"""
+import random
+
+from stonehenge import StonehengeGame
+
+
+def random_states(size: int, games: int, seed: int) -> list:
+    """
+    Return every state of games random games on a board of side length size.
+    """
+    rand = random.Random(seed)
+    states = []
+    for _ in range(games):
+        state = StonehengeGame(rand.random() < 0.5, size).current_state
+        states.append(state)
+        while not state.is_finished:
+            state = state.make_move(rand.choice(state.get_possible_moves()))
+            states.append(state)
+    return states
@@ -0,0 +1,76 @@
+"""
+Unittests for Stonehenge boards generated for any side length.
+"""
+import unittest
+import random
+
+from stonehenge import (StonehengeGame, helper_cell_name,
+                        helper_initial_leylines, helper_owners,
+                        helper_topology)
+
+
+class GeneratedBoardUnitTests(unittest.TestCase):
+    def test_small_boards_unchanged(self):
+        """
+        Test that the generated board of side length 3 is the one the game
+        has always used.
+        """
+        self.assertEqual(helper_initial_leylines(3), [
+            [['@', 'A', 'C', 'F'], ['@', 'B', 'D', 'G', 'J'],
+             ['@', 'E', 'H', 'K'], ['@', 'I', 'L']],
+            [['@', 'A', 'B'], ['@', 'C', 'D', 'E'],
+             ['@', 'F', 'G', 'H', 'I'], ['@', 'J', 'K', 'L']],
+            [['F', 'J', '@'], ['C', 'G', 'K', '@'],
+             ['A', 'D', 'H', 'L', '@'], ['B', 'E', 'I', '@']]])
+
+    def test_large_boards(self):
+        """
+        Test that boards of side length 6 to 10 have the right cells and
+        ley-lines, each cell on one ley-line of each family.
+        """
+        for size in range(6, 11):
+            topology = helper_topology(size)
+            count = size * (size + 3) // 2 + size
+            self.assertEqual(topology.names,
+                             [helper_cell_name(cell) for cell in range(count)])
+            self.assertEqual(len(topology.lines), 3 * (size + 1))
+            for lines in topology.cell_lines:
+                self.assertEqual(sorted(line // (size + 1) for line in lines),
+                                 [0, 1, 2])
+            self.assertEqual(len(topology.symmetries), 6)
+
+    def test_large_board_drawing(self):
+        """
+        Test that every cell and ley-line marker of a large board is drawn
+        once, and the drawing follows the moves made.
+        """
+        state = StonehengeGame(True, 7).current_state
+        drawing = str(state)
+        for name in helper_topology(7).names:
+            self.assertEqual(drawing.split().count(name), 1, name)
+        self.assertEqual(drawing.split().count('@'), 24)
+        new_state = state.make_move('AP')
+        drawing = str(new_state)
+        self.assertNotIn('AP', drawing.split())
+        self.assertEqual(drawing.split().count('1'),
+                         1 + helper_owners(new_state)[1].count(1))
+
+    def test_play_large_boards(self):
+        """
+        Test that random games on large boards end with a winner, and that
+        moves are accepted by their multi-letter names.
+        """
+        rand = random.Random(148)
+        for size in range(6, 11):
+            game = StonehengeGame(rand.random() < 0.5, size)
+            state = game.current_state
+            self.assertTrue(state.is_valid_move(game.str_to_move('AA')))
+            while not state.is_finished:
+                state = state.make_move(rand.choice(
+                    state.get_possible_moves()))
+            game.current_state = state
+            self.assertTrue(game.is_winner('p1') or game.is_winner('p2'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+"""
+Unittests for the symmetry-canonical keys of Stonehenge states.
+"""
+import unittest
+
+from stonehenge import (StonehengeGame, helper_canonical, helper_map_move,
+                        helper_topology, helper_transform)
+from strategy import recursive_minimax
+from transposition_table import TranspositionTable
+from stonehenge_fixtures import random_states
+
+
+class StonehengeSymmetryUnitTests(unittest.TestCase):
+    def test_symmetry_counts(self):
+        """
+        Test that every board has the six symmetries of a triangle, and the
+        board of side length 2 also those of a hexagon.
+        """
+        counts = [len(helper_topology(size).symmetries)
+                  for size in range(1, 6)]
+        self.assertEqual(counts, [6, 12, 6, 6, 6])
+
+    def test_symmetric_states_share_key(self):
+        """
+        Test that every image of a state has the same canonical key and
+        rough outcome as the state.
+        """
+        for size in range(1, 6):
+            for state in random_states(size, 3, size):
+                key = state.get_canonical_key()
+                for index in range(len(helper_topology(size).symmetries)):
+                    image = helper_transform(state, index)
+                    self.assertEqual(image.get_canonical_key(), key)
+                    self.assertEqual(image.rough_outcome(),
+                                     state.rough_outcome())
+
+    def test_moves_map_back(self):
+        """
+        Test that a move on the canonical state, mapped back, makes the
+        state whose canonical image is the canonical state after the move.
+        """
+        for size in range(1, 4):
+            for state in random_states(size, 3, size):
+                canonical, index = helper_canonical(state)
+                self.assertEqual(canonical.get_canonical_key(),
+                                 canonical.zobrist)
+                for move in canonical.get_possible_moves():
+                    original = helper_map_move(move, size, index, True)
+                    self.assertEqual(
+                        helper_transform(state.make_move(original), index),
+                        canonical.make_move(move))
+
+    def test_table_holds_fewer_states(self):
+        """
+        Test that minimax with a table stores one entry per class of
+        symmetric states.
+        """
+        game = StonehengeGame(True, 2)
+        table = TranspositionTable()
+        self.assertEqual(recursive_minimax(game, table),
+                         recursive_minimax(game))
+        keys = {state.get_key() for state in random_states(2, 50, 0)}
+        canonical = {state.get_canonical_key()
+                     for state in random_states(2, 50, 0)}
+        self.assertLess(len(canonical), len(keys))
+
+
+if __name__ == "__main__":
+    unittest.main()
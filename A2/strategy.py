@@ -5,26 +5,21 @@ NOTE: Make sure this file adheres to python-ta.
 Adjust the type annotations as needed, and implement both a recursive
 and an iterative version of minimax.
 """
-from typing import Any
+from typing import Any, Optional, Tuple
+import math
 import random
+import time
+from concurrent.futures import ProcessPoolExecutor
 from game import Game
 from game_state import GameState
+from transposition_table import TranspositionTable
+from search_stats import SearchStats
 
-# TODO: Adjust the type annotation as needed.
-
+# The table shared by every call of cached_minimax. It is bounded so that
+# it can serve a whole tournament without growing without limit.
+minimax_table = TranspositionTable(2 ** 20)
 
-class Tree:
-    """
-    A bare-bones Tree ADT that identifies the root with the entire tree.
-    """
-
-    def __init__(self, value: GameState, children=None, score=0) -> None:
-        """
-        Create Tree self with content value and 0 or more children
-        """
-        self.value = value
-        self.children = children[:] if children is not None else []
-        self.score = score
+# TODO: Adjust the type annotation as needed.
 
 
 class Stack:
@@ -126,102 +121,629 @@ def rough_outcome_strategy(game: Any) -> Any:
 # TODO: Implement a recursive version of the minimax strategy.
 
 
-def recursive_minimax(game: Game) -> Any:
+def recursive_minimax(game: Game, table: TranspositionTable = None,
+                      stats: SearchStats = None) -> Any:
     """
     Return a move for game with a recursive version of the minimax strategy.
+
+    If table is given, the score of every state solved during the search is
+    stored in it under its canonical key, and states already in it (or
+    symmetric to a state in it) are not searched again. If stats
+    is given, the search is recorded in it.
     """
     moves = game.current_state.get_possible_moves()
     states = []
     scores = []
     for move in moves:
         states.append(game.current_state.make_move(move))
-    for state in states:
-        scores.append(helper_get_score(game, state))
-    if -1 in scores:
-        return moves[scores.index(-1)]
-    return random.choice(scores)
+    for move, state in zip(moves, states):
+        start = time.perf_counter()
+        scores.append(helper_get_score(game, state, table, stats))
+        if stats is not None:
+            stats.time_root_move(move, time.perf_counter() - start)
+    # The best move leaves the opponent with the lowest score.
+    return moves[scores.index(min(scores))]
+
+
+def cached_minimax(game: Game, stats: SearchStats = None) -> Any:
+    """
+    Return a move for game with recursive minimax, sharing minimax_table
+    between every call.
+    """
+    return recursive_minimax(game, minimax_table, stats)
 
 
-def helper_get_score(game: Game, current_state: Any) -> int:
+def helper_get_score(game: Game, current_state: Any,
+                     table: TranspositionTable = None,
+                     stats: SearchStats = None, depth: int = 1) -> int:
     """
-    Return the score of the state.
+    Return the score of the state, which is depth moves below the root.
     """
+    if stats is not None:
+        stats.visit(depth)
+    if table is not None:
+        key = current_state.get_canonical_key()
+        score = table.lookup(key)
+        if stats is not None:
+            if score is None:
+                stats.cache_misses += 1
+            else:
+                stats.cache_hits += 1
+        if score is not None:
+            return score
     # Basecase: When the game is over.
     if game.is_over(current_state):
+        if stats is not None:
+            stats.terminals += 1
         if game.is_winner(game.current_state.get_current_player_name()):
-            return 1
-        if not game.is_winner(game.current_state.get_current_player_name()):
-            return -1
-        return 0
-    # Recursive Step
-    states = []
-    scores = []
-    moves = current_state.get_possible_moves()
-    for move in moves:
-        states.append(current_state.make_move(move))
-    for new_state in states:
-        scores.append(helper_get_score(game, new_state) * (-1))
-    return max(scores)
+            score = 1
+        else:
+            score = -1
+    else:
+        # Recursive Step
+        states = []
+        scores = []
+        moves = current_state.get_possible_moves()
+        if current_state.IN_PLACE:
+            # Search every move on current_state itself, taking it back
+            # after.
+            for move in moves:
+                undo = current_state.apply_move(move)
+                scores.append(helper_get_score(game, current_state, table,
+                                               stats, depth + 1) * (-1))
+                current_state.undo_move(move, undo)
+        else:
+            for move in moves:
+                states.append(current_state.make_move(move))
+            for new_state in states:
+                scores.append(helper_get_score(game, new_state, table, stats,
+                                               depth + 1) * (-1))
+        score = max(scores)
+    if table is not None:
+        table.store(key, score)
+    return score
 
 # TODO: Implement an iterative version of the minimax strategy.
 
 
-def iterative_minimax(game: Game) -> Any:
+def iterative_minimax(game: Game, table: TranspositionTable = None,
+                      stats: SearchStats = None) -> Any:
     """
     Return a move for game with a iterative version of the minimax strategy.
+
+    table and stats are used as in recursive_minimax, and the move returned
+    is the same one.
     """
+    moves = game.current_state.get_possible_moves()
+    scores = []
+    for move in moves:
+        start = time.perf_counter()
+        scores.append(helper_iterative_score(
+            game, game.current_state.make_move(move), table, stats))
+        if stats is not None:
+            stats.time_root_move(move, time.perf_counter() - start)
+    # The best move leaves the opponent with the lowest score.
+    return moves[scores.index(min(scores))]
+
+
+class MinimaxFrame:
+    """
+    A state waiting on the stack of helper_iterative_score.
+
+    state - the GameState being scored
+    depth - the number of moves state is below the root
+    moves - the moves from state, or None before state is expanded
+    index - the index in moves of the next move to search
+    best - the best score found so far for the current player of state
+    key - the key of state in the transposition table, if one is used
+    undo - what undo_move needs to take back the last move searched, if
+           state is searched in place
+    """
+    __slots__ = ('state', 'depth', 'moves', 'index', 'best', 'key', 'undo')
+
+    def __init__(self, state: Any, depth: int) -> None:
+        """
+        Create a frame for state, depth moves below the root.
+        """
+        self.state = state
+        self.depth = depth
+        self.moves = None
+        self.index = 0
+        self.best = GameState.LOSE - 1
+        self.key = None
+        self.undo = None
+
+
+def helper_iterative_score(game: Game, current_state: Any,
+                           table: TranspositionTable = None,
+                           stats: SearchStats = None) -> int:
+    """
+    Return the score of current_state, one move below the root, for its
+    current player, searching with an explicit stack instead of recursion.
+
+    Only the frames of the states on the current line are kept, so memory
+    grows with the depth of the game rather than the size of its tree, and
+    deep games do not reach the recursion limit. A state is scored as soon
+    as one of its moves is found to win. States that support it are searched
+    in place, so every frame shares current_state.
+    """
+    in_place = current_state.IN_PLACE
     s = Stack()
-    node = Tree(game.current_state)
-    s.add(node)
-    acc = []
+    s.add(MinimaxFrame(current_state, 1))
+    # The score of the last state scored, for the frame below it.
+    result = None
     while not s.is_empty():
-        temp = s.remove()
-        if game.is_over(temp.value):
-            original_state = game.current_state
-            game.current_state = temp.value
-            if game.is_winner(temp.value.get_current_player_name()):
-                temp.score = -1
+        frame = s.remove()
+        if frame.moves is None:
+            result = helper_expand_frame(game, frame, table, stats)
+            if result is not None:
+                continue
+        elif result is not None:
+            if in_place:
+                frame.state.undo_move(frame.moves[frame.index - 1],
+                                      frame.undo)
+            frame.best = max(frame.best, -result)
+            result = None
+        if frame.index < len(frame.moves) and frame.best < GameState.WIN:
+            move = frame.moves[frame.index]
+            frame.index += 1
+            s.add(frame)
+            if in_place:
+                frame.undo = frame.state.apply_move(move)
+                s.add(MinimaxFrame(frame.state, frame.depth + 1))
             else:
-                temp.score = 1
-            game.current_state = original_state
+                s.add(MinimaxFrame(frame.state.make_move(move),
+                                   frame.depth + 1))
         else:
-            if not temp.children:
-                helper_add_tree(temp)
-                s.add(temp)
-                helper_add_child(temp.children, s)
-            else:
-                scores = []
-                helper_append_score(scores, temp.children)
-                temp.score = min(scores)
-                acc.append(temp)
-    score = []
-    for child in node.children:
-        score.append(child.score)
-    return node.value.get_possible_moves()[score.index(max(score))]
+            result = frame.best
+            if table is not None:
+                table.store(frame.key, result)
+    return result
 
 
-def helper_add_tree(temp) -> None:
+def helper_expand_frame(game: Game, frame: MinimaxFrame,
+                        table: TranspositionTable = None,
+                        stats: SearchStats = None) -> Optional[int]:
+    """
+    Return the score of the state of frame if it is already known, from
+    table or because the game is over at it. Otherwise fill in the moves of
+    frame and return None.
+    """
+    if stats is not None:
+        stats.visit(frame.depth)
+    if table is not None:
+        frame.key = frame.state.get_canonical_key()
+        score = table.lookup(frame.key)
+        if stats is not None:
+            if score is None:
+                stats.cache_misses += 1
+            else:
+                stats.cache_hits += 1
+        if score is not None:
+            return score
+    if game.is_over(frame.state):
+        if stats is not None:
+            stats.terminals += 1
+        score = helper_terminal_score(game, frame.state)
+        if table is not None:
+            table.store(frame.key, score)
+        return score
+    frame.moves = frame.state.get_possible_moves()
+    return None
+
+
+def alphabeta_minimax(game: Game, stats: SearchStats = None) -> Any:
     """
-    Helper function for adding tree to a list of children.
+    Return a move for game with negamax search and alpha-beta pruning.
+
+    The root moves are tried in the order of get_possible_moves(), so the
+    move returned is the same one recursive_minimax returns. Below the root,
+    the replies that rough_outcome() rates best are tried first, and the
+    remaining siblings are skipped once a win is proven. If stats is given,
+    the search is recorded in it.
     """
-    for move in temp.value.get_possible_moves():
-        temp.children.append(Tree(temp.value.make_move(move)))
+    current_state = game.current_state
+    best_move = None
+    best_score = GameState.LOSE - 1
+    for move in current_state.get_possible_moves():
+        start = time.perf_counter()
+        # The window never extends past a win, so that a win found below
+        # the first move cuts off its siblings.
+        score = -helper_alphabeta(game, current_state.make_move(move),
+                                  -GameState.WIN,
+                                  min(-best_score, GameState.WIN), stats)
+        if stats is not None:
+            stats.time_root_move(move, time.perf_counter() - start)
+        if score > best_score:
+            best_score = score
+            best_move = move
+        if best_score >= GameState.WIN:
+            if stats is not None:
+                stats.cutoffs += 1
+            break
+    return best_move
 
 
-def helper_add_child(children: list, s: Stack) -> None:
+def helper_alphabeta(game: Game, current_state: Any,
+                     alpha: float, beta: float,
+                     stats: SearchStats = None, depth: int = 1) -> int:
     """
-    Helper function for adding each child to stack s.
+    Return the score of current_state, which is depth moves below the root,
+    for its current player, or a bound on it if the score falls outside the
+    window (alpha, beta). States that support it are searched in place.
     """
+    if stats is not None:
+        stats.visit(depth)
+    if game.is_over(current_state):
+        if stats is not None:
+            stats.terminals += 1
+        return helper_terminal_score(game, current_state)
+    best_score = GameState.LOSE - 1
+    in_place = current_state.IN_PLACE
+    if in_place:
+        children = helper_ordered_moves(current_state)
+    else:
+        children = helper_ordered_children(current_state)
     for child in children:
-        s.add(child)
+        if in_place:
+            undo = current_state.apply_move(child)
+            score = -helper_alphabeta(game, current_state, -beta, -alpha,
+                                      stats, depth + 1)
+            current_state.undo_move(child, undo)
+        else:
+            score = -helper_alphabeta(game, child, -beta, -alpha, stats,
+                                      depth + 1)
+        if score > best_score:
+            best_score = score
+        if best_score > alpha:
+            alpha = best_score
+        if alpha >= beta:
+            if stats is not None:
+                stats.cutoffs += 1
+            break
+    return best_score
+
+
+def helper_ordered_children(current_state: Any) -> list:
+    """
+    Return the states reachable from current_state in one move, ordered so
+    that the ones worst for the opponent come first.
+    """
+    children = [current_state.make_move(move)
+                for move in current_state.get_possible_moves()]
+    children.sort(key=lambda state: state.rough_outcome())
+    return children
 
 
-def helper_append_score(lst: list, children: list) -> None:
+def helper_ordered_moves(current_state: Any) -> list:
     """
-    Helper function for appending score of each child to a list.
+    Return the moves from current_state in the order of the states
+    helper_ordered_children returns, rating each move by applying it to
+    current_state and taking it back.
     """
-    for child in children:
-        lst.append((-1) * child.score)
+    moves = current_state.get_possible_moves()
+    outcomes = []
+    for move in moves:
+        undo = current_state.apply_move(move)
+        outcomes.append(current_state.rough_outcome())
+        current_state.undo_move(move, undo)
+    order = sorted(range(len(moves)), key=outcomes.__getitem__)
+    return [moves[i] for i in order]
+
+
+def helper_terminal_score(game: Game, current_state: Any) -> int:
+    """
+    Return the score of current_state, a state where game is over, for the
+    current player of current_state.
+    """
+    original_state = game.current_state
+    game.current_state = current_state
+    player = current_state.get_current_player_name()
+    opponent = 'p2' if player == 'p1' else 'p1'
+    if game.is_winner(player):
+        score = GameState.WIN
+    elif game.is_winner(opponent):
+        score = GameState.LOSE
+    else:
+        score = GameState.DRAW
+    game.current_state = original_state
+    return score
+
+
+class SearchTimeout(Exception):
+    """
+    Raised when a search runs past its deadline.
+    """
+
+
+def iterative_deepening_minimax(game: Game, time_limit: float = 1.0,
+                                stats: SearchStats = None) -> Any:
+    """
+    Return a move for game by searching to depth 1, 2, 3, ... until
+    time_limit seconds have passed, scoring the states at the depth limit
+    with rough_outcome().
+
+    The move returned is the best move of the deepest search that finished.
+    The depth 1 search is always allowed to finish, and the deepening stops
+    early once a search reaches the end of the game on every line. If stats
+    is given, every search is recorded in it.
+    """
+    deadline = time.monotonic() + time_limit
+    moves = list(game.current_state.get_possible_moves())
+    best_move, exact = helper_depth_limited_root(game, moves, 1, None, stats)
+    depth = 2
+    while not exact and time.monotonic() < deadline:
+        # Search the best move of the last depth first.
+        moves.remove(best_move)
+        moves.insert(0, best_move)
+        try:
+            best_move, exact = helper_depth_limited_root(game, moves, depth,
+                                                         deadline, stats)
+        except SearchTimeout:
+            break
+        depth += 1
+    return best_move
+
+
+def helper_depth_limited_root(game: Game, moves: list, depth: int,
+                              deadline: Optional[float],
+                              stats: SearchStats = None) -> Tuple[Any, bool]:
+    """
+    Return the best of moves for game.current_state when searching depth
+    moves ahead, and whether that search reached the end of the game on
+    every line it followed.
+    """
+    current_state = game.current_state
+    best_move = None
+    best_score = GameState.LOSE - 1
+    exact = True
+    for move in moves:
+        start = time.perf_counter()
+        score, move_exact = helper_depth_limited(
+            game, current_state.make_move(move), depth - 1,
+            -GameState.WIN, min(-best_score, GameState.WIN), deadline,
+            stats)
+        if stats is not None:
+            stats.time_root_move(move, time.perf_counter() - start)
+        exact = exact and move_exact
+        if -score > best_score:
+            best_score = -score
+            best_move = move
+        if best_score >= GameState.WIN:
+            if stats is not None:
+                stats.cutoffs += 1
+            break
+    return best_move, exact
+
+
+def helper_depth_limited(game: Game, current_state: Any, depth: int,
+                         alpha: float, beta: float,
+                         deadline: Optional[float], stats: SearchStats = None,
+                         ply: int = 1) -> Tuple[float, bool]:
+    """
+    Return the alpha-beta score of current_state, which is ply moves below
+    the root, for its current player when searching depth moves ahead, and
+    whether every line searched reached the end of the game.
+
+    Raise SearchTimeout once deadline (a time.monotonic() value) has passed.
+    """
+    if deadline is not None and time.monotonic() > deadline:
+        raise SearchTimeout
+    if stats is not None:
+        stats.visit(ply)
+    if game.is_over(current_state):
+        if stats is not None:
+            stats.terminals += 1
+        return helper_terminal_score(game, current_state), True
+    if depth == 0:
+        return current_state.rough_outcome(), False
+    best_score = GameState.LOSE - 1
+    exact = True
+    for new_state in helper_ordered_children(current_state):
+        score, child_exact = helper_depth_limited(game, new_state, depth - 1,
+                                                  -beta, -alpha, deadline,
+                                                  stats, ply + 1)
+        exact = exact and child_exact
+        if -score > best_score:
+            best_score = -score
+        if best_score > alpha:
+            alpha = best_score
+        if alpha >= beta:
+            if stats is not None:
+                stats.cutoffs += 1
+            break
+    return best_score, exact
+
+
+def parallel_minimax(game: Game, workers: Optional[int] = None,
+                     split_depth: int = 1, stats: SearchStats = None) -> Any:
+    """
+    Return a move for game with recursive minimax, scoring the states
+    split_depth moves ahead of game.current_state in a pool of workers
+    processes (one per CPU if workers is None).
+
+    The scores are combined exactly as recursive_minimax combines them, so
+    the move returned is the same one. If stats is given, the search done
+    by every worker is recorded in it, except for the time per root move,
+    since the root moves are searched at the same time.
+    """
+    current_state = game.current_state
+    moves = current_state.get_possible_moves()
+    states = [current_state.make_move(move) for move in moves]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        scores = helper_parallel_scores(game, states, split_depth, executor,
+                                        stats)
+    return moves[scores.index(min(scores))]
+
+
+def helper_parallel_scores(game: Game, states: list, split_depth: int,
+                           executor: ProcessPoolExecutor,
+                           stats: SearchStats = None, depth: int = 1) -> list:
+    """
+    Return the minimax score of each of states, which are depth moves below
+    the root, splitting the search split_depth - 1 more moves deep before
+    handing it to executor.
+    """
+    if split_depth <= 1:
+        if stats is None:
+            return list(executor.map(helper_get_score,
+                                     [game] * len(states), states))
+        scores = []
+        for score, worker_stats in executor.map(
+                helper_recorded_score, [game] * len(states), states,
+                [depth] * len(states)):
+            scores.append(score)
+            stats.merge(worker_stats)
+        return scores
+    # Expand every state at once so that all the deeper states are scored
+    # in a single batch.
+    counts = []
+    new_states = []
+    for state in states:
+        children = []
+        if not game.is_over(state):
+            children = [state.make_move(move)
+                        for move in state.get_possible_moves()]
+            if stats is not None:
+                stats.visit(depth)
+        counts.append(len(children))
+        new_states.extend(children)
+    new_scores = helper_parallel_scores(game, new_states, split_depth - 1,
+                                        executor, stats, depth + 1)
+    scores = []
+    start = 0
+    for state, count in zip(states, counts):
+        if count == 0:
+            scores.append(helper_get_score(game, state, None, stats, depth))
+        else:
+            scores.append(min(new_scores[start:start + count]) * (-1))
+        start += count
+    return scores
+
+
+def helper_recorded_score(game: Game, current_state: Any,
+                          depth: int) -> Tuple[int, SearchStats]:
+    """
+    Return the score of current_state, which is depth moves below the root,
+    and the SearchStats of the search for it.
+    """
+    stats = SearchStats()
+    return helper_get_score(game, current_state, None, stats, depth), stats
+
+
+class MCTSNode:
+    """
+    A node of a Monte Carlo search tree.
+
+    state - the GameState of this node
+    move - the move that led to state from the parent's state
+    parent - the parent MCTSNode, or None for the root
+    children - the expanded children of this node
+    untried - the moves from state not yet expanded
+    visits - the number of playouts through this node
+    total - the sum of the playout results through this node, scored for
+            the player who made move
+    """
+    __slots__ = ('state', 'move', 'parent', 'children', 'untried', 'visits',
+                 'total')
+
+    def __init__(self, state: Any, move: Any = None,
+                 parent: 'MCTSNode' = None) -> None:
+        """
+        Create an unvisited node for state, reached by move from parent.
+        """
+        self.state = state
+        self.move = move
+        self.parent = parent
+        self.children = []
+        self.untried = list(state.get_possible_moves())
+        random.shuffle(self.untried)
+        self.visits = 0
+        self.total = 0.0
+
+    def best_child(self, exploration: float) -> 'MCTSNode':
+        """
+        Return the child of this node with the highest upper confidence
+        bound.
+        """
+        log_visits = math.log(self.visits)
+        return max(self.children,
+                   key=lambda child: (child.total / child.visits
+                                      + exploration * math.sqrt(
+                                          log_visits / child.visits)))
+
+
+def mcts_strategy(game: Game, playouts: Optional[int] = 1000,
+                  time_limit: Optional[float] = None,
+                  rollout_depth: Optional[int] = None,
+                  exploration: float = 1.4, stats: SearchStats = None) -> Any:
+    """
+    Return a move for game with Monte Carlo tree search (UCT), stopping after
+    playouts playouts or time_limit seconds, whichever comes first (None
+    meaning no limit; at least one playout is always run).
+
+    Each playout plays random moves to the end of the game, or for at most
+    rollout_depth moves before scoring the state it reached with
+    rough_outcome(). The move returned is the one explored most. If stats
+    is given, the nodes added to the tree are recorded in it by depth, and
+    the playouts that reach the end of the game as terminals.
+
+    Raise a ValueError if neither playouts nor time_limit is given, or if
+    the game is already over.
+    """
+    if playouts is None and time_limit is None:
+        raise ValueError("mcts_strategy needs playouts or a time_limit")
+    if game.is_over(game.current_state):
+        raise ValueError("the game is over, so there is no move to make")
+    deadline = None if time_limit is None else time.monotonic() + time_limit
+    root = MCTSNode(game.current_state)
+    count = 0
+    while count == 0 or ((playouts is None or count < playouts)
+                         and (deadline is None
+                              or time.monotonic() < deadline)):
+        # Select a node that still has moves to try, and expand one of them.
+        node = root
+        depth = 0
+        while not node.untried and node.children:
+            node = node.best_child(exploration)
+            depth += 1
+        if node.untried:
+            move = node.untried.pop()
+            child = MCTSNode(node.state.make_move(move), move, node)
+            node.children.append(child)
+            node = child
+            if stats is not None:
+                stats.visit(depth + 1)
+        result = -helper_playout(game, node.state, rollout_depth, stats)
+        # Back the result up, switching sides at every level.
+        while node is not None:
+            node.visits += 1
+            node.total += result
+            result = -result
+            node = node.parent
+        count += 1
+    return max(root.children, key=lambda child: child.visits).move
+
+
+def helper_playout(game: Game, current_state: Any,
+                   rollout_depth: Optional[int],
+                   stats: SearchStats = None) -> float:
+    """
+    Return the result of a random playout from current_state, scored for
+    the current player of current_state.
+    """
+    sign = 1
+    depth = 0
+    while not game.is_over(current_state):
+        if rollout_depth is not None and depth >= rollout_depth:
+            return sign * current_state.rough_outcome()
+        current_state = current_state.make_move(
+            random.choice(current_state.get_possible_moves()))
+        sign = -sign
+        depth += 1
+    if stats is not None:
+        stats.terminals += 1
+    return sign * helper_terminal_score(game, current_state)
 
 
 if __name__ == "__main__":
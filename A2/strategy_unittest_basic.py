@@ -0,0 +1,295 @@
+"""
+Unittests for the search strategies added beside the two minimax strategies.
+"""
+import unittest
+from unittest.mock import patch
+import time
+
+from strategy import (recursive_minimax, iterative_minimax, alphabeta_minimax,
+                      iterative_deepening_minimax, parallel_minimax,
+                      mcts_strategy, cached_minimax, minimax_table)
+from search_stats import SearchStats
+from transposition_table import TranspositionTable
+from game_interface import playable_games
+StonehengeGame = playable_games['h']
+SubtractSquareGame = playable_games['s']
+
+
+def make_subtract_square(total: int) -> SubtractSquareGame:
+    """
+    Return a new game of SubtractSquare starting at total.
+    """
+    with patch('builtins.input', return_value=str(total)):
+        return SubtractSquareGame(True)
+
+
+def make_stonehenge(size: int, moves: list) -> StonehengeGame:
+    """
+    Return a new game of Stonehenge of side length size after moves.
+    """
+    with patch('builtins.input', return_value=str(size)):
+        game = StonehengeGame(True)
+    for move in moves:
+        game.current_state = game.current_state.make_move(move)
+    return game
+
+
+class AlphaBetaUnitTests(unittest.TestCase):
+    def test_same_moves_as_minimax_subtract_square(self):
+        """
+        Test that alpha-beta picks the same move as recursive minimax.
+        """
+        for total in range(1, 25):
+            game = make_subtract_square(total)
+            self.assertEqual(alphabeta_minimax(game),
+                             recursive_minimax(game),
+                             "Different moves for a total of {}".format(total))
+
+    def test_same_moves_as_minimax_stonehenge(self):
+        """
+        Test that alpha-beta picks the same move as recursive minimax on
+        Stonehenge boards.
+        """
+        for moves in [[], ['A'], ['A', 'F'], ['A', 'F', 'D'], ['C', 'B']]:
+            game = make_stonehenge(2, moves)
+            self.assertEqual(alphabeta_minimax(game),
+                             recursive_minimax(game),
+                             "Different moves after {}".format(moves))
+
+    def test_visits_fewer_nodes(self):
+        """
+        Test that alpha-beta makes fewer moves than recursive minimax.
+        """
+        game = make_subtract_square(30)
+        counts = []
+        for strategy in [recursive_minimax, alphabeta_minimax]:
+            stats = SearchStats()
+            strategy(game, stats=stats)
+            counts.append(stats.total_nodes)
+        self.assertTrue(counts[1] < counts[0] // 10)
+
+    def test_win_below_first_move_cuts_off(self):
+        """
+        Test that a win found below the first root move skips its siblings:
+        from a total of 5, the reply 4 to the move 1 wins, so the reply 1
+        is never searched.
+        """
+        stats = SearchStats()
+        alphabeta_minimax(make_subtract_square(5), stats)
+        self.assertEqual(stats.nodes, [1, 2, 2])
+        self.assertGreater(stats.cutoffs, 0)
+
+
+class IterativeDeepeningUnitTests(unittest.TestCase):
+    def test_finds_winning_move_with_time(self):
+        """
+        Test that iterative deepening finds the only winning move when it
+        has time to search to the end of the game.
+        """
+        game = make_stonehenge(2, ['A', 'F', 'D'])
+        self.assertEqual(iterative_deepening_minimax(game, 10), 'E')
+
+        game = make_subtract_square(18)
+        self.assertTrue(iterative_deepening_minimax(game, 10) in [1, 16])
+
+    def test_returns_within_budget(self):
+        """
+        Test that iterative deepening returns a legal move close to its time
+        budget on a board too large to search fully.
+        """
+        game = make_stonehenge(5, [])
+        start = time.monotonic()
+        move = iterative_deepening_minimax(game, 0.5)
+        self.assertTrue(time.monotonic() - start < 1.5)
+        self.assertTrue(game.current_state.is_valid_move(move))
+
+    def test_win_below_first_move_cuts_off(self):
+        """
+        Test that each deepening pass skips the siblings of a win found
+        below the first root move.
+        """
+        stats = SearchStats()
+        iterative_deepening_minimax(make_subtract_square(5), 10, stats)
+        self.assertEqual(stats.nodes, [1, 4, 2])
+
+    def test_zero_budget_completes_depth_one(self):
+        """
+        Test that a search with no time left still returns a legal move.
+        """
+        game = make_stonehenge(4, [])
+        move = iterative_deepening_minimax(game, 0)
+        self.assertTrue(game.current_state.is_valid_move(move))
+
+
+class ParallelMinimaxUnitTests(unittest.TestCase):
+    def test_same_moves_as_minimax(self):
+        """
+        Test that parallel minimax picks the same move as recursive minimax
+        when splitting at the root and one move below it.
+        """
+        games = [make_subtract_square(total) for total in [4, 13, 18, 25]]
+        games.append(make_stonehenge(2, ['A', 'F', 'D']))
+        games.append(make_stonehenge(2, ['C']))
+        for game in games:
+            expected = recursive_minimax(game)
+            for split_depth in [1, 2]:
+                self.assertEqual(parallel_minimax(game, 2, split_depth),
+                                 expected,
+                                 "Different moves for\n{}".format(
+                                     game.current_state))
+
+
+class MCTSUnitTests(unittest.TestCase):
+    def test_finds_winning_moves(self):
+        """
+        Test that MCTS finds the winning move on small games.
+        """
+        self.assertEqual(mcts_strategy(make_subtract_square(4), 100), 4)
+        self.assertTrue(mcts_strategy(make_subtract_square(18), 2000)
+                        in [1, 16])
+        game = make_stonehenge(2, ['A', 'F', 'D'])
+        self.assertEqual(mcts_strategy(game, 2000), 'E')
+
+    def test_time_budget_with_short_rollouts(self):
+        """
+        Test that MCTS stops near its time budget and returns a legal move
+        when rollouts are cut short by rough_outcome.
+        """
+        game = make_stonehenge(5, [])
+        start = time.monotonic()
+        move = mcts_strategy(game, None, 0.3, 4)
+        self.assertTrue(time.monotonic() - start < 1)
+        self.assertTrue(game.current_state.is_valid_move(move))
+
+    def test_needs_a_budget(self):
+        """
+        Test that MCTS without playouts or a time limit is refused instead
+        of running forever.
+        """
+        self.assertRaises(ValueError, mcts_strategy,
+                          make_subtract_square(10), None)
+
+    def test_finished_game(self):
+        """
+        Test that MCTS asked for a move in a finished game says so.
+        """
+        game = make_subtract_square(4)
+        game.current_state = game.current_state.make_move(4)
+        with self.assertRaisesRegex(ValueError, 'game is over'):
+            mcts_strategy(game, 10)
+
+
+class IterativeMinimaxUnitTests(unittest.TestCase):
+    def test_same_moves_as_recursive(self):
+        """
+        Test that the explicit-stack engine picks the move recursive minimax
+        picks.
+        """
+        games = [make_subtract_square(total) for total in range(1, 25)]
+        games += [make_stonehenge(2, moves) for moves in
+                  [[], ['A'], ['A', 'F'], ['B', 'G', 'D']]]
+        for game in games:
+            self.assertEqual(iterative_minimax(game), recursive_minimax(game))
+            self.assertEqual(iterative_minimax(game, TranspositionTable()),
+                             recursive_minimax(game))
+
+    def test_deep_subtract_square(self):
+        """
+        Test that a total of thousands is solved without reaching the
+        recursion limit, and that the move leaves a losing total.
+        """
+        total = 3000
+        losing = [True]
+        for n in range(1, total + 1):
+            losing.append(all(not losing[n - root * root]
+                              for root in range(1, int(n ** 0.5) + 1)))
+        game = make_subtract_square(total)
+        stats = SearchStats()
+        move = iterative_minimax(game, TranspositionTable(), stats)
+        self.assertTrue(losing[total - move])
+        self.assertGreater(len(stats.nodes), 100)
+
+
+class SearchStatsUnitTests(unittest.TestCase):
+    def test_recursive_minimax_counts_every_node(self):
+        """
+        Test that minimax records every state it makes, by depth.
+        """
+        game = make_subtract_square(4)
+        stats = SearchStats()
+        recursive_minimax(game, stats=stats)
+        self.assertEqual(stats.nodes, [1, 2, 1, 1, 1])
+        self.assertEqual(stats.terminals, 2)
+        self.assertEqual(set(stats.root_times), {1, 4})
+
+    def test_cache_hits_and_misses(self):
+        """
+        Test that cached minimax records its table lookups.
+        """
+        minimax_table.clear()
+        game = make_subtract_square(20)
+        stats = SearchStats()
+        cached_minimax(game, stats)
+        self.assertEqual(stats.cache_hits + stats.cache_misses,
+                         stats.total_nodes)
+        self.assertGreater(stats.cache_hits, 0)
+        minimax_table.clear()
+
+    def test_alphabeta_cutoffs(self):
+        """
+        Test that alpha-beta records its cutoffs and visits fewer nodes.
+        """
+        game = make_stonehenge(2, ['A', 'F'])
+        full, pruned = SearchStats(), SearchStats()
+        recursive_minimax(game, stats=full)
+        alphabeta_minimax(game, pruned)
+        self.assertGreater(pruned.cutoffs, 0)
+        self.assertLess(pruned.total_nodes, full.total_nodes)
+        self.assertEqual(full.cutoffs, 0)
+
+    def test_parallel_minimax_merges_workers(self):
+        """
+        Test that the workers' searches are added up like one search.
+        """
+        game = make_stonehenge(2, ['A', 'F', 'D'])
+        expected = SearchStats()
+        recursive_minimax(game, stats=expected)
+        for split_depth in [1, 2]:
+            stats = SearchStats()
+            parallel_minimax(game, 2, split_depth, stats)
+            self.assertEqual(stats.nodes, expected.nodes)
+            self.assertEqual(stats.terminals, expected.terminals)
+
+    def test_deep_search_branching_factor(self):
+        """
+        Test that the effective branching factor of a search hundreds of
+        moves deep is found without overflowing.
+        """
+        game = make_subtract_square(300)
+        stats = SearchStats()
+        iterative_minimax(game, TranspositionTable(), stats)
+        self.assertGreater(len(stats.nodes), 300)
+        factor = stats.as_dict()['effective_branching_factor']
+        self.assertTrue(1 <= factor < 2)
+        stats = SearchStats()
+        for depth in range(1, 2001):
+            stats.visit(depth)
+            stats.visit(depth)
+        self.assertTrue(1 < stats.effective_branching_factor < 1.01)
+
+    def test_other_strategies_record(self):
+        """
+        Test that iterative deepening and MCTS record their searches.
+        """
+        game = make_stonehenge(2, ['A', 'F'])
+        stats = SearchStats()
+        iterative_deepening_minimax(game, 0.1, stats)
+        self.assertGreater(stats.total_nodes, 0)
+        self.assertGreater(stats.effective_branching_factor, 1)
+        stats = SearchStats()
+        mcts_strategy(game, 50, stats=stats)
+        self.assertEqual(stats.nodes[1], 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+"""
+A solver for SubtractSquare that finds, for every total up to some limit,
+whether the player to move can force a win, and how.
+
+The results are kept in a NumPy integer array (a win/loss table) whose item
+t is the root of the smallest square that wins from a total of t, or 0 when
+the player to move loses from t; so item t is true exactly when t is a win.
+Tables can be saved as .npy files and loaded back memory-mapped, so a table
+of 10^8 totals costs 200 MB of disk and only the pages that are read.
+"""
+from typing import Any, Optional
+import math
+import numpy as np
+from numpy.lib.format import open_memmap
+from subtract_square_state import SubtractSquareState
+
+# How many totals to look at at once when searching for the next losing
+# total.
+SEARCH_CHUNK = 64
+
+# The table set by use_table.
+outcome_table = None
+# The table perfect_strategy solves for itself when the table set by
+# use_table does not cover a total, grown when a game needs more of it. It
+# is never handed to SubtractSquareState, so other strategies in the same
+# process do not see it.
+strategy_table = None
+
+
+def solve_subtract_square(limit: int, path: Optional[str] = None) -> Any:
+    """
+    Return the win/loss table of SubtractSquare for every total from 0 to
+    limit. If path is given, the table is built in a memory-mapped .npy file
+    at path instead of in memory.
+
+    A total is losing exactly when no square leads to a losing total, so
+    every losing total t marks t + 1, t + 4, t + 9, ... as winning, and the
+    next losing total is the first one left unmarked. The losing totals are
+    found in increasing order, so the last square to mark a total is the
+    smallest one that wins from it.
+
+    >>> table = solve_subtract_square(12)
+    >>> [t for t in range(13) if not table[t]]
+    [0, 2, 5, 7, 10, 12]
+    >>> [int(table[t]) ** 2 for t in [1, 3, 4, 6]]
+    [1, 1, 4, 1]
+    """
+    roots = np.arange(1, math.isqrt(limit) + 1, dtype=np.int64)
+    # The largest root fits in the table's items.
+    dtype = np.uint16 if len(roots) < 2 ** 16 else np.uint32
+    if path is None:
+        table = np.zeros(limit + 1, dtype=dtype)
+    else:
+        table = open_memmap(path, mode='w+', dtype=dtype, shape=(limit + 1,))
+        table[:] = 0
+    squares = roots ** 2
+    total = 0
+    while total <= limit:
+        # total is losing: every total one square above it wins with that
+        # square.
+        count = np.searchsorted(squares, limit - total, side='right')
+        table[total + squares[:count]] = roots[:count]
+        total += 1
+        while total <= limit:
+            window = table[total:total + SEARCH_CHUNK]
+            first = int(np.argmin(window))
+            if not window[first]:
+                total += first
+                break
+            total += len(window)
+    if path is not None:
+        table.flush()
+    return table
+
+
+def save_table(table: Any, path: str) -> None:
+    """
+    Save the win/loss table to the .npy file at path.
+    """
+    np.save(path, np.asarray(table))
+
+
+def load_table(path: str) -> Any:
+    """
+    Return the win/loss table saved in the .npy file at path, memory-mapped
+    read-only.
+    """
+    return np.load(path, mmap_mode='r')
+
+
+def use_table(table: Any) -> None:
+    """
+    Make table the one used by perfect_strategy and by
+    SubtractSquareState.rough_outcome, which then gives the exact outcome of
+    every total the table covers.
+
+    >>> use_table(solve_subtract_square(10))
+    >>> SubtractSquareState(True, 10).rough_outcome()
+    -1
+    >>> use_table(None)
+    """
+    global outcome_table
+    outcome_table = table
+    SubtractSquareState.outcome_table = table
+
+
+def perfect_strategy(game: Any) -> Any:
+    """
+    Return a move for a game of SubtractSquare that wins whenever winning is
+    possible, read from the table set by use_table if it covers the current
+    total, or else from a table of its own, solving every total up to twice
+    the current total if that does not cover it yet. Where every move
+    loses, the smallest is returned.
+
+    Raise a ValueError for a game other than SubtractSquare.
+
+    >>> use_table(None)
+    >>> game = type('Game', (), {})()
+    >>> game.current_state = SubtractSquareState(True, 18)
+    >>> perfect_strategy(game)
+    1
+    >>> SubtractSquareState(True, 18).rough_outcome()
+    0
+    """
+    global strategy_table
+    if not isinstance(game.current_state, SubtractSquareState):
+        raise ValueError("perfect_strategy only plays SubtractSquare")
+    total = game.current_state.current_total
+    table = outcome_table
+    if table is None or total >= len(table):
+        if strategy_table is None or total >= len(strategy_table):
+            strategy_table = solve_subtract_square(2 * total)
+        table = strategy_table
+    return max(int(table[total]), 1) ** 2
+
+
+if __name__ == "__main__":
+    from python_ta import check_all
+
+    check_all(config="a2_pyta.txt")
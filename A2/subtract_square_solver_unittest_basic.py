@@ -0,0 +1,105 @@
+"""
+Unittests for the NumPy win/loss table solver of SubtractSquare.
+"""
+import unittest
+import os
+import tempfile
+
+from subtract_square_solver import (solve_subtract_square, save_table,
+                                    load_table, use_table, perfect_strategy)
+from subtract_square_game import SubtractSquareGame
+from subtract_square_state import SubtractSquareState
+from stonehenge import StonehengeGame
+
+
+def brute_force(limit: int) -> list:
+    """
+    Return, for every total from 0 to limit, the smallest square that wins
+    from it, or 0 if every move loses.
+    """
+    moves = []
+    for total in range(limit + 1):
+        root = 1
+        move = 0
+        while root * root <= total:
+            if moves[total - root * root] == 0:
+                move = root * root
+                break
+            root += 1
+        moves.append(move)
+    return moves
+
+
+class SubtractSquareSolverUnitTests(unittest.TestCase):
+    def tearDown(self):
+        """
+        Stop using any table made by a test.
+        """
+        use_table(None)
+
+    def test_table_matches_brute_force(self):
+        """
+        Test that the table gives the outcome and smallest winning move of
+        every total.
+        """
+        expected = brute_force(3000)
+        table = solve_subtract_square(3000)
+        self.assertEqual([int(root) ** 2 for root in table], expected)
+
+    def test_memory_mapped_round_trip(self):
+        """
+        Test that a table built in a memory-mapped file, and one saved and
+        loaded back, are the same as one built in memory.
+        """
+        directory = tempfile.mkdtemp()
+        expected = solve_subtract_square(500)
+        built = solve_subtract_square(500, os.path.join(directory, 'a.npy'))
+        self.assertEqual(list(built), list(expected))
+        loaded = load_table(os.path.join(directory, 'a.npy'))
+        self.assertEqual(list(loaded), list(expected))
+        save_table(expected, os.path.join(directory, 'b.npy'))
+        loaded = load_table(os.path.join(directory, 'b.npy'))
+        self.assertEqual(loaded.dtype, expected.dtype)
+        self.assertEqual(list(loaded), list(expected))
+        self.assertFalse(loaded.flags.writeable)
+
+    def test_perfect_strategy_leaves_losing_totals(self):
+        """
+        Test that from every winning total the strategy's move leaves the
+        opponent a losing one.
+        """
+        expected = brute_force(400)
+        game = SubtractSquareGame(True, 400)
+        for total in range(1, 401):
+            game.current_state = SubtractSquareState(True, total)
+            move = perfect_strategy(game)
+            self.assertTrue(game.current_state.is_valid_move(move))
+            if expected[total]:
+                self.assertEqual(expected[total - move], 0, total)
+
+    def test_strategy_keeps_table_to_itself(self):
+        """
+        Test that the strategy does not hand its table to rough_outcome,
+        but does use a table set with use_table.
+        """
+        guess = SubtractSquareState(True, 18).rough_outcome()
+        game = SubtractSquareGame(True, 18)
+        self.assertEqual(perfect_strategy(game), 1)
+        self.assertEqual(SubtractSquareState(True, 18).rough_outcome(), guess)
+        table = solve_subtract_square(18).copy()
+        table[18] = 4
+        use_table(table)
+        self.assertEqual(perfect_strategy(game), 16)
+        self.assertEqual(SubtractSquareState(True, 18).rough_outcome(),
+                         SubtractSquareState.WIN)
+
+    def test_other_games_refused(self):
+        """
+        Test that the strategy refuses games other than SubtractSquare.
+        """
+        with self.assertRaisesRegex(ValueError, 'SubtractSquare'):
+            perfect_strategy(StonehengeGame(True, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,13 +4,25 @@ An implementation of a state for SubtractSquare.
 NOTE: You do not have to run python-ta on this file.
 """
 from typing import Any
+import struct
 from game_state import GameState
+from square_moves import SquareMoves, is_square
+
+# The binary form of a state: b's', the version of the format, 1 if it is
+# p1's turn (0 if not) and the current total as an unsigned 64-bit integer.
+STATE_VERSION = 1
+STATE_FORMAT = struct.Struct('<cBBQ')
 
 
 class SubtractSquareState(GameState):
     """
     The state of a game at a certain point in time.
+
+    outcome_table - a win/loss table from subtract_square_solver, or None,
+                    used by rough_outcome for the totals it covers
     """
+    outcome_table = None
+    IN_PLACE = True
 
     def __init__(self, is_p1_turn: bool, current_total: int) -> None:
         """
@@ -26,16 +38,25 @@ class SubtractSquareState(GameState):
         """
         return "Current total: {}".format(self.current_total)
 
-    def get_possible_moves(self) -> list:
+    def get_possible_moves(self) -> SquareMoves:
+        """
+        Return all possible moves that can be applied to this state, as a
+        lazy sequence.
+
+        >>> SubtractSquareState(True, 10).get_possible_moves()
+        [1, 4, 9]
         """
-        Return all possible moves that can be applied to this state.
+        return SquareMoves(self.current_total)
+
+    def is_valid_move(self, move: Any) -> bool:
         """
-        moves = []
-        for i in range(1, self.current_total + 1):
-            if i ** 2 <= self.current_total:
-                moves.append(i ** 2)
+        Return whether move is a valid move for this GameState.
 
-        return moves
+        >>> state = SubtractSquareState(True, 10 ** 12)
+        >>> state.is_valid_move(10 ** 12), state.is_valid_move(10 ** 12 - 1)
+        (True, False)
+        """
+        return move in SquareMoves(self.current_total)
 
     def make_move(self, move: Any) -> "SubtractSquareState":
         """
@@ -48,6 +69,34 @@ class SubtractSquareState(GameState):
                                         self.current_total - move)
         return new_state
 
+    def apply_move(self, move: Any) -> None:
+        """
+        Apply move to this GameState in place.
+
+        >>> state = SubtractSquareState(True, 10)
+        >>> state.apply_move(9)
+        >>> state
+        P1's Turn: False - Total: 1
+        """
+        if type(move) == str:
+            move = int(move)
+        self.current_total -= move
+        self.p1_turn = not self.p1_turn
+
+    def undo_move(self, move: Any, undo: None) -> None:
+        """
+        Take back move, the last move applied by apply_move.
+
+        >>> state = SubtractSquareState(True, 10)
+        >>> state.undo_move(9, state.apply_move(9))
+        >>> state
+        P1's Turn: True - Total: 10
+        """
+        if type(move) == str:
+            move = int(move)
+        self.current_total += move
+        self.p1_turn = not self.p1_turn
+
     def __repr__(self) -> str:
         """
         Return a representation of this state (which can be used for
@@ -56,19 +105,67 @@ class SubtractSquareState(GameState):
         return "P1's Turn: {} - Total: {}".format(self.p1_turn,
                                                   self.current_total)
 
+    def to_bytes(self) -> bytes:
+        """
+        Return this state in binary, always in 11 bytes.
+
+        >>> SubtractSquareState(False, 20).to_bytes()
+        b's\\x01\\x00\\x14\\x00\\x00\\x00\\x00\\x00\\x00\\x00'
+        """
+        if not 0 <= self.current_total < 2 ** 64:
+            raise ValueError("the total {} does not fit in 64 bits".format(
+                self.current_total))
+        return STATE_FORMAT.pack(b's', STATE_VERSION, int(self.p1_turn),
+                                 self.current_total)
+
+    @staticmethod
+    def from_bytes(data: bytes) -> 'SubtractSquareState':
+        """
+        Return the state that to_bytes() turned into data.
+
+        Raise a ValueError if data is not a state in this format.
+
+        >>> SubtractSquareState.from_bytes(
+        ...     SubtractSquareState(True, 10 ** 12).to_bytes())
+        P1's Turn: True - Total: 1000000000000
+        """
+        if len(data) != STATE_FORMAT.size:
+            raise ValueError("not a SubtractSquare state")
+        tag, version, p1_turn, total = STATE_FORMAT.unpack(data)
+        if tag != b's' or version != STATE_VERSION:
+            raise ValueError("not a version {} SubtractSquare state".format(
+                STATE_VERSION))
+        return SubtractSquareState(bool(p1_turn), total)
+
+    def __reduce_ex__(self, protocol: int) -> tuple:
+        """
+        Return how to pickle this state: as its to_bytes(), unless its total
+        does not fit in 64 bits.
+
+        >>> import pickle
+        >>> pickle.loads(pickle.dumps(SubtractSquareState(True, 2 ** 70)))
+        P1's Turn: True - Total: 1180591620717411303424
+        """
+        if 0 <= self.current_total < 2 ** 64:
+            return SubtractSquareState.from_bytes, (self.to_bytes(),)
+        return super().__reduce_ex__(protocol)
+
     def rough_outcome(self) -> float:
         """
         Return an estimate in interval [LOSE, WIN] of best outcome the current
         player can guarantee from state self.
         """
+        table = SubtractSquareState.outcome_table
+        if table is not None and self.current_total < len(table):
+            return self.WIN if table[self.current_total] else self.LOSE
         if is_pos_square(self.current_total):
             return self.WIN
-        elif all([is_pos_square(self.current_total - n ** 2)
-                  for n in range(1, self.current_total + 1)
-                  if n ** 2 < self.current_total]):
-            return self.LOSE
-
-        return self.DRAW
+        n = 1
+        while n ** 2 < self.current_total:
+            if not is_pos_square(self.current_total - n ** 2):
+                return self.DRAW
+            n += 1
+        return self.LOSE
 
 
 def is_pos_square(n: int) -> bool:
@@ -80,7 +177,7 @@ def is_pos_square(n: int) -> bool:
     >>> is_pos_square(9)
     True
     """
-    return 0 < n and (round(n ** 0.5) ** 2 == n)
+    return is_square(n)
 
 
 if __name__ == "__main__":
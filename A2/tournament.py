@@ -0,0 +1,158 @@
+"""
+A headless tournament runner for the games in game_interface.
+
+Games are built from a parameter (the starting total of SubtractSquare or
+the side length of Stonehenge) instead of input(), played without printing,
+and spread over a pool of processes. Each finished game is written to the
+results file as one line of JSON.
+
+For example, to play 1000 games of Stonehenge of side length 2 between
+recursive minimax and the rough outcome strategy on 8 processes:
+
+    python tournament.py h mr ro --param 2 --games 1000 --workers 8 \
+        --out results.jsonl
+
+Passing --dir ../A1 plays the A1 games and strategies instead.
+"""
+from typing import Any, Callable, Optional
+import argparse
+import importlib
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+
+def build_game(game_class: Any, p1_starts: bool, param: Any = None) -> Any:
+    """
+    Return a new game of game_class, started with param if it is not None.
+    """
+    if param is None:
+        return game_class(p1_starts)
+    return game_class(p1_starts, param)
+
+
+def play_game(game: Any, p1_strategy: Callable, p2_strategy: Callable,
+              max_moves: Optional[int] = None) -> dict:
+    """
+    Play game to the end with p1_strategy and p2_strategy, and return its
+    record: the winner ('p1', 'p2', or None for a tie or a game stopped
+    after max_moves moves), the moves made, the seconds each move took and
+    whether the game ended by a player choosing an invalid move.
+    """
+    moves = []
+    latencies = []
+    forfeit = False
+    while not game.is_over(game.current_state):
+        if max_moves is not None and len(moves) >= max_moves:
+            break
+        current_state = game.current_state
+        strategy = p2_strategy
+        if current_state.get_current_player_name() == 'p1':
+            strategy = p1_strategy
+        start = time.perf_counter()
+        move = strategy(game)
+        latencies.append(time.perf_counter() - start)
+        if not current_state.is_valid_move(move):
+            forfeit = True
+            break
+        moves.append(move)
+        game.current_state = current_state.make_move(move)
+    winner = None
+    if forfeit:
+        winner = 'p2' if game.current_state.get_current_player_name() == \
+            'p1' else 'p1'
+    elif game.is_winner('p1'):
+        winner = 'p1'
+    elif game.is_winner('p2'):
+        winner = 'p2'
+    return {'winner': winner, 'moves': moves, 'latencies': latencies,
+            'forfeit': forfeit}
+
+
+def play_match(match: tuple) -> dict:
+    """
+    Play one game described by match, a tuple of (game key, parameter,
+    p1 strategy key, p2 strategy key, whether p1 starts, max moves), looking
+    the keys up in game_interface, and return its record.
+    """
+    game_key, param, p1_key, p2_key, p1_starts, max_moves = match
+    interface = importlib.import_module('game_interface')
+    game = build_game(interface.playable_games[game_key], p1_starts, param)
+    record = play_game(game, interface.usable_strategies[p1_key],
+                       interface.usable_strategies[p2_key], max_moves)
+    record.update({'game': game_key, 'param': param, 'p1': p1_key,
+                   'p2': p2_key, 'first': 'p1' if p1_starts else 'p2'})
+    return record
+
+
+def run_tournament(game_key: str, p1_key: str, p2_key: str, games: int,
+                   out: Any, param: Any = None,
+                   workers: Optional[int] = None,
+                   max_moves: Optional[int] = None) -> dict:
+    """
+    Play games games of game_key between the strategies p1_key and p2_key
+    on workers processes, alternating who moves first, and write each
+    record to the file out as it finishes. Return the number of games won
+    by 'p1' and 'p2' and tied (None).
+    """
+    matches = [(game_key, param, p1_key, p2_key, i % 2 == 0, max_moves)
+               for i in range(games)]
+    totals = {'p1': 0, 'p2': 0, None: 0}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for record in executor.map(play_match, matches,
+                                   chunksize=max(1, games // 100)):
+            out.write(json.dumps(record) + '\n')
+            out.flush()
+            totals[record['winner']] += 1
+    return totals
+
+
+def helper_parse_param(text: Optional[str]) -> Any:
+    """
+    Return text as an int if it is one, otherwise text itself.
+
+    >>> helper_parse_param('4'), helper_parse_param('x')
+    (4, 'x')
+    """
+    if text is not None and text.strip().isdigit():
+        return int(text)
+    return text
+
+
+def main(argv: Optional[list] = None) -> None:
+    """
+    Run a tournament from the command-line arguments argv.
+    """
+    parser = argparse.ArgumentParser(description="Play games between two "
+                                                 "strategies without input.")
+    parser.add_argument('game', help="key of the game in playable_games")
+    parser.add_argument('p1', help="key of p1's strategy")
+    parser.add_argument('p2', help="key of p2's strategy")
+    parser.add_argument('--param', help="starting total or board size")
+    parser.add_argument('--games', type=int, default=100)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--max-moves', type=int, default=None,
+                        help="stop a game as a tie after this many moves")
+    parser.add_argument('--out', default='results.jsonl')
+    parser.add_argument('--dir', default=None,
+                        help="directory of the game_interface to use")
+    args = parser.parse_args(argv)
+    if args.dir is not None:
+        sys.path.insert(0, args.dir)
+    interface = importlib.import_module('game_interface')
+    for key in [args.p1, args.p2]:
+        if key not in interface.usable_strategies or key == 'i':
+            parser.error("{} is not a headless strategy".format(key))
+    if args.game not in interface.playable_games:
+        parser.error("{} is not a game".format(args.game))
+    with open(args.out, 'w') as out:
+        totals = run_tournament(args.game, args.p1, args.p2, args.games, out,
+                                helper_parse_param(args.param), args.workers,
+                                args.max_moves)
+    print("p1 ({}) won {}, p2 ({}) won {}, {} tied".format(
+        args.p1, totals['p1'], args.p2, totals['p2'], totals[None]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Unittests for the headless tournament runner.
+"""
+import unittest
+import io
+import json
+from unittest.mock import patch
+
+from tournament import build_game, play_game, run_tournament
+from strategy import recursive_minimax, rough_outcome_strategy
+from game_interface import playable_games
+StonehengeGame = playable_games['h']
+SubtractSquareGame = playable_games['s']
+
+
+class TournamentUnitTests(unittest.TestCase):
+    def test_build_game_without_input(self):
+        """
+        Test that games are built from a parameter without calling input().
+        """
+        with patch('builtins.input', side_effect=AssertionError):
+            game = build_game(StonehengeGame, True, 3)
+            self.assertEqual(game.current_state.size, 3)
+            game = build_game(SubtractSquareGame, False, 20)
+            self.assertEqual(game.current_state.current_total, 20)
+
+    def test_play_game_record(self):
+        """
+        Test that a played game records its winner, moves and latencies.
+        """
+        game = build_game(SubtractSquareGame, True, 18)
+        record = play_game(game, recursive_minimax, rough_outcome_strategy)
+        self.assertEqual(record['winner'], 'p1')
+        self.assertEqual(sum(record['moves']), 18)
+        self.assertEqual(len(record['latencies']), len(record['moves']))
+        self.assertFalse(record['forfeit'])
+
+    def test_invalid_move_forfeits(self):
+        """
+        Test that a strategy choosing an invalid move loses the game.
+        """
+        game = build_game(StonehengeGame, True, 1)
+        record = play_game(game, lambda g: 'Z', rough_outcome_strategy)
+        self.assertEqual((record['winner'], record['forfeit']), ('p2', True))
+
+    def test_run_tournament_streams_records(self):
+        """
+        Test that every game of a tournament is written as a line of JSON.
+        """
+        out = io.StringIO()
+        totals = run_tournament('h', 'ab', 'ro', 6, out, 1, 2)
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(len(records), 6)
+        self.assertEqual(sum(totals.values()), 6)
+        self.assertEqual([record['first'] for record in records[:2]],
+                         ['p1', 'p2'])
+
+
+if __name__ == "__main__":
+    unittest.main()
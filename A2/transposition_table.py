@@ -0,0 +1,121 @@
+"""
+A transposition table for caching the scores of solved game states.
+"""
+from typing import Any, Optional
+from collections import OrderedDict
+
+
+class TranspositionTable:
+    """
+    A mapping from state keys to solved scores that holds at most max_size
+    entries, evicting the least recently used entry when it is full.
+
+    max_size - the maximum number of entries kept, or None for no limit
+    hits - the number of lookups that found a stored score
+    misses - the number of lookups that found nothing
+    """
+    max_size: Optional[int]
+    hits: int
+    misses: int
+
+    def __init__(self, max_size: Optional[int] = None) -> None:
+        """
+        Create a new, empty TranspositionTable holding at most max_size
+        entries.
+
+        >>> t = TranspositionTable(10)
+        >>> len(t)
+        0
+        """
+        if max_size is not None and max_size < 1:
+            raise ValueError("max_size must be a positive integer or None")
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self) -> int:
+        """
+        Return the number of entries stored in self.
+
+        >>> t = TranspositionTable()
+        >>> t.store('a', 1)
+        >>> len(t)
+        1
+        """
+        return len(self._entries)
+
+    def __contains__(self, key: Any) -> bool:
+        """
+        Return whether key has a stored score, without touching the hit/miss
+        counts or the recency order.
+
+        >>> t = TranspositionTable()
+        >>> t.store('a', 1)
+        >>> 'a' in t
+        True
+        >>> t.hits
+        0
+        """
+        return key in self._entries
+
+    def lookup(self, key: Any) -> Optional[int]:
+        """
+        Return the score stored for key, or None if there is none.
+
+        >>> t = TranspositionTable()
+        >>> t.store('a', -1)
+        >>> t.lookup('a')
+        -1
+        >>> t.lookup('b') is None
+        True
+        >>> (t.hits, t.misses)
+        (1, 1)
+        """
+        if key not in self._entries:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return self._entries[key]
+
+    def store(self, key: Any, score: int) -> None:
+        """
+        Store score for key, evicting the least recently used entry if self
+        is full.
+
+        >>> t = TranspositionTable(2)
+        >>> t.store('a', 1)
+        >>> t.store('b', 1)
+        >>> t.lookup('a')
+        1
+        >>> t.store('c', -1)
+        >>> 'b' in t
+        False
+        >>> len(t)
+        2
+        """
+        self._entries[key] = score
+        self._entries.move_to_end(key)
+        if self.max_size is not None and len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Remove every entry from self and reset the hit and miss counts.
+
+        >>> t = TranspositionTable()
+        >>> t.store('a', 1)
+        >>> t.clear()
+        >>> (len(t), t.hits, t.misses)
+        (0, 0, 0)
+        """
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+if __name__ == "__main__":
+    from python_ta import check_all
+
+    check_all(config="a2_pyta.txt")
@@ -0,0 +1,82 @@
+"""
+Unittests for the transposition table and the minimax strategies using it.
+"""
+import unittest
+from unittest.mock import patch
+
+from transposition_table import TranspositionTable
+from strategy import recursive_minimax
+from game_interface import playable_games
+StonehengeGame = playable_games['h']
+SubtractSquareGame = playable_games['s']
+
+
+class TranspositionTableUnitTests(unittest.TestCase):
+    def test_evicts_least_recently_used(self):
+        """
+        Test that a full table evicts the entry used least recently.
+        """
+        table = TranspositionTable(3)
+        for key in ['a', 'b', 'c']:
+            table.store(key, 1)
+        table.lookup('a')
+        table.store('d', -1)
+
+        self.assertEqual(len(table), 3)
+        self.assertFalse('b' in table)
+        for key in ['a', 'c', 'd']:
+            self.assertTrue(key in table)
+
+    def test_counts_hits_and_misses(self):
+        """
+        Test that lookups are counted as hits or misses.
+        """
+        table = TranspositionTable()
+        table.store('a', 0)
+        self.assertEqual(table.lookup('a'), 0)
+        self.assertIsNone(table.lookup('b'))
+        self.assertIsNone(table.lookup('c'))
+        self.assertEqual((table.hits, table.misses), (1, 2))
+
+    def test_rejects_non_positive_size(self):
+        """
+        Test that a table cannot be created with room for no entries.
+        """
+        with self.assertRaises(ValueError):
+            TranspositionTable(0)
+
+    def test_subtract_square_same_move_with_table(self):
+        """
+        Test that recursive minimax picks the same move with and without a
+        table, and that the table is reused between calls.
+        """
+        with patch('builtins.input', return_value='18'):
+            game = SubtractSquareGame(True)
+        table = TranspositionTable()
+
+        self.assertEqual(recursive_minimax(game, table),
+                         recursive_minimax(game))
+        solved = len(table)
+        self.assertTrue(solved > 0)
+
+        recursive_minimax(game, table)
+        self.assertEqual(len(table), solved)
+        self.assertTrue(table.hits > 0)
+
+    def test_stonehenge_bounded_table(self):
+        """
+        Test that recursive minimax still finds the winning move when the
+        table is too small to hold every state.
+        """
+        with patch('builtins.input', return_value='2'):
+            game = StonehengeGame(True)
+        for move in ['A', 'F', 'D']:
+            game.current_state = game.current_state.make_move(move)
+        table = TranspositionTable(8)
+
+        self.assertEqual(recursive_minimax(game, table), 'E')
+        self.assertTrue(len(table) <= 8)
+
+
+if __name__ == "__main__":
+    unittest.main()